@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+第一阶段演示和练习共用的模块
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+
+演示和练习脚本以文件路径运行（python examples/phase01_basics/demos/xx.py），
+脚本开头把 examples/phase01_basics 加入 sys.path 后即可 from common.xxx import ...
+"""
@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量评测
+并发运行计算器 Agent（demos/04_real_calculator_agent_demo.py）评测一批算术题
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+阶段：第一阶段 - 基础概念
+类型：工具脚本
+
+运行方式：
+    # 离线：假模型 + 随机生成 2000 道题
+    python examples/phase01_basics/common/batch_eval.py --provider fake --generate 2000 --concurrency 64
+
+    # 真实模型：每秒最多 5 个 LLM 请求，结果写入 results.jsonl
+    python examples/phase01_basics/common/batch_eval.py --provider zhipu --input prompts.jsonl \
+        --concurrency 8 --rps 5 --output results.jsonl
+
+输入（--input）：
+    - .jsonl：每行 {"prompt": "3 乘以 5 等于多少？", "expected": 15, "id": "可选"}
+    - 其他文本文件：每行一道题（没有标准答案，只统计耗时和工具调用）
+    - 不指定 --input / --generate 时使用演示中的 3 道题
+
+说明：
+    - 每道题用 agent.ainvoke() 运行，同时进行的题数不超过 --concurrency；
+      演示中的节点是同步函数，LangGraph 在线程池中执行它们，线程池大小随并发数设置
+    - --rps 按提供商限制 LLM 请求速率（一道题通常包含两次 LLM 请求），
+      多个提供商各自计算（common.llm_factory.set_rate_limit）
+    - 失败或超时的题按指数退避重试（0.5s、1s、2s ... 最多 10s，带随机抖动）
+    - 每完成一道题就向 --output 写入一行 JSON，中途中断也保留已完成的结果
+    - 结束后输出每个提供商的吞吐量、端到端延迟 p50/p95/p99（含重试）、正确率和工具调用次数
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import math
+import operator
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from common import llm_factory
+
+
+AGENT_SCRIPT = Path(__file__).resolve().parents[1] / "demos" / "04_real_calculator_agent_demo.py"
+
+# 演示中的测试用例
+DEFAULT_CASES = [
+    {"prompt": "3 乘以 5 等于多少？", "expected": 15},
+    {"prompt": "10 加上 20 等于多少？", "expected": 30},
+    {"prompt": "100 除以 4 等于多少？", "expected": 25},
+]
+
+# 随机生成题目用的运算：(中文, 计算函数)
+GENERATED_OPERATIONS = [
+    ("乘以", operator.mul),
+    ("加上", operator.add),
+    ("除以", operator.truediv),
+]
+
+# 重试退避（秒）
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10
+
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+# ========================================
+# 题目
+# ========================================
+
+def load_cases(path):
+    """从 .jsonl 或纯文本文件读取题目"""
+    path = Path(path)
+    cases = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if path.suffix == ".jsonl":
+                cases.append(json.loads(line))
+            else:
+                cases.append({"prompt": line})
+    return cases
+
+
+def generate_cases(count, seed=0):
+    """随机生成算术题（带标准答案）"""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        name, func = rng.choice(GENERATED_OPERATIONS)
+        a, b = rng.randint(1, 999), rng.randint(1, 99)
+        cases.append({"prompt": f"{a} {name} {b} 等于多少？", "expected": func(a, b)})
+    return cases
+
+
+def is_correct(answer, expected):
+    """回答中出现与标准答案相等的数字即算正确（没有标准答案时返回 None）
+
+    回答中的小数按它保留的位数比较，例如标准答案 14.2857... 时 14.29 算正确
+    """
+    if expected is None:
+        return None
+    for number in NUMBER_PATTERN.findall(answer or ""):
+        decimals = len(number.partition(".")[2])
+        tolerance = 0.5 * 10 ** -decimals if decimals else 1e-6
+        if abs(float(number) - float(expected)) <= tolerance + 1e-9:
+            return True
+    return False
+
+
+# ========================================
+# 运行
+# ========================================
+
+def load_agent_module(script=AGENT_SCRIPT):
+    """导入计算器 Agent 演示（文件名以数字开头，不能直接 import）"""
+    spec = importlib.util.spec_from_file_location("calculator_agent", script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def backoff(attempt):
+    """第 attempt 次失败后的等待时间（秒）"""
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+def summarize_messages(messages):
+    """从 Agent 返回的消息中取出最终回答和工具调用"""
+    tools = Counter()
+    for message in messages:
+        for call in getattr(message, "tool_calls", None) or []:
+            tools[call["name"]] += 1
+    return messages[-1].content, tools
+
+
+async def run_case(agent, provider, case, semaphore, retries, timeout):
+    """运行一道题（含重试），返回结果记录"""
+    from langchain_core.messages import HumanMessage
+
+    async with semaphore:
+        start = time.perf_counter()
+        attempts = 0
+        error = None
+        answer, tools = None, Counter()
+        while True:
+            attempts += 1
+            try:
+                result = await asyncio.wait_for(
+                    agent.ainvoke({"messages": [HumanMessage(case["prompt"])]}), timeout
+                )
+                answer, tools = summarize_messages(result["messages"])
+                error = None
+                break
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                if attempts > retries:
+                    break
+                await asyncio.sleep(backoff(attempts))
+
+    return {
+        "id": case.get("id"),
+        "provider": provider,
+        "prompt": case["prompt"],
+        "expected": case.get("expected"),
+        "answer": answer,
+        "correct": None if error else is_correct(answer, case.get("expected")),
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        "attempts": attempts,
+        "tool_calls": sum(tools.values()),
+        "tools": dict(tools),
+        "error": error,
+    }
+
+
+async def run_batch(agents, cases, concurrency=16, retries=3, timeout=60, output=None, progress_every=100):
+    """并发运行所有 (提供商, 题目)，按完成顺序写入 output，返回全部结果和总耗时（秒）"""
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="agent"))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.create_task(run_case(agent, provider, dict(case, id=case.get("id", i)),
+                                     semaphore, retries, timeout))
+        for provider, agent in agents.items()
+        for i, case in enumerate(cases)
+    ]
+
+    records = []
+    start = time.perf_counter()
+    out = open(output, "w", encoding="utf-8") if output else None
+    try:
+        for task in asyncio.as_completed(tasks):
+            record = await task
+            records.append(record)
+            if out:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+            if progress_every and len(records) % progress_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"  已完成 {len(records)}/{len(tasks)}（{len(records) / elapsed:.1f} 题/秒）")
+    finally:
+        if out:
+            out.close()
+    return records, time.perf_counter() - start
+
+
+# ========================================
+# 统计
+# ========================================
+
+def percentile(sorted_values, p):
+    """最近秩百分位数"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def summarize(records, elapsed):
+    """按提供商汇总"""
+    by_provider = {}
+    for record in records:
+        by_provider.setdefault(record["provider"], []).append(record)
+
+    summary = {}
+    for provider, items in by_provider.items():
+        succeeded = [r for r in items if not r["error"]]
+        graded = [r for r in succeeded if r["correct"] is not None]
+        latencies = sorted(r["latency_ms"] for r in succeeded)
+        tools = Counter()
+        for r in succeeded:
+            tools.update(r["tools"])
+
+        summary[provider] = {
+            "total": len(items),
+            "succeeded": len(succeeded),
+            "failed": len(items) - len(succeeded),
+            "retries": sum(r["attempts"] - 1 for r in items),
+            "accuracy": round(sum(r["correct"] for r in graded) / len(graded), 4) if graded else None,
+            "throughput": round(len(succeeded) / elapsed, 2) if elapsed else None,
+            "latency_ms": {
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": latencies[-1] if latencies else None,
+            },
+            "tool_calls": sum(tools.values()),
+            "tool_calls_per_prompt": round(sum(tools.values()) / len(succeeded), 2) if succeeded else 0,
+            "tools": dict(tools.most_common()),
+        }
+    return summary
+
+
+def print_summary(summary, elapsed):
+    print(f"\n总耗时：{elapsed:.2f} 秒")
+    for provider, s in summary.items():
+        latency = s["latency_ms"]
+        print(f"\n【{provider}】")
+        print(f"  题数:     {s['total']}（成功 {s['succeeded']}，失败 {s['failed']}，重试 {s['retries']} 次）")
+        if s["accuracy"] is not None:
+            print(f"  正确率:   {s['accuracy']:.2%}")
+        print(f"  吞吐量:   {s['throughput']} 题/秒")
+        if latency["p50"] is not None:
+            print(f"  延迟:     p50 {latency['p50']:.0f} ms，p95 {latency['p95']:.0f} ms，"
+                  f"p99 {latency['p99']:.0f} ms，最大 {latency['max']:.0f} ms")
+        print(f"  工具调用: {s['tool_calls']} 次（平均每题 {s['tool_calls_per_prompt']}）{s['tools']}")
+
+
+# ========================================
+# 入口
+# ========================================
+
+def main():
+    parser = argparse.ArgumentParser(description="计算器 Agent 批量评测")
+    parser.add_argument("--provider", nargs="+", default=["fake"], choices=list(llm_factory.PROVIDERS),
+                        help="要评测的提供商，可同时评测多个（默认 fake：离线假模型）")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--input", help="题目文件（.jsonl 或每行一题的文本）")
+    source.add_argument("--generate", type=int, metavar="N", help="随机生成 N 道算术题")
+    parser.add_argument("--seed", type=int, default=0, help="随机生成题目的种子")
+    parser.add_argument("--concurrency", type=int, default=16, help="同时运行的题数")
+    parser.add_argument("--rps", type=float, help="每个提供商每秒最多的 LLM 请求数")
+    parser.add_argument("--retries", type=int, default=3, help="失败后的重试次数")
+    parser.add_argument("--timeout", type=float, default=60, help="单次运行的超时（秒）")
+    parser.add_argument("--output", help="结果 JSONL 文件（按完成顺序逐行写入）")
+    parser.add_argument("--summary", help="把汇总结果写入这个 JSON 文件")
+    parser.add_argument("--fake-latency", type=float, help="假模型每次调用的平均延迟（毫秒）")
+    parser.add_argument("--fake-error-rate", type=float, help="假模型模拟出错的概率（0~1）")
+    args = parser.parse_args()
+
+    if args.fake_latency is not None:
+        os.environ["FAKE_LLM_LATENCY_MS"] = str(args.fake_latency)
+    if args.fake_error_rate is not None:
+        os.environ["FAKE_LLM_ERROR_RATE"] = str(args.fake_error_rate)
+
+    if args.input:
+        cases = load_cases(args.input)
+    elif args.generate:
+        cases = generate_cases(args.generate, args.seed)
+    else:
+        cases = DEFAULT_CASES
+
+    # 限流要在创建模型（编译图）之前设置
+    for provider in args.provider:
+        llm_factory.set_rate_limit(provider, args.rps)
+
+    agent_module = load_agent_module()
+    agents = {provider: agent_module.create_calculator_agent(provider) for provider in args.provider}
+
+    print("=" * 60)
+    print(f"批量评测：{len(cases)} 道题 × {len(agents)} 个提供商，并发 {args.concurrency}"
+          + (f"，每个提供商 {args.rps} 请求/秒" if args.rps else ""))
+    print("=" * 60)
+
+    records, elapsed = asyncio.run(run_batch(
+        agents, cases,
+        concurrency=args.concurrency,
+        retries=args.retries,
+        timeout=args.timeout,
+        output=args.output
+    ))
+
+    summary = summarize(records, elapsed)
+    print_summary(summary, elapsed)
+    if args.output:
+        print(f"\n逐题结果：{args.output}")
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump({"elapsed": round(elapsed, 3), "providers": summary}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
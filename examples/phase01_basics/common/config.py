@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+配置加载
+读取 config.yaml 中的 LLM 配置，验证后缓存，支持环境变量覆盖和热加载
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+阶段：第一阶段 - 基础概念
+类型：公共模块
+
+依赖：
+    - pydantic >= 2.0
+    - pydantic-settings
+    - pyyaml
+
+使用方式：
+    from common.config import load_config, watch_config
+
+    config = load_config()                       # 默认读取当前目录的 config.yaml 和 .env
+    model_config = config.current_model()        # 当前提供商的配置
+
+    watcher = watch_config(lambda config: print("切换到", config.provider))
+    ...
+    watcher.stop()
+
+环境变量覆盖（优先级：环境变量 > .env 文件 > config.yaml）：
+    LLM_PROVIDER=openai                          # 覆盖 llm.provider
+    LLM_MODELS__ZHIPU__API_KEY=xxx               # 覆盖 llm.models.zhipu.api_key
+    LLM_MODELS__OPENAI__TEMPERATURE=0.7          # 嵌套字段用双下划线分隔
+
+说明：
+    - 解析和验证只在配置变化时进行：缓存按 config.yaml 和 .env 的修改时间、大小
+      以及 LLM_ 开头的环境变量判断是否失效，未变化时 load_config() 只做两次 stat
+    - watch_config() 启动后台线程轮询这些文件，变化并通过验证后调用回调；
+      修改到一半的文件验证失败时保留旧配置，等下次变化再加载
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import yaml
+from pydantic import BaseModel, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+# 环境变量前缀
+ENV_PREFIX = "LLM_"
+# 热加载的默认轮询间隔（秒）
+WATCH_INTERVAL = 1.0
+
+
+# ========================================
+# 配置模型
+# ========================================
+
+class LLMModelConfig(BaseModel):
+    """单个 LLM 的配置"""
+    model: str
+    api_key: str
+    base_url: Optional[str] = None
+    temperature: float = 0
+
+
+class LLMConfig(BaseSettings):
+    """LLM 配置（config.yaml 中 llm: 下的内容）"""
+    provider: str
+    models: dict[str, LLMModelConfig]
+
+    model_config = SettingsConfigDict(
+        env_prefix=ENV_PREFIX,
+        env_nested_delimiter="__",
+        extra="ignore"
+    )
+
+    @classmethod
+    def settings_customise_sources(cls, settings_cls, init_settings, env_settings,
+                                   dotenv_settings, file_secret_settings):
+        # YAML 中的数据通过初始化参数传入，优先级最低
+        return env_settings, dotenv_settings, init_settings
+
+    @model_validator(mode="after")
+    def check_provider(self):
+        if self.provider not in self.models:
+            raise ValueError(f"provider '{self.provider}' 不在 models 中（可选：{', '.join(self.models)}）")
+        return self
+
+    def current_model(self) -> LLMModelConfig:
+        """当前提供商的配置"""
+        return self.models[self.provider]
+
+
+# ========================================
+# 加载和缓存
+# ========================================
+
+_lock = threading.Lock()
+_cache = {}  # (配置文件, .env 文件) -> (签名, LLMConfig)
+
+
+def _file_signature(path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _signature(config_path, env_file):
+    env = tuple(sorted((k, v) for k, v in os.environ.items() if k.upper().startswith(ENV_PREFIX)))
+    return _file_signature(config_path), _file_signature(env_file), env
+
+
+def _parse(config_path, env_file):
+    with open(config_path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+
+    # YAML 文件里是 llm: {...}，所以需要取 data["llm"]
+    llm_data = (data or {}).get("llm") or {}
+    return LLMConfig(_env_file=env_file if env_file.exists() else None, **llm_data)
+
+
+def load_config(config_path: str = "config.yaml", env_file: str = ".env") -> LLMConfig:
+    """读取配置文件（文件和 LLM_ 环境变量未变化时返回缓存的配置）
+
+    Raises:
+        FileNotFoundError: 配置文件不存在
+        pydantic.ValidationError: 配置格式或类型错误
+    """
+    config_path = Path(config_path).resolve()
+    env_file = Path(env_file).resolve()
+    key = (config_path, env_file)
+
+    signature = _signature(config_path, env_file)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        config = _parse(config_path, env_file)
+        _cache[key] = (signature, config)
+        return config
+
+
+def clear_config_cache():
+    with _lock:
+        _cache.clear()
+
+
+# ========================================
+# 热加载
+# ========================================
+
+class ConfigWatcher:
+    """轮询配置文件，变化后重新加载并调用 callback(config)"""
+
+    def __init__(self, callback, config_path="config.yaml", env_file=".env", interval=WATCH_INTERVAL):
+        self.callback = callback
+        self.config_path = Path(config_path).resolve()
+        self.env_file = Path(env_file).resolve()
+        self.interval = interval
+        self.config = None
+        self.error = None
+        self._signature = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """检查一次，配置变化并加载成功时调用回调，返回是否调用了回调"""
+        signature = _signature(self.config_path, self.env_file)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+
+        try:
+            config = load_config(self.config_path, self.env_file)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            # 保留上一次的配置
+            self.error = e
+            print(f"⚠️ 配置加载失败，继续使用旧配置：{e}")
+            return False
+
+        self.error = None
+        if config is self.config:
+            return False
+        self.config = config
+        self.callback(config)
+        return True
+
+    def start(self):
+        self.check()
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"⚠️ 配置回调出错：{e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def watch_config(callback, config_path: str = "config.yaml", env_file: str = ".env",
+                 interval: float = WATCH_INTERVAL) -> ConfigWatcher:
+    """启动配置热加载：立即用当前配置调用一次 callback，之后每次变化再调用"""
+    return ConfigWatcher(callback, config_path, env_file, interval).start()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+离线计算器聊天模型
+不访问网络、不需要 API key，模拟 LLM 调用计算器工具的过程，用于离线跑通 Agent 和批量评测
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+阶段：第一阶段 - 基础概念
+类型：公共模块
+
+依赖：
+    - langchain-core
+
+使用方式：
+    llm = get_llm("fake")                                   # 通过 LLM 工厂创建
+    python examples/phase01_basics/demos/04_real_calculator_agent_demo.py --provider fake
+
+行为：
+    - 最后一条是用户消息时，识别 "3 乘以 5"、"10 + 20"、"100 除以 4" 这类问题，
+      返回调用 multiply / add / divide 工具的 AIMessage；识别不了时直接回答
+    - 最后一条是工具结果时，返回 "计算结果是 X"
+
+环境变量：
+    FAKE_LLM_LATENCY_MS     每次调用的模拟延迟（毫秒，默认 200，实际延迟在 50%~150% 之间随机）
+    FAKE_LLM_ERROR_RATE     模拟接口出错的概率（0~1，默认 0），用于测试重试
+"""
+
+import asyncio
+import os
+import random
+import re
+import time
+import uuid
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+
+NUMBER = r"(-?\d+(?:\.\d+)?)"
+# (正则, 工具名)
+OPERATIONS = [
+    (re.compile(rf"{NUMBER}\s*(?:乘以|乘|\*|×|x|X)\s*{NUMBER}"), "multiply"),
+    (re.compile(rf"{NUMBER}\s*(?:加上|加|\+)\s*{NUMBER}"), "add"),
+    (re.compile(rf"{NUMBER}\s*(?:除以|/|÷)\s*{NUMBER}"), "divide"),
+]
+
+
+class FakeLLMError(RuntimeError):
+    """模拟的接口错误"""
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+class FakeCalculatorChatModel(BaseChatModel):
+    """按规则调用计算器工具的假聊天模型"""
+
+    model: str = "fake-calculator"
+    api_key: str | None = None
+    temperature: float = 0
+    # 创建实例时读取环境变量（模块可能早于环境变量设置被导入）
+    latency: float = Field(default_factory=lambda: float(os.getenv("FAKE_LLM_LATENCY_MS", "200")) / 1000)
+    error_rate: float = Field(default_factory=lambda: float(os.getenv("FAKE_LLM_ERROR_RATE", "0")))
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-calculator"
+
+    def bind_tools(self, tools, **kwargs):
+        # 工具名固定为 multiply / add / divide，不需要真正绑定
+        return self
+
+    def _delay(self):
+        return self.latency * random.uniform(0.5, 1.5)
+
+    def _respond(self, messages):
+        if self.error_rate and random.random() < self.error_rate:
+            raise FakeLLMError("模拟的接口错误")
+
+        last = messages[-1]
+        if isinstance(last, ToolMessage):
+            message = AIMessage(content=f"计算结果是 {last.content}")
+        else:
+            message = AIMessage(content="抱歉，我只会乘法、加法和除法。")
+            for pattern, tool_name in OPERATIONS:
+                match = pattern.search(str(last.content))
+                if match:
+                    message = AIMessage(content="", tool_calls=[{
+                        "name": tool_name,
+                        "args": {"a": _number(match.group(1)), "b": _number(match.group(2))},
+                        "id": f"call_{uuid.uuid4().hex[:12]}",
+                        "type": "tool_call",
+                    }])
+                    break
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self._delay())
+        return self._respond(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self._delay())
+        return self._respond(messages)
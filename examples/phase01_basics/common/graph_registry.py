@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+图注册表
+每个 (构建函数, 提供商, 工具集合) 组合只构建、编译一次，之后直接返回编译好的图
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+阶段：第一阶段 - 基础概念
+类型：公共模块
+
+使用方式：
+    from common.graph_registry import get_graph, invalidate
+
+    def build_graph(provider, tools):
+        graph = StateGraph(State)
+        ...
+        return graph                     # 返回未编译的 StateGraph
+
+    app = get_graph(build_graph, "zhipu", tools)   # 第一次构建并编译，之后直接返回
+    app.invoke(...)                                # 也可以在多个线程 / 协程中同时 invoke、ainvoke
+
+    invalidate(provider="zhipu")         # 配置变化后丢弃相关的图，下次 get_graph() 重新编译
+
+说明：
+    - 编译好的图不保存调用状态（没有 checkpointer 时），可以同时处理多个请求
+    - 同一个组合第一次被并发请求时只编译一次，其他请求等待编译完成
+    - 工具集合按工具对象区分（顺序有关），注册表持有工具的引用
+    - stats() 记录每个图的构建、编译耗时和命中次数
+"""
+
+import threading
+import time
+
+
+class GraphRegistry:
+    """编译好的图的缓存"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # 键 -> 条目
+        self._compiling = {}  # 键 -> 编译锁
+
+    @staticmethod
+    def _key(builder, provider, tools, options):
+        return builder, provider, tuple(id(t) for t in tools), repr(sorted(options.items()))
+
+    def get(self, builder, provider, tools=(), **options):
+        """返回 builder(provider, tools, **options) 编译后的图，同一组合只编译一次"""
+        tools = tuple(tools)
+        key = self._key(builder, provider, tools, options)
+
+        entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                lock = self._compiling.setdefault(key, threading.Lock())
+            with lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._compile(builder, provider, tools, options)
+                    with self._lock:
+                        self._entries[key] = entry
+                        self._compiling.pop(key, None)
+
+        entry["hits"] += 1  # 统计用，并发时允许少量误差，不加锁
+        return entry["graph"]
+
+    @staticmethod
+    def _compile(builder, provider, tools, options):
+        start = time.perf_counter()
+        graph = builder(provider, list(tools), **options)
+        built = time.perf_counter()
+        compiled = graph.compile()
+        compiled_at = time.perf_counter()
+
+        return {
+            "graph": compiled,
+            "builder": builder,
+            "provider": provider,
+            "tools": tools,
+            "options": options,
+            "build_ms": round((built - start) * 1000, 2),
+            "compile_ms": round((compiled_at - built) * 1000, 2),
+            "compiled_at": time.time(),
+            "hits": 0,
+        }
+
+    def invalidate(self, builder=None, provider=None):
+        """丢弃匹配的图（参数都不传时清空），返回丢弃的个数"""
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if (builder is None or entry["builder"] is builder)
+                and (provider is None or entry["provider"] == provider)
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self):
+        """每个已编译的图的耗时和命中次数"""
+        with self._lock:
+            entries = list(self._entries.values())
+        return [{
+            "builder": entry["builder"].__qualname__,
+            "provider": entry["provider"],
+            "tools": [getattr(t, "name", repr(t)) for t in entry["tools"]],
+            "build_ms": entry["build_ms"],
+            "compile_ms": entry["compile_ms"],
+            "compiled_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["compiled_at"])),
+            "hits": entry["hits"],
+        } for entry in entries]
+
+
+# 默认注册表
+registry = GraphRegistry()
+
+get_graph = registry.get
+invalidate = registry.invalidate
+stats = registry.stats
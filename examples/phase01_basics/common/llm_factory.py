@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LLM 工厂
+按提供商创建聊天模型，并缓存创建好的实例和绑定工具后的模型
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+阶段：第一阶段 - 基础概念
+类型：公共模块
+
+依赖：
+    - langchain-openai（openai / zhipu）
+    - langchain-anthropic（anthropic）
+    - langchain-google-genai（google）
+
+使用方式：
+    from common.llm_factory import get_llm, bind_tools
+
+    llm = get_llm("zhipu")                     # 使用默认模型和环境变量中的 API key
+    llm = get_llm("openai", model="gpt-4.1")   # 覆盖默认配置
+    llm_with_tools = bind_tools(llm, tools)
+
+说明：
+    - 同样的 (提供商, 模型, base_url, temperature, API key) 只创建一次聊天模型，
+      之后的调用直接返回同一个实例，底层 HTTP 客户端和它的连接池也随之复用，
+      长时间运行的服务不必每个请求都重新建客户端、重新做 TLS 握手
+    - OpenAI 兼容接口（openai、zhipu）的所有实例共用一对 httpx 客户端（同步 / 异步），
+      不同 base_url 在同一个连接池里各自保持长连接；异步客户端在每个事件循环中各用一个连接池
+    - bind_tools() 按 (模型实例, 工具列表) 缓存绑定结果
+    - 提供商的 SDK 在第一次创建该提供商的模型时才导入
+    - set_rate_limit() 按提供商限制请求速率（langchain_core 的 InMemoryRateLimiter）
+"""
+
+import asyncio
+import importlib
+import os
+import threading
+import weakref
+
+from common import graph_registry
+
+
+# ========================================
+# 提供商配置
+# ========================================
+
+# chat_model：(模块, 类名)；api_key_env：未传 api_key 时读取的环境变量；
+# shared_http_client：是否使用共享的 httpx 客户端（只有 ChatOpenAI 支持传入）
+PROVIDERS = {
+    "openai": {
+        "chat_model": ("langchain_openai", "ChatOpenAI"),
+        "model": "gpt-4.1-mini",
+        "api_key_env": "OPENAI_API_KEY",
+        "shared_http_client": True,
+    },
+    "anthropic": {
+        "chat_model": ("langchain_anthropic", "ChatAnthropic"),
+        "model": "claude-sonnet-4-5-20250929",
+        "api_key_env": "ANTHROPIC_API_KEY",
+    },
+    "google": {
+        "chat_model": ("langchain_google_genai", "ChatGoogleGenerativeAI"),
+        "model": "gemini-2.5-flash-lite",
+        "api_key_env": "GOOGLE_API_KEY",
+    },
+    "zhipu": {
+        # 智谱使用 OpenAI 兼容模式
+        "chat_model": ("langchain_openai", "ChatOpenAI"),
+        "model": "glm-4-flash",
+        "api_key_env": "ZHIPU_API_KEY",
+        "base_url": "https://open.bigmodel.cn/api/paas/v4/",
+        "shared_http_client": True,
+    },
+    "fake": {
+        # 离线假模型（common/fake_llm.py），不访问网络，用于离线运行和批量评测
+        "chat_model": ("common.fake_llm", "FakeCalculatorChatModel"),
+        "model": "fake-calculator",
+        "api_key_env": "FAKE_API_KEY",
+    },
+}
+
+# 共享连接池的大小
+MAX_CONNECTIONS = 50
+MAX_KEEPALIVE_CONNECTIONS = 20
+# 空闲长连接保留时间（秒）
+KEEPALIVE_EXPIRY = 60
+
+
+_lock = threading.RLock()
+_llms = {}            # (提供商, 模型, base_url, temperature, API key) -> 聊天模型
+_bound = {}           # (id(模型), 工具 id, 绑定参数) -> (模型, 工具, 绑定后的模型)
+_http_clients = None  # (httpx.Client, httpx.AsyncClient)
+_rate_limiters = {}   # 提供商 -> InMemoryRateLimiter
+
+
+# ========================================
+# 共享 HTTP 客户端
+# ========================================
+
+class _PerLoopAsyncTransport:
+    """按事件循环分开连接池的 httpx 异步传输层
+
+    异步连接属于创建它的事件循环，在另一个事件循环（例如下一次 asyncio.run()）中复用会出错。
+    这里为每个事件循环各建一个传输层，事件循环被回收后它的传输层随之释放。
+    """
+
+    def __init__(self, create_transport):
+        self._create_transport = create_transport
+        self._transports = weakref.WeakKeyDictionary()  # 事件循环 -> 传输层
+        self._transports_lock = threading.Lock()
+
+    def _current(self):
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            with self._transports_lock:
+                transport = self._transports.get(loop)
+                if transport is None:
+                    transport = self._transports[loop] = self._create_transport()
+        return transport
+
+    async def handle_async_request(self, request):
+        return await self._current().handle_async_request(request)
+
+    async def aclose(self):
+        """关闭当前事件循环的连接池"""
+        with self._transports_lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type=None, exc_value=None, traceback=None):
+        await self.aclose()
+
+
+def shared_http_clients():
+    """OpenAI 兼容接口共用的 (httpx.Client, httpx.AsyncClient)
+
+    异步客户端可以在多个事件循环中使用，每个事件循环各自一个连接池
+    """
+    global _http_clients
+    if _http_clients is None:
+        with _lock:
+            if _http_clients is None:
+                import httpx
+
+                limits = httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                )
+                async_transport = _PerLoopAsyncTransport(lambda: httpx.AsyncHTTPTransport(limits=limits))
+                _http_clients = (httpx.Client(limits=limits), httpx.AsyncClient(transport=async_transport))
+    return _http_clients
+
+
+# ========================================
+# 创建聊天模型
+# ========================================
+
+def _create_llm(provider, model, api_key, base_url, temperature):
+    settings = PROVIDERS[provider]
+    module_name, class_name = settings["chat_model"]
+    chat_model = getattr(importlib.import_module(module_name), class_name)
+
+    kwargs = {"model": model, "api_key": api_key, "temperature": temperature}
+    if base_url:
+        kwargs["base_url"] = base_url
+    if settings.get("shared_http_client"):
+        kwargs["http_client"], kwargs["http_async_client"] = shared_http_clients()
+    if provider in _rate_limiters:
+        kwargs["rate_limiter"] = _rate_limiters[provider]
+    return chat_model(**kwargs)
+
+
+def get_llm(provider="zhipu", model=None, api_key=None, base_url=None, temperature=0):
+    """
+    获取配置好的 LLM（相同配置返回同一个实例）
+
+    Args:
+        provider: 提供商名称，可选值见 PROVIDERS：
+            - "openai": OpenAI GPT
+            - "anthropic": Anthropic Claude
+            - "google": Google Gemini
+            - "zhipu": 智谱 GLM (默认)
+            - "fake": 离线假模型（不访问网络）
+        model: 模型名称，默认使用 PROVIDERS 中的模型
+        api_key: API key，默认读取提供商对应的环境变量
+        base_url: 接口地址，默认使用 PROVIDERS 中的地址（没有则用 SDK 默认地址）
+        temperature: 温度
+    """
+    settings = PROVIDERS.get(provider)
+    if settings is None:
+        raise ValueError(f"不支持的提供商: {provider}")
+
+    model = model or settings["model"]
+    api_key = api_key or os.getenv(settings["api_key_env"])
+    base_url = base_url or settings.get("base_url")
+    key = (provider, model, base_url, temperature, api_key)
+
+    llm = _llms.get(key)
+    if llm is None:
+        with _lock:
+            llm = _llms.get(key)
+            if llm is None:
+                llm = _llms[key] = _create_llm(provider, model, api_key, base_url, temperature)
+    return llm
+
+
+def bind_tools(llm, tools, **kwargs):
+    """llm.bind_tools(tools, **kwargs) 的缓存版本：同一个模型和同一组工具只绑定一次"""
+    tools = tuple(tools)
+    key = (id(llm), tuple(id(t) for t in tools), repr(sorted(kwargs.items())))
+
+    entry = _bound.get(key)
+    if entry is None:
+        with _lock:
+            entry = _bound.get(key)
+            if entry is None:
+                # 同时保存模型和工具的引用，保证 id 在缓存期间不会被复用
+                entry = _bound[key] = (llm, tools, llm.bind_tools(list(tools), **kwargs))
+    return entry[2]
+
+
+# ========================================
+# 限流
+# ========================================
+
+def set_rate_limit(provider, requests_per_second, burst=None):
+    """限制一个提供商的请求速率（同一提供商的所有模型共用一个令牌桶，同步、异步调用都生效）
+
+    requests_per_second 为 None 时取消限制。已创建的该提供商模型、它们的工具绑定结果，
+    以及默认图注册表（common.graph_registry）中该提供商的图都会被丢弃，之后按新的限流重新创建
+    """
+    with _lock:
+        if requests_per_second:
+            from langchain_core.rate_limiters import InMemoryRateLimiter
+
+            _rate_limiters[provider] = InMemoryRateLimiter(
+                requests_per_second=requests_per_second,
+                check_every_n_seconds=min(0.1, 1 / requests_per_second),
+                max_bucket_size=burst or max(1, requests_per_second)
+            )
+        else:
+            _rate_limiters.pop(provider, None)
+
+        dropped = {id(_llms.pop(key)) for key in [key for key in _llms if key[0] == provider]}
+        # 绑定结果按 id(模型) 缓存，不一起删掉的话会一直持有被丢弃的模型
+        for key in [key for key in _bound if key[0] in dropped]:
+            del _bound[key]
+
+    # 编译好的图持有旧模型，不丢弃的话限流对它们不生效
+    graph_registry.invalidate(provider=provider)
+
+
+# ========================================
+# 缓存管理
+# ========================================
+
+def cache_info():
+    """缓存状态（不包含 API key）"""
+    with _lock:
+        return {
+            "llms": [
+                {"provider": provider, "model": model, "base_url": base_url, "temperature": temperature}
+                for provider, model, base_url, temperature, _ in _llms
+            ],
+            "bound": len(_bound),
+            "shared_http_client": _http_clients is not None,
+        }
+
+
+def clear_cache():
+    """清空缓存的模型和绑定结果，关闭共享的同步 HTTP 客户端（配置或 API key 变化后调用）"""
+    global _http_clients
+    with _lock:
+        _llms.clear()
+        _bound.clear()
+        if _http_clients is not None:
+            # 异步客户端只能在事件循环中关闭，这里交给垃圾回收
+            _http_clients[0].close()
+            _http_clients = None
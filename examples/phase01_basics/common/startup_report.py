@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+冷启动报告
+按提供商统计计算器 Agent（demos/04_real_calculator_agent_demo.py）的冷启动耗时
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+阶段：第一阶段 - 基础概念
+类型：工具脚本
+
+运行方式：
+    python examples/phase01_basics/common/startup_report.py
+    python examples/phase01_basics/common/startup_report.py --provider zhipu openai --repeat 5
+    python examples/phase01_basics/common/startup_report.py --output startup.jsonl   # 追加结果，跟踪变化
+
+说明：
+    - 每次测量都启动一个新的解释器（python -X importtime），统计三段耗时：
+      总耗时（含解释器启动）、导入 Agent 模块、创建 Agent（导入提供商 SDK、创建 LLM、编译图）
+    - 按顶层包汇总 -X importtime 输出中的自身耗时（self），列出导入最慢的包
+    - 只创建 LLM 对象，不调用接口；没有配置 API key 的提供商用占位 key 代替
+    - --repeat 多次测量时，耗时取中位数，各包耗时取平均值
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from common.llm_factory import PROVIDERS
+
+
+AGENT_SCRIPT = Path(__file__).resolve().parents[1] / "demos" / "04_real_calculator_agent_demo.py"
+PLACEHOLDER_API_KEY = "startup-report-placeholder"
+
+# 子进程：导入 Agent 模块并创建 Agent，把耗时以 JSON 输出到 stdout（importtime 输出在 stderr）
+CHILD_SCRIPT = r"""
+import importlib.util, json, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("calculator_agent", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+imported = time.perf_counter()
+module.create_calculator_agent(sys.argv[2])
+created = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "create_ms": (created - imported) * 1000}))
+"""
+
+
+# ========================================
+# 测量
+# ========================================
+
+def parse_importtime(stderr):
+    """按顶层包汇总 -X importtime 的自身耗时（毫秒）"""
+    packages = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        packages[parts[2].strip().split(".")[0]] += int(parts[0]) / 1000
+    return packages
+
+
+def measure(provider, script=AGENT_SCRIPT):
+    """启动一个新解释器测量一次，失败时抛出 RuntimeError"""
+    env = dict(os.environ)
+    api_key_env = PROVIDERS[provider]["api_key_env"]
+    env.setdefault(api_key_env, PLACEHOLDER_API_KEY)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT, str(script), provider],
+        capture_output=True, text=True, env=env, timeout=300
+    )
+    total_ms = (time.perf_counter() - start) * 1000
+
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("\n".join(errors[-5:]) or f"退出码 {result.returncode}")
+
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["total_ms"] = total_ms
+    return timings, parse_importtime(result.stderr)
+
+
+def report(provider, repeat=3, top=10):
+    """测量 repeat 次，返回汇总结果"""
+    runs = []
+    packages = Counter()
+    for _ in range(repeat):
+        timings, run_packages = measure(provider)
+        runs.append(timings)
+        packages.update(run_packages)
+
+    return {
+        "provider": provider,
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "total_ms": round(statistics.median(r["total_ms"] for r in runs), 1),
+        "import_ms": round(statistics.median(r["import_ms"] for r in runs), 1),
+        "create_ms": round(statistics.median(r["create_ms"] for r in runs), 1),
+        "packages": {name: round(ms / repeat, 1) for name, ms in packages.most_common(top)},
+    }
+
+
+# ========================================
+# 输出
+# ========================================
+
+def print_report(result):
+    print(f"\n【{result['provider']}】")
+    print(f"  总耗时:     {result['total_ms']:>8.1f} ms（含解释器启动）")
+    print(f"  导入模块:   {result['import_ms']:>8.1f} ms")
+    print(f"  创建 Agent: {result['create_ms']:>8.1f} ms")
+    print("  导入最慢的包（自身耗时）：")
+    for name, ms in result["packages"].items():
+        print(f"    {name:<28} {ms:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="计算器 Agent 冷启动报告")
+    parser.add_argument("--provider", nargs="+", default=list(PROVIDERS), choices=list(PROVIDERS),
+                        help="要测量的提供商（默认全部）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个提供商测量次数")
+    parser.add_argument("--top", type=int, default=10, help="列出导入最慢的包的个数")
+    parser.add_argument("--output", help="把结果以 JSON 行追加到这个文件")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"冷启动报告：{AGENT_SCRIPT.name}")
+    print("=" * 60)
+
+    for provider in args.provider:
+        try:
+            result = report(provider, args.repeat, args.top)
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"\n【{provider}】❌ 测量失败：{e}")
+            continue
+
+        print_report(result)
+        if args.output:
+            result["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            with open(args.output, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,13 +20,18 @@
 运行方式：
     python examples/phase01_basics/demos/04_real_calculator_agent_demo.py --provider zhipu
     python examples/phase01_basics/demos/04_real_calculator_agent_demo.py --provider openai
+    python examples/phase01_basics/demos/04_real_calculator_agent_demo.py --provider fake     # 离线运行
+
+    冷启动耗时（导入本模块 + 创建 Agent，按提供商统计）：
+    python examples/phase01_basics/common/startup_report.py --provider zhipu openai
 
 学习要点：
     - 定义多个工具并绑定到 LLM
     - 使用 MessagesState 作为状态
     - 实现条件边判断是否需要调用工具
     - 构建完整的 Agent 循环（LLM -> 工具 -> LLM）
-    - 支持多个 LLM 提供商的配置
+    - 编译好的图只编译一次，之后复用（common.graph_registry）
+    - 支持多个 LLM 提供商的配置（通过 common.llm_factory 创建并缓存 LLM）
 """
 
 import sys
@@ -36,20 +41,23 @@ if os.name == 'nt':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+from pathlib import Path
+
+# 把 examples/phase01_basics 加入搜索路径，以便导入 common 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
 from dotenv import load_dotenv
 load_dotenv()
 
-from typing_extensions import TypedDict, Annotated
 from typing import Literal
-import operator
 
-from langchain.tools import tool
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
+# 启动时只导入定义工具和状态必须的模块：
+# - @tool 直接从 langchain_core 导入（langchain.tools 会连带导入 langgraph.prebuilt 等）
+# - 提供商 SDK（langchain_openai 等）由 get_llm() 在选定提供商后才导入
+# - ToolNode 在构建图时才导入
+from langchain_core.tools import tool
 from langgraph.graph import StateGraph, START, END, MessagesState
-from langgraph.prebuilt import ToolNode
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+from langchain_core.messages import HumanMessage
 
 
 # ========================================
@@ -80,45 +88,11 @@ tools = [multiply, add, divide]
 # 步骤2：配置 LLM
 # ========================================
 
-def get_llm(provider="zhipu"):
-    """
-    获取配置好的 LLM
-
-    Args:
-        provider: 提供商名称，可选值：
-            - "openai": OpenAI GPT
-            - "anthropic": Anthropic Claude
-            - "google": Google Gemini
-            - "zhipu": 智谱 GLM (默认)
-    """
-    if provider == "openai":
-        return ChatOpenAI(
-            model="gpt-4.1-mini",
-            temperature=0,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-    elif provider == "anthropic":
-        return ChatAnthropic(
-            model="claude-sonnet-4-5-20250929",
-            temperature=0,
-            api_key=os.getenv("ANTHROPIC_API_KEY")
-        )
-    elif provider == "google":
-        return ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash-lite",
-            temperature=0,
-            api_key=os.getenv("GOOGLE_API_KEY")
-        )
-    elif provider == "zhipu":
-        # 智谱使用 OpenAI 兼容模式
-        return ChatOpenAI(
-            model="glm-4-flash",  # 或 glm-4-plus, glm-4-air
-            temperature=0,
-            api_key=os.getenv("ZHIPU_API_KEY"),
-            base_url="https://open.bigmodel.cn/api/paas/v4/"
-        )
-    else:
-        raise ValueError(f"不支持的提供商: {provider}")
+# 各提供商的默认模型、API key 环境变量和 base_url 见 common/llm_factory.py 中的 PROVIDERS。
+# get_llm() 对相同配置返回同一个实例（复用 HTTP 连接池），
+# bind_tools() 对同一个模型和同一组工具只绑定一次
+from common.llm_factory import PROVIDERS, get_llm, bind_tools
+from common import graph_registry
 
 
 # ========================================
@@ -161,19 +135,20 @@ def should_continue(state: CalculatorState) -> Literal["tools", END]:
 # 步骤6：构建图
 # ========================================
 
-def create_calculator_agent(provider="zhipu"):
-    """创建计算器 Agent"""
+def build_calculator_graph(provider, tools):
+    """构建计算器 Agent 的图（未编译）"""
 
     # 获取配置好的 LLM
     llm = get_llm(provider)
 
-    # 把工具绑定到 LLM
-    llm_with_tools = llm.bind_tools(tools)
+    # 把工具绑定到 LLM（结果会被缓存）
+    llm_with_tools = bind_tools(llm, tools)
 
     # 创建 LLM 节点
     llm_node = create_llm_node(llm_with_tools)
 
     # 创建工具节点
+    from langgraph.prebuilt import ToolNode
     tool_node = ToolNode(tools)
 
     # 构建图
@@ -188,8 +163,18 @@ def create_calculator_agent(provider="zhipu"):
     graph.add_conditional_edges("llm", should_continue, ["tools", END])
     graph.add_edge("tools", "llm")
 
-    # 编译
-    return graph.compile()
+    return graph
+
+
+def create_calculator_agent(provider="zhipu"):
+    """
+    创建计算器 Agent
+
+    图由注册表编译并缓存：同一个提供商和工具集合只编译一次，
+    之后每次调用（例如服务中的每个请求）直接拿到编译好的图，可并发 invoke / ainvoke。
+    切换模型配置后用 graph_registry.invalidate(provider=...) 丢弃旧图
+    """
+    return graph_registry.get_graph(build_calculator_graph, provider, tools)
 
 
 # ========================================
@@ -231,6 +216,10 @@ def test_calculator(provider="zhipu"):
 
         print()
 
+    for entry in graph_registry.stats():
+        print(f"图编译：{entry['provider']} 构建 {entry['build_ms']} ms，"
+              f"编译 {entry['compile_ms']} ms，获取 {entry['hits']} 次")
+
 
 def main():
     import argparse
@@ -240,8 +229,8 @@ def main():
         "--provider",
         type=str,
         default="zhipu",
-        choices=["openai", "anthropic", "google", "zhipu"],
-        help="选择 LLM 提供商"
+        choices=list(PROVIDERS),
+        help="选择 LLM 提供商（fake 为离线假模型，不需要 API key）"
     )
     args = parser.parse_args()
 
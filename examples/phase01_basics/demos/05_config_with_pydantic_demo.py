@@ -12,6 +12,7 @@ Pydantic 配置管理演示
 依赖：
     - Python >= 3.10
     - pydantic >= 2.0
+    - pydantic-settings
     - pyyaml
 
 运行方式：
@@ -22,6 +23,7 @@ Pydantic 配置管理演示
     - 从 YAML 文件读取配置
     - 自动验证配置格式和类型
     - IDE 代码提示和类型检查
+    - 用环境变量 / .env 覆盖配置（pydantic-settings）
 """
 
 import sys
@@ -31,44 +33,38 @@ if os.name == 'nt':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-import yaml
-from pydantic import BaseModel
-from typing import Optional
+from pathlib import Path
+
+# 把 examples/phase01_basics 加入搜索路径，以便导入 common 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 
 # ========================================
 # 步骤1：定义 Pydantic 模型（配置结构）
 # ========================================
-
-class LLMModelConfig(BaseModel):
-    """单个 LLM 的配置"""
-    model: str
-    api_key: str
-    base_url: Optional[str] = None
-    temperature: float = 0
-
-
-class LLMConfig(BaseModel):
-    """LLM 配置"""
-    provider: str
-    models: dict[str, LLMModelConfig]
+# 模型定义在 common/config.py 中，演示、练习共用一份：
+#
+#     class LLMModelConfig(BaseModel):      # 单个 LLM 的配置
+#         model: str
+#         api_key: str
+#         base_url: Optional[str] = None
+#         temperature: float = 0
+#
+#     class LLMConfig(BaseSettings):        # LLM 配置
+#         provider: str
+#         models: dict[str, LLMModelConfig]
+#
+# LLMConfig 继承自 pydantic-settings 的 BaseSettings（BaseModel 的子类），
+# 除了 YAML 中的值，还可以用环境变量或 .env 文件覆盖，例如 LLM_PROVIDER=openai
 
 
 # ========================================
 # 步骤2：读取 YAML 并转换成 Pydantic 模型
 # ========================================
+# load_config() 读取 YAML、取出 data["llm"]、转换成 LLMConfig（会自动验证），
+# 并按文件修改时间缓存结果：文件没变时再次调用直接返回同一个对象
 
-def load_config(config_path: str = "config.yaml") -> LLMConfig:
-    """读取配置文件"""
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-
-    # YAML 文件里是 llm: {...}，所以需要取 data["llm"]
-    llm_data = data["llm"]
-
-    # 转换成 Pydantic 模型（会自动验证）
-    config = LLMConfig(**llm_data)
-    return config
+from common.config import LLMModelConfig, LLMConfig, load_config
 
 
 # ========================================
@@ -87,8 +83,8 @@ def main():
         print(f"\n✅ 配置文件读取成功！")
         print(f"当前提供商: {config.provider}")
 
-        # 获取当前提供商的配置
-        current_provider_config = config.models[config.provider]
+        # 获取当前提供商的配置（等价于 config.models[config.provider]）
+        current_provider_config = config.current_model()
         print(f"模型名称: {current_provider_config.model}")
         print(f"API Key: {current_provider_config.api_key[:20]}...")  # 只显示前20个字符
         if current_provider_config.base_url:
@@ -101,6 +97,7 @@ def main():
         print("2. ✅ IDE 有代码提示")
         print("3. ✅ 类型检查")
         print("4. ✅ 配置结构清晰")
+        print("5. ✅ 可用环境变量覆盖（pydantic-settings）")
 
     except Exception as e:
         print(f"\n❌ 错误：{e}")
@@ -12,56 +12,39 @@
 依赖：
     - Python >= 3.10
     - pydantic >= 2.0
+    - pydantic-settings
     - pyyaml
-    - langchain-openai
+    - langchain-openai / langchain-anthropic / langchain-google-genai（按提供商）
 
 运行方式：
     python examples/phase01_basics/demos/06_create_llm_from_config_demo.py
+    python examples/phase01_basics/demos/06_create_llm_from_config_demo.py --watch   # 配置热加载
 
 学习要点：
     - 从 YAML 配置文件读取 LLM 配置
     - 根据配置动态创建 LLM 实例
     - 使用 Pydantic 进行配置验证
     - 支持多个 LLM 提供商的配置切换
+    - 通过 common.llm_factory 复用已创建的 LLM 实例
+    - 配置文件变化后自动切换 LLM（common.config.watch_config），并丢弃用旧配置编译的图
 """
 
 import sys
 import os
+import time
 
 if os.name == 'nt':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-import yaml
-from pydantic import BaseModel
-from typing import Optional
-from langchain_openai import ChatOpenAI
+from pathlib import Path
 
+# 把 examples/phase01_basics 加入搜索路径，以便导入 common 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-# ========================================
-# 配置模型（简化版，直接放这里）
-# ========================================
-
-class LLMModelConfig(BaseModel):
-    model: str
-    api_key: str
-    base_url: Optional[str] = None
-    temperature: float = 0
-
-
-class LLMConfig(BaseModel):
-    provider: str
-    models: dict[str, LLMModelConfig]
-
-
-def load_config(config_path: str = "config.yaml") -> LLMConfig:
-    """读取配置文件"""
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-
-    llm_data = data["llm"]
-    config = LLMConfig(**llm_data)
-    return config
+from common import graph_registry
+from common.config import load_config, watch_config
+from common.llm_factory import get_llm
 
 
 # ========================================
@@ -75,44 +58,82 @@ def get_llm_from_config(config_path: str = "config.yaml"):
     Returns:
         配置好的 LLM 实例
     """
-    # 1. 读取配置
+    # 1. 读取配置（common.config 缓存了验证后的配置，文件没变时不会重新解析）
     config = load_config(config_path)
 
     # 2. 获取当前提供商的配置
     provider_name = config.provider
-    model_config = config.models[provider_name]
+    model_config = config.current_model()
 
     print(f"正在初始化 {provider_name} LLM...")
     print(f"  模型: {model_config.model}")
 
-    # 3. 创建 LLM
-    if provider_name in ["zhipu", "openai"]:
-        # 使用 ChatOpenAI（支持 OpenAI 兼容 API）
-        llm = ChatOpenAI(
-            model=model_config.model,
-            api_key=model_config.api_key,
-            base_url=model_config.base_url,
-            temperature=model_config.temperature
-        )
-    else:
-        raise ValueError(f"暂不支持的提供商: {provider_name}")
+    # 3. 创建 LLM（由 LLM 工厂按提供商选择聊天模型类，相同配置复用同一个实例）
+    llm = get_llm(
+        provider_name,
+        model=model_config.model,
+        api_key=model_config.api_key,
+        base_url=model_config.base_url,
+        temperature=model_config.temperature
+    )
 
     print(f"✅ {provider_name} LLM 初始化成功！")
     return llm
 
 
+# ========================================
+# 热加载
+# ========================================
+
+def watch_llm_config(config_path: str = "config.yaml"):
+    """修改 config.yaml（例如 provider）后自动切换 LLM，不需要重启（Ctrl+C 退出）"""
+    previous = {}
+
+    def on_change(config):
+        # 模型配置有变化的提供商：丢弃用旧配置编译的图，下次 get_graph() 重新编译
+        for provider in set(previous) | set(config.models):
+            if previous.get(provider) != config.models.get(provider):
+                graph_registry.invalidate(provider=provider)
+        previous.clear()
+        previous.update(config.models)
+
+        llm = get_llm_from_config(config_path)
+        print(f"当前 LLM: {type(llm).__name__}（{config.current_model().model}）\n")
+
+    watcher = watch_config(on_change, config_path)
+    print("正在监听配置变化，按 Ctrl+C 退出...\n")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+
+
 # ========================================
 # 测试
 # ========================================
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="从配置创建 LLM")
+    parser.add_argument("--config", default="config.yaml", help="配置文件路径")
+    parser.add_argument("--watch", action="store_true", help="监听配置文件，变化后自动切换 LLM")
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_llm_config(args.config)
+        return
+
     print("=" * 60)
     print("测试：从配置创建 LLM")
     print("=" * 60)
 
     try:
         # 创建 LLM
-        llm = get_llm_from_config()
+        llm = get_llm_from_config(args.config)
 
         # 测试调用
         print("\n测试调用 LLM...")
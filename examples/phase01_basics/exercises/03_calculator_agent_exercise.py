@@ -14,6 +14,7 @@
     - langgraph >= 1.0.0
     - langchain-openai
     - pydantic
+    - pydantic-settings
     - pyyaml
 
 运行方式：
@@ -35,18 +36,20 @@ if os.name == 'nt':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-from typing_extensions import TypedDict, Annotated
-from typing import Literal, Optional
-import operator
+from pathlib import Path
 
-from langchain.tools import tool
+# 把 examples/phase01_basics 加入搜索路径，以便导入 common 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from typing import Literal
+
+# @tool 直接从 langchain_core 导入（langchain.tools 会连带导入 langgraph.prebuilt 等，启动更慢）
+from langchain_core.tools import tool
 from langgraph.graph import StateGraph, START, END, MessagesState
-from langgraph.prebuilt import ToolNode
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
-from pydantic import BaseModel
-import yaml
+from common.config import load_config
+from common.llm_factory import get_llm, bind_tools
 
 
 # ============ 步骤1：定义工具 ============
@@ -78,7 +81,10 @@ class CalculatorState(MessagesState):
 
 # ============ 步骤3：定义工具节点 ============
 # ToolNode 会自动处理工具调用
-tool_node = ToolNode(tools)
+# 导入本模块时不创建任何对象，ToolNode 和 LLM 都在第一次用到时才创建
+def create_tool_node():
+    from langgraph.prebuilt import ToolNode
+    return ToolNode(tools)
 
 
 # ============ 步骤4：定义 LLM 节点 ============
@@ -89,36 +95,25 @@ tool_node = ToolNode(tools)
 # 3. model = "glm-4-flash"
 # 4. api_key 从 config.yaml 读取，或者先写死测试
 # 5. 用 bind_tools(tools) 绑定工具
-class LLMModelConfig(BaseModel):
-    model: str
-    api_key: str
-    base_url: Optional[str] = None
-    temperature: float = 0
-
-
-class LLMConfig(BaseModel):
-    provider: str
-    models: dict[str, LLMModelConfig]
-
-
-def load_config(config_path: str = "config.yaml") -> LLMConfig:
-    """读取配置文件"""
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-
-    llm_data = data["llm"]
-    return LLMConfig(**llm_data)
-
+# 配置模型（LLMConfig / LLMModelConfig）和 load_config() 在 common/config.py 中
+def get_llm_with_tools():
+    """
+    第一次调用时读取配置、创建 LLM 并绑定工具
 
-llm_config = load_config()
-llm_model = llm_config.models[llm_config.provider]
-llm = ChatOpenAI(
-    model=llm_model.model,
-    api_key=llm_model.api_key,
-    base_url=llm_model.base_url,
-    temperature=llm_model.temperature
-)
-llm_with_tools = llm.bind_tools(tools)
+    load_config()、get_llm()、bind_tools() 都有缓存，之后的调用几乎没有开销，
+    修改 config.yaml 后下一次调用会自动使用新配置
+    """
+    llm_config = load_config()
+    llm_model = llm_config.current_model()
+    # 用 LLM 工厂创建（相同配置复用同一个实例和连接池），绑定结果同样会被缓存
+    llm = get_llm(
+        llm_config.provider,
+        model=llm_model.model,
+        api_key=llm_model.api_key,
+        base_url=llm_model.base_url,
+        temperature=llm_model.temperature
+    )
+    return bind_tools(llm, tools)
 
 
 def llm_node(state):
@@ -130,7 +125,7 @@ def llm_node(state):
     # 1. 从 state 取出 messages
     # 2. 调用 llm_with_tools.invoke(messages)
     # 3. 返回 {"messages": [response]}
-    response = llm_with_tools.invoke(state["messages"])
+    response = get_llm_with_tools().invoke(state["messages"])
     return {"messages": [response]}
 
 
@@ -159,7 +154,7 @@ def main():
     #
     graph = StateGraph(CalculatorState)
     graph.add_node("llm", llm_node)
-    graph.add_node("tools", tool_node)
+    graph.add_node("tools", create_tool_node())
 
     # TODO: 添加边
     # 提示：
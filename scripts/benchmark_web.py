@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Web 学习平台解析性能基准
+
+功能：
+1. 按 docs/QUIZ_MARKDOWN_SPEC.md 生成合成的测试题和讲义语料
+   - 单文件规模：每套测试题 10 ~ 10,000 道题
+   - 语料规模：10 ~ 5,000 个文件
+2. 对 parse_quiz()、count_questions()、extract_title()、build_navigation()、
+   render_markdown() 分别计时，记录耗时、内存分配块数和峰值内存
+   （旧版本没有不走缓存的 _parse_quiz_file() 时，改为请求测试题页面计时，报告中 via 为 route）
+3. 输出 JSON 报告，可与其他提交的报告对比，发现性能回退
+
+运行方式：
+    python scripts/benchmark_web.py --output bench.json
+    python scripts/benchmark_web.py --quick
+    python scripts/benchmark_web.py --questions 10,100 --files 10,100 --compare old.json
+
+对比时，任一用例中位耗时变慢超过 --threshold（默认 20%）则以状态 1 退出。
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR / 'web'))
+
+# 导入 app 时会创建统计库（以及 SQLite 答案库），指向临时目录，不在仓库里留下文件
+_data_dir = tempfile.TemporaryDirectory(prefix='web-bench-data-')
+os.environ.setdefault('QUIZ_STATS_DB', str(Path(_data_dir.name) / 'quiz_stats.db'))
+os.environ.setdefault('ANSWERS_DB', str(Path(_data_dir.name) / 'answers.db'))
+
+import app as webapp  # noqa: E402
+
+
+DEFAULT_QUESTIONS = [10, 100, 1000, 10000]
+DEFAULT_FILES = [10, 100, 1000, 5000]
+QUICK_QUESTIONS = [10, 100]
+QUICK_FILES = [10, 100]
+
+# 语料规模测试中每套测试题的题量
+QUESTIONS_PER_CORPUS_FILE = 20
+
+WORDS = ['State', 'Node', 'Edge', 'MessagesState', 'ToolNode', 'StateGraph',
+         '状态', '节点', '条件边', '工具', '消息', '检查点', '流式输出', '图', '编译', '调用']
+
+
+# ==================== 语料生成 ====================
+
+def _sentence(rng, words=8):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate_quiz(n_questions, rng):
+    """生成一套符合规范的测试题：选择题、开放题、无题型标记的题目混合"""
+    parts = [f"# 合成测试题（{n_questions} 题）\n\n> 题型：混合\n> 题量：{n_questions} 题\n\n---\n"]
+
+    for i in range(1, n_questions + 1):
+        kind = i % 5
+        if kind == 4:
+            parts.append(
+                f"### [类型:open] 题目{i}：{_sentence(rng)}？\n\n"
+                f"**你的答案**：\n_（写下你的理解）_\n\n\n"
+                f"**正确答案**：\n\n{_sentence(rng, 16)}\n\n"
+                f"- 作用：{_sentence(rng, 4)}\n- 传递：{_sentence(rng, 4)}\n\n---\n"
+            )
+        else:
+            tag = '' if kind == 3 else '[类型:choice] '
+            answer = rng.choice('ABCD')
+            options = '\n'.join(f"{letter}. `{_sentence(rng, 3)}`" for letter in 'ABCD')
+            parts.append(
+                f"### {tag}题目{i}：{_sentence(rng)}？\n\n{options}\n\n"
+                f"**正确答案**：{answer}\n**解析**：{_sentence(rng, 12)}\n\n---\n"
+            )
+
+    parts.append("\n## 测试总结\n\n- 完成后对照答案自我评估\n")
+    return '\n'.join(parts)
+
+
+def generate_lecture(n_sections, rng):
+    """生成一篇讲义：标题、段落、列表、表格和代码块"""
+    parts = [f"# 合成讲义：{_sentence(rng, 3)}\n"]
+    for i in range(1, n_sections + 1):
+        parts.append(f"## {i}. {_sentence(rng, 3)}\n\n{_sentence(rng, 40)}\n")
+        parts.append('\n'.join(f"- {_sentence(rng, 6)}" for _ in range(4)) + '\n')
+        parts.append(
+            "| 概念 | 说明 |\n|------|------|\n"
+            + '\n'.join(f"| {rng.choice(WORDS)} | {_sentence(rng, 5)} |" for _ in range(3)) + '\n'
+        )
+        parts.append(
+            "```python\n"
+            "from langgraph.graph import StateGraph, START, END\n\n"
+            f"def node_{i}(state):\n"
+            f"    return {{'messages': ['{rng.choice(WORDS)}']}}\n"
+            "```\n"
+        )
+    return '\n'.join(parts)
+
+
+def build_corpus(root, n_files, questions_per_file, rng):
+    """在 root 下生成与仓库相同布局的语料：一半讲义、一半测试题"""
+    lectures_dir = root / 'docs' / 'phase01_bench'
+    quizzes_dir = root / 'examples' / 'phase01_bench' / 'quizzes'
+    lectures_dir.mkdir(parents=True, exist_ok=True)
+    quizzes_dir.mkdir(parents=True, exist_ok=True)
+
+    n_lectures = n_files // 2
+    for i in range(n_lectures):
+        (lectures_dir / f"{i:05d}_lecture.md").write_text(generate_lecture(3, rng), encoding='utf-8')
+    for i in range(n_files - n_lectures):
+        (quizzes_dir / f"{i:05d}_quiz_set{i}_bench.md").write_text(
+            generate_quiz(questions_per_file, rng), encoding='utf-8'
+        )
+
+
+def use_corpus(root):
+    """让 Web 应用改为扫描 root 下的语料，并清空所有缓存
+
+    导航索引和解析缓存是后来加入的，旧版本没有时跳过（旧版本每次都重新扫描、解析）
+    """
+    webapp.BASE_DIR = root
+    webapp.DOCS_DIR = root / 'docs'
+    reset_navigation()
+    for name in ('quiz_cache', 'lecture_cache'):
+        cache = getattr(webapp, name, None)
+        if cache is not None:
+            cache.invalidate()
+
+
+def reset_navigation():
+    """丢弃导航索引，下次 build_navigation() 从头构建"""
+    navigation_index = getattr(webapp, 'NavigationIndex', None)
+    if navigation_index is not None:
+        webapp.nav_index = navigation_index()
+
+
+def parse_quiz_case(quiz_file):
+    """parse_quiz 用例，返回 (函数, 测量方式)
+
+    优先直接调用不走缓存的 _parse_quiz_file()；旧版本没有这个函数时，
+    通过测试客户端请求公开的 /quiz/<path>/all 页面（包含模板渲染，报告中标记为 route）
+    """
+    parse = getattr(webapp, '_parse_quiz_file', None)
+    if parse is not None:
+        return (lambda: parse(quiz_file)), 'function'
+
+    client = webapp.app.test_client()
+    path = f"/quiz/{quiz_file.relative_to(webapp.BASE_DIR).as_posix()}/all"
+
+    def request_page():
+        response = client.get(path)
+        response.get_data()
+        response.close()
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} 返回 {response.status_code}")
+
+    return request_page, 'route'
+
+
+# ==================== 测量 ====================
+
+def measure(func, repeat):
+    """测量 func()：多次计时，再单独跑一次 tracemalloc 统计内存"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # tracemalloc 会明显拖慢执行，与计时分开
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+
+    return {
+        'wall_ms': {
+            'min': round(min(timings), 4),
+            'median': round(statistics.median(timings), 4),
+            'mean': round(statistics.mean(timings), 4)
+        },
+        'peak_kb': round(peak / 1024, 1),
+        'allocated_blocks': allocated
+    }
+
+
+def bench_single_file(workdir, sizes, repeat, rng):
+    """单文件规模：题量从小到大"""
+    results = []
+    # 旧版本通过页面路由解析测试题，文件需要在 BASE_DIR 下
+    use_corpus(workdir)
+    for n_questions in sizes:
+        quiz_file = workdir / f"quiz_{n_questions}.md"
+        quiz_file.write_text(generate_quiz(n_questions, rng), encoding='utf-8')
+        lecture_file = workdir / f"lecture_{n_questions}.md"
+        lecture_content = generate_lecture(max(1, n_questions // 10), rng)
+        lecture_file.write_text(lecture_content, encoding='utf-8')
+
+        parse_quiz, via = parse_quiz_case(quiz_file)
+        cases = {
+            'parse_quiz': (parse_quiz, via),
+            'count_questions': (lambda: webapp.count_questions(quiz_file), 'function'),
+            'extract_title': (lambda: webapp.extract_title(lecture_file), 'function'),
+            'render_markdown': (lambda: webapp.render_markdown(lecture_content), 'function'),
+        }
+        # 大文件少跑几次
+        runs = repeat if n_questions <= 1000 else max(1, repeat // 5)
+        for name, (func, via) in cases.items():
+            result = measure(func, runs)
+            result.update({'function': name, 'scale': 'questions', 'size': n_questions, 'via': via})
+            results.append(result)
+            print(f"  {name:<18} {n_questions:>6} 题  中位 {result['wall_ms']['median']:>10.3f} ms")
+    return results
+
+
+def bench_corpus(workdir, sizes, repeat, rng):
+    """语料规模：文件数从小到大，测试导航构建（冷启动 / 无变化 / 单文件变化）"""
+    results = []
+    for n_files in sizes:
+        root = workdir / f"corpus_{n_files}"
+        build_corpus(root, n_files, QUESTIONS_PER_CORPUS_FILE, rng)
+        use_corpus(root)
+
+        def cold():
+            reset_navigation()
+            webapp.build_navigation()
+
+        quiz_files = sorted((root / 'examples' / 'phase01_bench' / 'quizzes').glob('*.md'))
+
+        def one_changed():
+            # 改动一个文件后重建（只应重新解析该文件）
+            quiz_files[0].write_text(generate_quiz(QUESTIONS_PER_CORPUS_FILE, rng), encoding='utf-8')
+            webapp.build_navigation()
+
+        runs = repeat if n_files <= 1000 else max(1, repeat // 5)
+        for name, func in [('build_navigation_cold', cold),
+                           ('build_navigation_warm', webapp.build_navigation),
+                           ('build_navigation_one_changed', one_changed)]:
+            result = measure(func, runs)
+            result.update({'function': name, 'scale': 'files', 'size': n_files, 'via': 'function'})
+            results.append(result)
+            print(f"  {name:<30} {n_files:>5} 个文件  中位 {result['wall_ms']['median']:>10.3f} ms")
+    return results
+
+
+# ==================== 报告 ====================
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_reports(baseline, current, threshold):
+    """按 (函数, 规模, 大小) 对比中位耗时，返回回退的用例数"""
+    def key(result):
+        return (result['function'], result['scale'], result['size'])
+
+    old = {key(r): r for r in baseline['results']}
+    regressions = 0
+
+    print(f"\n对比基准 {baseline['meta'].get('commit')} -> {current['meta'].get('commit')}")
+    print("-" * 78)
+    for result in current['results']:
+        previous = old.get(key(result))
+        if not previous:
+            continue
+        before = previous['wall_ms']['median']
+        after = result['wall_ms']['median']
+        change = (after - before) / before if before else 0
+        flag = ''
+        if previous.get('via', 'function') != result['via']:
+            # 一边直接调用函数、一边通过页面路由，耗时不可比，不算回退
+            flag = '⚠️ 测量方式不同'
+        elif change > threshold:
+            flag = '❌ 变慢'
+            regressions += 1
+        elif change < -threshold:
+            flag = '✅ 变快'
+        print(f"{result['function']:<30} {result['size']:>6}  {before:>10.3f} -> {after:>10.3f} ms "
+              f"({change:+.1%}) {flag}")
+    return regressions
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Web 学习平台解析性能基准")
+    parser.add_argument('--questions', help="单文件题量，逗号分隔（默认 10,100,1000,10000）")
+    parser.add_argument('--files', help="语料文件数，逗号分隔（默认 10,100,1000,5000）")
+    parser.add_argument('--quick', action='store_true', help="只跑小规模用例")
+    parser.add_argument('--repeat', type=int, default=5, help="每个用例的计时次数")
+    parser.add_argument('--seed', type=int, default=42, help="语料随机种子")
+    parser.add_argument('--output', help="JSON 报告输出路径")
+    parser.add_argument('--compare', help="与之前的 JSON 报告对比")
+    parser.add_argument('--threshold', type=float, default=0.2, help="判定回退的变慢比例")
+    args = parser.parse_args()
+
+    questions = QUICK_QUESTIONS if args.quick else DEFAULT_QUESTIONS
+    files = QUICK_FILES if args.quick else DEFAULT_FILES
+    if args.questions:
+        questions = [int(x) for x in args.questions.split(',')]
+    if args.files:
+        files = [int(x) for x in args.files.split(',')]
+
+    rng = random.Random(args.seed)
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed
+        },
+        'results': []
+    }
+
+    with tempfile.TemporaryDirectory(prefix='web-bench-') as tmp:
+        workdir = Path(tmp)
+        print("=" * 50)
+        print("单文件规模")
+        print("=" * 50)
+        report['results'] += bench_single_file(workdir, questions, args.repeat, rng)
+
+        print("\n" + "=" * 50)
+        print("语料规模")
+        print("=" * 50)
+        report['results'] += bench_corpus(workdir, files, args.repeat, rng)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n报告已写入 {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare_reports(baseline, report, args.threshold)
+        if regressions:
+            print(f"\n❌ {regressions} 个用例变慢超过 {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+测试题解析器校验脚本
+
+功能：
+1. 用原先的多遍正则实现（保留在本脚本中）解析仓库里的每个测试题
+2. 与 web/quiz_parser.py 的单遍解析结果逐项比较（题目、答案、解析、题目数）
+3. 有差异时打印出来并以非零状态退出
+
+运行方式：
+    python scripts/verify_quiz_parser.py [测试题文件 ...]
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR / 'web'))
+
+from quiz_parser import parse_quiz_stream, count_questions_stream  # noqa: E402
+
+
+# ==================== 原实现（校验基准） ====================
+
+def legacy_parse_quiz(content):
+    """原先的多遍正则解析实现（web/app.py 中 parse_quiz 的旧版本），作为校验基准"""
+    questions = []
+
+    # 先移除总结部分和答案汇总部分
+    content_only = re.split(r'##+\s*(?:正确答案汇总|测试总结|自我评估|完成时间)', content, flags=re.IGNORECASE)[0]
+
+    # 提取题目块（支持 ### 题目、### 问题、### Question，带题型标记）
+    # 格式：### [类型:choice] 题目1：xxx
+    # 使用 findall 找到所有题目位置，然后提取题目内容
+    question_pattern = r'###\s*(?:\[类型:(\w+)\])?\s*(?:题目|Question|问题)\s*\d+[:：]?\s*'
+
+    # 找到所有匹配的题目标记及其位置
+    matches = list(re.finditer(question_pattern, content_only, re.IGNORECASE))
+
+    # 提取每个题目标记之后的内容块（直到下一个题目或文件结束）
+    question_blocks = []
+    for i, match in enumerate(matches):
+        start = match.end()
+        # 下一个题目的开始位置，或文件末尾
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content_only)
+        block = content_only[start:end]
+        question_blocks.append(block)
+
+    for idx, block in enumerate(question_blocks, 1):
+
+        lines = block.strip().split('\n')
+
+        # 检测题型（从第一行的类型标记或自动推断）
+        question_type = None
+        question_text = None
+        options = {}
+        correct_answer = None
+        explanation = None
+
+        # 检查是否有类型标记
+        if lines and lines[0].strip():
+            first_line = lines[0].strip()
+            type_match = re.match(r'^\[类型:(\w+)\]', first_line)
+            if type_match:
+                question_type = type_match.group(1)
+                lines = lines[1:]  # 跳过类型标记行
+            elif first_line.startswith('[类型:'):
+                # 类型标记单独一行
+                question_type = re.search(r'(\w+)', first_line).group(1)
+                lines = lines[1:]
+
+        # 查找题目文本（第一行非空、非选项、非答案标记的行）
+        for line in lines:
+            line_stripped = line.strip()
+            # 跳过类型标记、答案行、你的答案行等
+            if (line_stripped and
+                not line_stripped.startswith('[') and
+                not any(x in line_stripped for x in ['**正确答案', '**你的答案', '正确答案', '你的答案', '**解析', '解析：'])):
+                # 移除 markdown 加粗标记
+                question_text = line_stripped.replace('**', '').strip()
+                break
+
+        if not question_text:
+            continue
+
+        # 如果没有显式指定题型，自动推断
+        if not question_type:
+            # 扫描是否有选项（A. B. C. D. 开头）
+            has_options = False
+            for line in lines:
+                if re.match(r'^[A-D]\.\s*(?!.*___)', line.strip()):
+                    has_options = True
+                    break
+            question_type = 'choice' if has_options else 'open'
+
+        # 解析选项（仅选择题）
+        if question_type == 'choice':
+            for line in lines:
+                line_stripped = line.strip()
+                # 匹配选项：A. 文本（排除"你的答案：___A"格式）
+                match = re.match(r'^([A-D])\.\s*(.+)', line_stripped)
+                if match:
+                    letter = match.group(1)
+                    text = match.group(2)
+                    # 跳过"你的答案：___A"这种格式
+                    if not text.startswith('___') and not text.startswith('**你的答案'):
+                        options[letter] = text
+
+        # 解析正确答案和解析
+        answer_section = []
+        in_answer_section = False
+        for line in lines:
+            line_stripped = line.strip()
+
+            # 检测进入答案解析区
+            if any(x in line_stripped for x in ['**正确答案', '正确答案：', '正确答案:']):
+                in_answer_section = True
+                answer_section.append(line_stripped)
+                continue
+
+            if in_answer_section:
+                # 收集答案解析内容，直到下一个题目或结束
+                if line_stripped.startswith('**你的掌握情况') or line_stripped.startswith('你的掌握情况'):
+                    break
+                answer_section.append(line_stripped)
+
+        # 从答案区提取正确答案
+        answer_text = ' '.join(answer_section)
+        if question_type == 'choice':
+            # 提取字母答案
+            answer_match = re.search(r'[A-D]', answer_text)
+            if answer_match:
+                correct_answer = answer_match.group(0)
+
+        # 构建解析文本
+        if answer_section:
+            # 移除标记，保留纯文本
+            explanation_lines = []
+            for al in answer_section:
+                # 移除各种标记
+                clean_line = al.replace('**正确答案**', '').replace('**解析**', '')
+                clean_line = re.sub(r'^\*\*正确答案\*\*[:：]\s*', '', clean_line)
+                clean_line = clean_line.replace('👆', '').strip()
+                if clean_line and len(clean_line) > 1:  # 过滤单字符
+                    explanation_lines.append(clean_line)
+
+            if explanation_lines:
+                explanation = '\n'.join(explanation_lines[:5])  # 限制长度
+
+        # 添加题目
+        questions.append({
+            'id': f'q{idx}',
+            'number': idx,
+            'type': question_type,
+            'text': question_text,
+            'options': options if question_type == 'choice' else {},
+            'correct_answer': correct_answer,
+            'explanation': explanation or ''
+        })
+
+    # 构建返回数据
+    answers = {}
+    explanations = {}
+
+    for q in questions:
+        if q['correct_answer']:
+            answers[q['id']] = q['correct_answer']
+        if q['explanation']:
+            explanations[q['id']] = q['explanation']
+
+    return {
+        'questions': questions,
+        'answers': answers,
+        'explanations': explanations
+    }
+
+
+def legacy_count_questions(content):
+    """原先的 count_questions() 实现"""
+    # 移除总结和答案汇总部分，避免误匹配
+    content_only = re.split(r'##+\s*(?:正确答案汇总|测试总结|自我评估|完成时间)', content, flags=re.IGNORECASE)[0]
+    # 匹配所有格式的题目标题（与 parse_quiz 一致）
+    questions = re.findall(
+        r'###\s*(?:\[类型:\w+\])?\s*(?:题目|Question|问题)\s*\d+[:：]?\s*',
+        content_only,
+        re.IGNORECASE
+    )
+    return len(questions)
+
+
+# ==================== 校验 ====================
+
+def verify_file(quiz_file):
+    """校验单个文件，返回差异描述列表"""
+    content = quiz_file.read_text(encoding='utf-8')
+    expected = legacy_parse_quiz(content)
+    expected['count'] = legacy_count_questions(content)
+
+    with quiz_file.open('r', encoding='utf-8') as f:
+        actual = parse_quiz_stream(f)
+    with quiz_file.open('r', encoding='utf-8') as f:
+        counted = count_questions_stream(f)
+
+    problems = []
+    for key in ('questions', 'answers', 'explanations', 'count'):
+        if actual[key] != expected[key]:
+            problems.append(f"{key} 不一致：\n  期望 {json.dumps(expected[key], ensure_ascii=False)[:500]}"
+                            f"\n  实际 {json.dumps(actual[key], ensure_ascii=False)[:500]}")
+    if counted != expected['count']:
+        problems.append(f"count_questions_stream 不一致：期望 {expected['count']}，实际 {counted}")
+    return problems
+
+
+def main():
+    """主函数"""
+    if len(sys.argv) > 1:
+        quiz_files = [Path(arg) for arg in sys.argv[1:]]
+    else:
+        quiz_files = sorted(BASE_DIR.glob('examples/phase*/quizzes/*.md'))
+
+    failed = 0
+    for quiz_file in quiz_files:
+        problems = verify_file(quiz_file)
+        if problems:
+            failed += 1
+            print(f"❌ {quiz_file}")
+            for problem in problems:
+                print(f"   {problem}")
+        else:
+            print(f"✅ {quiz_file}")
+
+    print("\n" + "="*50)
+    print(f"共 {len(quiz_files)} 个文件，{failed} 个不一致")
+    print("="*50)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
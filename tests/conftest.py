@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共配置
+
+web/ 下的模块互相以顶层模块导入（import app as webapp），
+examples/phase01_basics/ 下的公共模块以 common.xxx 导入，这里把两个目录加入搜索路径。
+
+导入 web/app.py 前把数据库指向临时目录、使用 SQLite 答案存储，
+测试不会改动仓库里的 answers.json 和统计库。
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'web'))
+sys.path.insert(0, str(ROOT / 'examples' / 'phase01_basics'))
+
+_data_dir = Path(tempfile.mkdtemp(prefix='langgraph-learn-tests-'))
+os.environ.setdefault('ANSWER_STORE', 'sqlite')
+os.environ.setdefault('ANSWERS_DB', str(_data_dir / 'answers.db'))
+os.environ.setdefault('QUIZ_STATS_DB', str(_data_dir / 'quiz_stats.db'))
+
+
+@pytest.fixture
+def asgi_request():
+    """向 ASGI 应用（web/asgi.py）发请求的函数，返回 (状态码, 响应头, 响应体)
+
+    path 与 ASGI 服务器传入的 scope['path'] 相同，是已经百分号解码的路径
+    """
+    import asgi
+
+    def request(path, headers=None, method='GET'):
+        scope = {
+            'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                        for name, value in (headers or {}).items()],
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(asgi.app(scope, receive, send))
+        start, body = messages
+        return (start['status'],
+                {name.decode('latin-1'): value.decode('latin-1') for name, value in start['headers']},
+                body['body'])
+
+    return request
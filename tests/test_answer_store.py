@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""答案存储：两种后端的读写往返、快照 + 日志的压缩与重放"""
+
+import json
+
+import pytest
+
+import app as webapp
+from answer_store import DEFAULT_USER, AnswerStore, JournalAnswerStore, SQLiteAnswerStore
+
+# 浏览器可以提交任意 JSON 值
+NON_STRING_ANSWERS = [5, 1.5, True, ['A'], {'A': 1}]
+
+
+@pytest.fixture(params=['journal', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'journal':
+        return JournalAnswerStore(tmp_path / 'answers.json')
+    return SQLiteAnswerStore(tmp_path / 'answers.db')
+
+
+def test_save_and_read_back(store):
+    store.save_many([('a.md', 'q1', 'A'), ('a.md', 'q2', 'B'), ('b.md', 'q1', 'C')])
+    store.save_many([('a.md', 'q1', 'D')])
+    store.save_many([('a.md', 'q1', 'A')], user='alice')
+
+    assert store.get_quiz_answers('a.md') == {'q1': 'D', 'q2': 'B'}
+    assert store.get_quiz_answers('b.md') == {'q1': 'C'}
+    assert store.get_quiz_answers('a.md', user='alice') == {'q1': 'A'}
+    assert store.get_quiz_answers('missing.md') == {}
+    assert sorted(store.iter_answers('a.md')) == [
+        ('alice', 'a.md', 'q1', 'A'),
+        (DEFAULT_USER, 'a.md', 'q1', 'D'),
+        (DEFAULT_USER, 'a.md', 'q2', 'B'),
+    ]
+
+
+def test_export_import_round_trip(store, tmp_path):
+    store.save_many([('a.md', 'q1', 'A'), ('a.md', 'q2', 'B')])
+    store.save_many([('b.md', 'q1', 'C')], user='alice')
+    exported = store.export()
+
+    other = JournalAnswerStore(tmp_path / 'other.json')
+    assert other.import_answers(exported) == 3
+
+    assert sorted(other.iter_answers()) == sorted(store.iter_answers())
+    assert other.export()['quizzes'] == exported['quizzes']
+    assert other.export()['users'] == exported['users']
+
+
+def test_journal_replayed_after_restart(tmp_path):
+    store = JournalAnswerStore(tmp_path / 'answers.json')
+    store.save_many([('a.md', 'q1', 'A')])
+    store.save_many([('a.md', 'q1', 'B'), ('a.md', 'q2', 'C')], user='alice')
+
+    # 没有压缩：快照不存在，答案都在日志里
+    assert not store.snapshot_path.exists()
+    assert len(store.journal_path.read_text(encoding='utf-8').splitlines()) == 3
+
+    reopened = JournalAnswerStore(tmp_path / 'answers.json')
+    assert reopened.export() == store.export()
+    assert reopened.stats()['journal_lines'] == 3
+
+
+def test_journal_drops_partial_last_line_before_appending(tmp_path):
+    store = JournalAnswerStore(tmp_path / 'answers.json')
+    store.save_many([('a.md', 'q1', 'A')])
+    with store.journal_path.open('a', encoding='utf-8') as f:
+        f.write('{"quiz_file": "a.md", "question_id": "q2"')
+
+    reopened = JournalAnswerStore(tmp_path / 'answers.json')
+    assert reopened.get_quiz_answers('a.md') == {'q1': 'A'}
+
+    # 截断后保存的答案不能和半行拼在一起
+    reopened.save_many([('a.md', 'q3', 'C')])
+    assert JournalAnswerStore(tmp_path / 'answers.json').get_quiz_answers('a.md') == {'q1': 'A', 'q3': 'C'}
+
+
+def test_compaction_writes_snapshot_and_clears_journal(tmp_path):
+    store = JournalAnswerStore(tmp_path / 'answers.json', compact_every=3)
+    store.save_many([('a.md', 'q1', 'A'), ('a.md', 'q2', 'B')])
+    assert store.journal_path.exists()
+
+    # 第 3 行触发压缩
+    store.save_many([('a.md', 'q3', 'C')])
+    assert not store.journal_path.exists()
+    assert store.stats()['journal_lines'] == 0
+
+    # 快照就是原来的 answers.json 格式
+    snapshot = json.loads(store.snapshot_path.read_text(encoding='utf-8'))
+    assert snapshot['quizzes'] == {'a.md': {'answers': {'q1': 'A', 'q2': 'B', 'q3': 'C'}}}
+
+    # 压缩后继续写日志，重启时快照 + 日志合并
+    store.save_many([('a.md', 'q1', 'D')])
+    reopened = JournalAnswerStore(tmp_path / 'answers.json')
+    assert reopened.get_quiz_answers('a.md') == {'q1': 'D', 'q2': 'B', 'q3': 'C'}
+
+
+def test_compact_on_exit(tmp_path):
+    store = JournalAnswerStore(tmp_path / 'answers.json')
+    store.compact()
+    # 没有日志时不写快照
+    assert not store.snapshot_path.exists()
+
+    store.save_many([('a.md', 'q1', 'A')], user='alice')
+    store.compact()
+
+    assert not store.journal_path.exists()
+    reopened = JournalAnswerStore(tmp_path / 'answers.json')
+    assert reopened.get_quiz_answers('a.md', user='alice') == {'q1': 'A'}
+    assert reopened.get_quiz_answers('a.md') == {}
+
+
+def test_backend_must_implement_the_whole_interface():
+    class ReadOnlyStore(AnswerStore):
+        def get_quiz_answers(self, quiz_file, user=DEFAULT_USER):
+            return {}
+
+    with pytest.raises(TypeError, match='save_many'):
+        ReadOnlyStore()
+
+
+@pytest.mark.parametrize('answer', NON_STRING_ANSWERS)
+def test_backends_reject_non_string_answers_alike(tmp_path, answer):
+    stores = [JournalAnswerStore(tmp_path / 'answers.json'), SQLiteAnswerStore(tmp_path / 'answers.db')]
+
+    for store in stores:
+        store.save_many([('a.md', 'q1', 'A')])
+        with pytest.raises(TypeError):
+            store.save_many([('a.md', 'q2', 'B'), ('a.md', 'q3', answer)])
+
+    # 整批都不保存，两种后端结果相同
+    assert [store.get_quiz_answers('a.md') for store in stores] == [{'q1': 'A'}, {'q1': 'A'}]
+
+
+@pytest.mark.parametrize('backend', ['journal', 'sqlite'])
+@pytest.mark.parametrize('payload', [
+    *({'quiz_file': 'a.md', 'question_id': 'q1', 'answer': answer} for answer in NON_STRING_ANSWERS),
+    {'quiz_file': ['a.md'], 'question_id': 'q1', 'answer': 'A'},
+    {'quiz_file': 'a.md', 'question_id': 1, 'answer': 'A'},
+    ['not', 'an', 'object'],
+])
+def test_api_rejects_non_string_fields(tmp_path, monkeypatch, backend, payload):
+    store = JournalAnswerStore(tmp_path / 'answers.json') if backend == 'journal' \
+        else SQLiteAnswerStore(tmp_path / 'answers.db')
+    monkeypatch.setattr(webapp, 'answer_store', store)
+    client = webapp.app.test_client()
+
+    assert client.post('/api/save', json=payload).status_code == 400
+    batch = [payload] if isinstance(payload, dict) else payload
+    assert client.post('/api/save/batch', json={'answers': batch}).status_code == 400
+    assert list(store.iter_answers()) == []
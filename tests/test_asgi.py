@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""ASGI 入口：路径按服务器解码后的原样使用"""
+
+import json
+
+import pytest
+
+import app as webapp
+import asgi
+
+QUIZ = '### 题目1：选哪个？\n\nA. x\nB. y\n\n**正确答案**：B\n'
+
+
+@pytest.mark.parametrize('path', ['/api/answers/100%25.md', '/api/answers/a%2Fb.md', '/api/answers/空格 题.md'])
+def test_request_path_is_not_decoded_again(path):
+    request = asgi.Request({'method': 'GET', 'path': path, 'headers': []}, b'')
+
+    assert request.path == path
+
+
+def test_file_name_with_literal_percent_escape(asgi_request, tmp_path, monkeypatch):
+    # 客户端请求 /api/quiz/100%2525.md/questions，服务器解码为 100%25.md
+    (tmp_path / '100%25.md').write_text(QUIZ, encoding='utf-8')
+    (tmp_path / '100%.md').write_text('', encoding='utf-8')
+    monkeypatch.setattr(webapp, 'BASE_DIR', tmp_path)
+
+    status, _, body = asgi_request('/api/quiz/100%25.md/questions')
+
+    assert status == 200
+    assert json.loads(body)['total'] == 1
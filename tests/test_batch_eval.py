@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""批量评测：判分容差、百分位数、汇总和失败重试"""
+
+import asyncio
+
+import pytest
+
+from common import batch_eval
+
+
+@pytest.mark.parametrize('answer, expected, correct', [
+    ('计算结果是 15', 15, True),
+    ('计算结果是 15.0', 15, True),
+    ('-5', -5, True),
+    ('约等于 14.29', 100 / 7, True),
+    ('约等于 14.3', 100 / 7, True),
+    ('约等于 14.28', 100 / 7, False),
+    ('约等于 14', 100 / 7, False),
+    ('25.5', 25, False),
+    ('3 乘以 5 等于 16', 15, False),
+    ('', 15, False),
+    (None, 15, False),
+    ('15', None, None),
+])
+def test_is_correct_tolerance(answer, expected, correct):
+    assert batch_eval.is_correct(answer, expected) is correct
+
+
+@pytest.mark.parametrize('p, expected', [(0, 10), (10, 10), (50, 50), (51, 60), (95, 100), (99, 100), (100, 100)])
+def test_percentile_nearest_rank(p, expected):
+    assert batch_eval.percentile([10, 20, 30, 40, 50, 60, 70, 80, 90, 100], p) == expected
+
+
+def test_percentile_of_few_values():
+    assert batch_eval.percentile([], 50) is None
+    assert [batch_eval.percentile([7], p) for p in (50, 95, 99)] == [7, 7, 7]
+
+
+def record(provider, latency_ms, correct=True, error=None, attempts=1, tools=None):
+    return {'provider': provider, 'latency_ms': latency_ms, 'correct': correct, 'error': error,
+            'attempts': attempts, 'tools': tools or {}}
+
+
+def test_summarize_by_provider():
+    records = [
+        record('fake', 100, tools={'multiply': 1}),
+        record('fake', 300, correct=False, attempts=2, tools={'add': 1}),
+        record('fake', 200, correct=None, tools={'multiply': 2}),
+        record('fake', 900, correct=None, error='FakeLLMError', attempts=4),
+        record('zhipu', 50, error='TimeoutError', attempts=2),
+    ]
+
+    summary = batch_eval.summarize(records, elapsed=2)
+
+    assert summary['fake'] == {
+        'total': 4,
+        'succeeded': 3,
+        'failed': 1,
+        'retries': 4,
+        # 没有标准答案的题不参与正确率，失败的题不参与延迟
+        'accuracy': 0.5,
+        'throughput': 1.5,
+        'latency_ms': {'p50': 200, 'p95': 300, 'p99': 300, 'max': 300},
+        'tool_calls': 4,
+        'tool_calls_per_prompt': 1.33,
+        'tools': {'multiply': 3, 'add': 1},
+    }
+    assert summary['zhipu']['succeeded'] == 0
+    assert summary['zhipu']['accuracy'] is None
+    assert summary['zhipu']['latency_ms'] == {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    assert summary['zhipu']['tool_calls_per_prompt'] == 0
+
+
+@pytest.mark.parametrize('attempt, low, high', [(1, 0.25, 0.5), (2, 0.5, 1), (3, 1, 2), (10, 5, 10), (100, 5, 10)])
+def test_backoff_doubles_up_to_the_limit(attempt, low, high):
+    assert all(low <= batch_eval.backoff(attempt) <= high for _ in range(20))
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    """直接调用假模型的 Agent（只需要 langchain_core，不需要 LangGraph）"""
+    pytest.importorskip('langchain_core')
+    from common.fake_llm import FakeCalculatorChatModel
+
+    monkeypatch.setenv('FAKE_LLM_LATENCY_MS', '0')
+    # 记录第几次失败后退避，不真正等待
+    backoffs = []
+    monkeypatch.setattr(batch_eval, 'backoff', lambda attempt: backoffs.append(attempt) or 0)
+
+    class Agent:
+        def __init__(self, error_rate):
+            monkeypatch.setenv('FAKE_LLM_ERROR_RATE', str(error_rate))
+            self.llm = FakeCalculatorChatModel()
+
+        async def ainvoke(self, state):
+            return {'messages': state['messages'] + [await self.llm.ainvoke(state['messages'])]}
+
+    return Agent, backoffs
+
+
+def run_case(agent, retries):
+    case = {'id': 1, 'prompt': '3 乘以 5 等于多少？', 'expected': 15}
+    return asyncio.run(batch_eval.run_case(agent, 'fake', case, asyncio.Semaphore(1), retries, timeout=5))
+
+
+def test_run_case_retries_with_backoff_until_giving_up(fake_agent):
+    Agent, backoffs = fake_agent
+
+    result = run_case(Agent(error_rate=1), retries=3)
+
+    assert result['attempts'] == 4
+    assert result['error'] == 'FakeLLMError: 模拟的接口错误'
+    assert result['correct'] is None
+    # 每次失败后退避，最后一次失败后不再等待
+    assert backoffs == [1, 2, 3]
+
+
+def test_run_case_without_errors_does_not_retry(fake_agent):
+    Agent, backoffs = fake_agent
+
+    result = run_case(Agent(error_rate=0), retries=3)
+
+    assert result['attempts'] == 1
+    assert result['error'] is None
+    assert result['tool_calls'] == 1
+    assert result['tools'] == {'multiply': 1}
+    assert backoffs == []
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""FileLRUCache：签名失效、LRU 淘汰、加载不阻塞其他文件"""
+
+import threading
+import time
+
+from cache import FileLRUCache
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+def test_reloads_after_file_changes(tmp_path):
+    path = write(tmp_path / 'a.md', 'one')
+    cache = FileLRUCache(lambda p: p.read_text(encoding='utf-8'), max_bytes=1 << 20)
+
+    assert cache.get(path) == 'one'
+    assert cache.get(path) == 'one'
+    write(path, 'two!')
+    assert cache.get(path) == 'two!'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_evicts_least_recently_used(tmp_path):
+    paths = [write(tmp_path / f'{i}.md', 'x' * 100) for i in range(3)]
+    cache = FileLRUCache(lambda p: p.read_text(), max_bytes=250, sizeof=len)
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['entries'] == 2
+    misses = cache.stats()['misses']
+    cache.get(paths[0])
+    assert cache.stats()['misses'] == misses
+
+
+def test_slow_load_does_not_block_other_files(tmp_path):
+    slow = write(tmp_path / 'slow.md', 'slow')
+    fast = write(tmp_path / 'fast.md', 'fast')
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader(path):
+        if path == slow:
+            started.set()
+            release.wait(5)
+        return path.read_text()
+
+    cache = FileLRUCache(loader, max_bytes=1 << 20)
+    cache.get(fast)
+
+    thread = threading.Thread(target=cache.get, args=(slow,))
+    thread.start()
+    assert started.wait(5)
+    try:
+        begin = time.perf_counter()
+        assert cache.get(fast) == 'fast'
+        assert time.perf_counter() - begin < 1
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_concurrent_misses_load_once(tmp_path):
+    path = write(tmp_path / 'quiz.md', 'quiz')
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def loader(p):
+        calls.append(p)
+        time.sleep(0.05)
+        return p.read_text()
+
+    cache = FileLRUCache(loader, max_bytes=1 << 20)
+
+    def worker():
+        barrier.wait()
+        assert cache.get(path) == 'quiz'
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+
+
+def test_invalidate_during_load_discards_result(tmp_path):
+    path = write(tmp_path / 'a.md', 'old')
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader(p):
+        started.set()
+        release.wait(5)
+        return p.read_text()
+
+    cache = FileLRUCache(loader, max_bytes=1 << 20)
+    cache.validate = False
+    thread = threading.Thread(target=cache.get, args=(path,))
+    thread.start()
+    assert started.wait(5)
+    cache.invalidate(path)
+    release.set()
+    thread.join()
+
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""响应压缩：Content-Encoding、Vary 和 ETag"""
+
+import gzip
+
+import pytest
+
+import app as webapp
+
+LECTURE = '/lecture/examples/phase01_basics/README.md'
+
+
+@pytest.fixture
+def client():
+    return webapp.app.test_client()
+
+
+def get(client, path, headers):
+    """读完并关闭响应（讲义页面是流式响应，不关闭会留下请求上下文）"""
+    response = client.get(path, headers=headers)
+    response.get_data()
+    response.close()
+    return response
+
+
+def test_compressed_lecture_has_vary_and_weak_etag(client):
+    response = get(client, LECTURE, {'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.headers['ETag'].startswith('W/')
+    assert '<html' in gzip.decompress(response.get_data()).decode('utf-8').lower()
+
+
+def test_uncompressed_lecture_has_vary_and_same_etag(client):
+    compressed = get(client, LECTURE, {'Accept-Encoding': 'gzip'})
+    plain = get(client, LECTURE, {'Accept-Encoding': 'identity'})
+
+    assert 'Content-Encoding' not in plain.headers
+    # 不压缩的响应也要带 Vary，否则共享缓存会把它返回给支持 gzip 的客户端
+    assert 'Accept-Encoding' in plain.headers['Vary']
+    assert plain.headers['ETag'] == compressed.headers['ETag']
+
+
+@pytest.mark.parametrize('accept_encoding', ['gzip', 'identity'])
+def test_not_modified_keeps_the_etag_of_the_200(client, accept_encoding):
+    first = get(client, LECTURE, {'Accept-Encoding': accept_encoding})
+    etag = first.headers['ETag']
+
+    response = get(client, LECTURE, {'Accept-Encoding': accept_encoding,
+                                     'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b''
+
+
+def test_small_responses_are_not_compressed(client):
+    response = get(client, '/api/cache/stats', {'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert len(response.get_data()) < webapp.app.config['COMPRESS_MIN_SIZE']
+    assert 'Content-Encoding' not in response.headers
+
+
+@pytest.mark.parametrize('accept_encoding', ['gzip', 'identity'])
+def test_asgi_not_modified_keeps_the_etag_of_the_200(asgi_request, accept_encoding):
+    status, headers, _ = asgi_request(LECTURE, {'Accept-Encoding': accept_encoding})
+    assert status == 200
+    assert headers['etag'].startswith('W/')
+
+    status, not_modified, body = asgi_request(LECTURE, {'Accept-Encoding': accept_encoding,
+                                                        'If-None-Match': headers['etag']})
+
+    assert status == 304
+    assert not_modified['etag'] == headers['etag']
+    assert body == b''
+
+
+@pytest.mark.parametrize('accept_encoding', ['gzip', 'identity'])
+def test_asgi_head_reports_the_length_of_get(asgi_request, accept_encoding):
+    _, get_headers, get_body = asgi_request(LECTURE, {'Accept-Encoding': accept_encoding})
+    status, head_headers, head_body = asgi_request(LECTURE, {'Accept-Encoding': accept_encoding},
+                                                   method='HEAD')
+
+    assert status == 200
+    assert head_body == b''
+    assert int(head_headers['content-length']) == len(get_body) > 0
+    assert head_headers.get('content-encoding') == get_headers.get('content-encoding')
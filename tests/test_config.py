@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""配置加载：环境变量 > .env 文件 > config.yaml，以及缓存失效"""
+
+import os
+
+import pytest
+
+pytest.importorskip('yaml')
+pytest.importorskip('pydantic_settings')
+
+from common import config as config_module  # noqa: E402
+
+CONFIG_YAML = """
+llm:
+  provider: zhipu
+  models:
+    zhipu:
+      model: glm-4-flash
+      api_key: yaml-zhipu-key
+      temperature: 0
+    openai:
+      model: gpt-4.1-mini
+      api_key: yaml-openai-key
+"""
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    for name in list(os.environ):
+        if name.upper().startswith(config_module.ENV_PREFIX):
+            monkeypatch.delenv(name)
+    config_module.clear_config_cache()
+
+    config_path = tmp_path / 'config.yaml'
+    config_path.write_text(CONFIG_YAML, encoding='utf-8')
+    yield config_path, tmp_path / '.env'
+    config_module.clear_config_cache()
+
+
+def test_yaml_only(paths):
+    config = config_module.load_config(*paths)
+
+    assert config.provider == 'zhipu'
+    assert config.current_model().api_key == 'yaml-zhipu-key'
+    assert config.models['openai'].temperature == 0
+
+
+def test_env_file_overrides_yaml(paths):
+    config_path, env_file = paths
+    env_file.write_text('LLM_PROVIDER=openai\nLLM_MODELS__OPENAI__TEMPERATURE=0.5\n', encoding='utf-8')
+
+    config = config_module.load_config(config_path, env_file)
+
+    assert config.provider == 'openai'
+    assert config.current_model().temperature == 0.5
+    # 没有覆盖的字段保留 YAML 中的值
+    assert config.current_model().api_key == 'yaml-openai-key'
+
+
+def test_environment_overrides_env_file(paths, monkeypatch):
+    config_path, env_file = paths
+    env_file.write_text('LLM_PROVIDER=openai\nLLM_MODELS__ZHIPU__API_KEY=dotenv-key\n', encoding='utf-8')
+    monkeypatch.setenv('LLM_PROVIDER', 'zhipu')
+
+    config = config_module.load_config(config_path, env_file)
+
+    assert config.provider == 'zhipu'
+    assert config.current_model().api_key == 'dotenv-key'
+
+    monkeypatch.setenv('LLM_MODELS__ZHIPU__API_KEY', 'env-key')
+    assert config_module.load_config(config_path, env_file).current_model().api_key == 'env-key'
+
+
+def test_cached_until_files_or_environment_change(paths, monkeypatch):
+    config_path, env_file = paths
+    config = config_module.load_config(config_path, env_file)
+    assert config_module.load_config(config_path, env_file) is config
+
+    monkeypatch.setenv('LLM_PROVIDER', 'openai')
+    assert config_module.load_config(config_path, env_file).provider == 'openai'
+
+    env_file.write_text('LLM_MODELS__OPENAI__MODEL=gpt-4.1\n', encoding='utf-8')
+    assert config_module.load_config(config_path, env_file).current_model().model == 'gpt-4.1'
+
+
+def test_unknown_provider_is_rejected(paths, monkeypatch):
+    monkeypatch.setenv('LLM_PROVIDER', 'missing')
+
+    with pytest.raises(ValueError, match='missing'):
+        config_module.load_config(*paths)
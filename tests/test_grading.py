@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""评分引擎：向量化评分与原来逐题比较的结果一致"""
+
+import random
+
+import numpy as np
+import pytest
+
+from grading import UNANSWERED, AnswerKey, encode_choice, percentage
+
+
+def old_grade(quiz_data, user_answers):
+    """原 /api/submit 的逐题评分，返回 (逐题对错, 答对数, 百分比)"""
+    results = []
+    correct_count = 0
+    for q in quiz_data['questions']:
+        user_answer = user_answers.get(q['id'])
+        correct_answer = quiz_data['answers'].get(q['id'])
+        is_correct = False
+        if q.get('type') == 'choice' and correct_answer:
+            is_correct = (user_answer == correct_answer)
+            if is_correct:
+                correct_count += 1
+        results.append(is_correct)
+
+    total = len(results)
+    return results, correct_count, round(correct_count / total * 100, 1) if total > 0 else 0
+
+
+def random_quiz(rng, size):
+    questions, answers = [], {}
+    for number in range(1, size + 1):
+        question_id = f'q{number}'
+        question_type = rng.choice(['choice', 'choice', 'choice', 'open'])
+        questions.append({'id': question_id, 'type': question_type})
+        # 有的选择题缺少正确答案，不判分
+        if question_type == 'choice' and rng.random() < 0.9:
+            answers[question_id] = rng.choice('ABCD')
+    return {'questions': questions, 'answers': answers}
+
+
+# 浏览器提交的答案可能是任意 JSON 值
+ANSWER_VALUES = ['A', 'B', 'C', 'D', 'a', 'E', '', None, 1, ['A'], {'A': 1}, 'AB']
+
+
+def random_submission(rng, quiz_data):
+    submission = {}
+    for q in quiz_data['questions']:
+        if rng.random() < 0.8:
+            submission[q['id']] = rng.choice(ANSWER_VALUES)
+    if rng.random() < 0.3:
+        submission['not-in-quiz'] = 'A'
+    return submission
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_old_grading(seed):
+    rng = random.Random(seed)
+    quiz_data = random_quiz(rng, rng.randint(0, 15))
+    submissions = [random_submission(rng, quiz_data) for _ in range(rng.randint(0, 30))]
+    answer_key = AnswerKey.from_quiz(quiz_data)
+
+    result = answer_key.grade_batch(submissions)
+
+    for row, submission in enumerate(submissions):
+        results, correct_count, old_percentage = old_grade(quiz_data, submission)
+        assert answer_key.grade_one(submission).tolist() == results
+        assert result.correct[row].tolist() == results
+        assert int(result.scores[row]) == correct_count
+        assert percentage(correct_count, answer_key.size) == old_percentage
+        assert result.percentages()[row] == old_percentage
+
+
+def test_percentages_match_percentage_for_every_score():
+    for total in range(0, 201):
+        answer_key = AnswerKey([{'id': f'q{i}', 'type': 'choice'} for i in range(total)],
+                               {f'q{i}': 'A' for i in range(total)})
+        # 第 score 份提交答对前 score 道题
+        submissions = [{f'q{i}': 'A' for i in range(score)} for score in range(total + 1)]
+
+        percentages = answer_key.grade_batch(submissions).percentages()
+
+        assert percentages.tolist() == [percentage(score, total) for score in range(total + 1)]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_encode_matches_per_answer_loop(seed):
+    rng = random.Random(seed)
+    quiz_data = random_quiz(rng, 10)
+    submissions = [random_submission(rng, quiz_data) for _ in range(50)]
+    answer_key = AnswerKey.from_quiz(quiz_data)
+
+    expected = np.full((len(submissions), answer_key.size), UNANSWERED, dtype=np.int8)
+    for row, submission in enumerate(submissions):
+        for question_id, answer in submission.items():
+            if question_id in answer_key.index:
+                expected[row, answer_key.index[question_id]] = encode_choice(answer)
+
+    assert np.array_equal(answer_key.encode(submissions), expected)
+
+
+def test_encode_empty_submissions():
+    answer_key = AnswerKey([{'id': 'q1', 'type': 'choice'}], {'q1': 'A'})
+
+    assert answer_key.encode([]).shape == (0, 1)
+    assert answer_key.encode([{}, {}]).tolist() == [[UNANSWERED], [UNANSWERED]]
+
+
+def test_question_stats_correct_rate_counts_answered_submissions():
+    questions = [{'id': 'q1', 'type': 'choice'}, {'id': 'q2', 'type': 'choice'},
+                 {'id': 'q3', 'type': 'open'}]
+    answer_key = AnswerKey(questions, {'q1': 'A', 'q2': 'B'})
+    submissions = [{'q1': 'A'}, {'q1': 'B'}, {'q1': 'A', 'q3': 'C'}, {}]
+
+    q1, q2, q3 = answer_key.grade_batch(submissions).question_stats()
+
+    assert (q1['answered'], q1['correct'], q1['correct_rate']) == (3, 2, 0.6667)
+    assert q1['options'] == {'A': 2, 'B': 1, 'C': 0, 'D': 0}
+    # 没人作答的题没有正确率
+    assert (q2['answered'], q2['correct'], q2['correct_rate']) == (0, 0, None)
+    # 开放题不判分
+    assert (q3['graded'], q3['correct'], q3['correct_rate']) == (False, None, None)
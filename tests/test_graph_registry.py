@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""图注册表：同一组合只编译一次，invalidate 后重新编译"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common.graph_registry import GraphRegistry
+
+
+class StubGraph:
+    """只记录编译次数的 StateGraph 替身"""
+
+    def __init__(self, provider, tools):
+        self.provider = provider
+        self.tools = tools
+
+    def compile(self):
+        time.sleep(0.01)
+        return ('compiled', self.provider, tuple(self.tools))
+
+
+def counting_builder():
+    calls = []
+    lock = threading.Lock()
+
+    def build(provider, tools):
+        with lock:
+            calls.append(provider)
+        time.sleep(0.01)
+        return StubGraph(provider, tools)
+
+    return build, calls
+
+
+def test_concurrent_get_compiles_once():
+    registry = GraphRegistry()
+    build, calls = counting_builder()
+    tools = [object()]
+    barrier = threading.Barrier(8)
+
+    def get(_):
+        barrier.wait()
+        return registry.get(build, 'zhipu', tools)
+
+    with ThreadPoolExecutor(8) as pool:
+        graphs = list(pool.map(get, range(8)))
+
+    assert calls == ['zhipu']
+    assert all(graph is graphs[0] for graph in graphs)
+    assert registry.stats()[0]['hits'] == 8
+
+
+def test_each_combination_is_compiled_separately():
+    registry = GraphRegistry()
+    build, calls = counting_builder()
+    tools = [object()]
+
+    zhipu = registry.get(build, 'zhipu', tools)
+    assert registry.get(build, 'openai', tools) is not zhipu
+    assert registry.get(build, 'zhipu', [object()]) is not zhipu
+    assert registry.get(build, 'zhipu', tools) is zhipu
+    assert len(calls) == 3
+
+
+def test_invalidate_by_provider_and_builder():
+    registry = GraphRegistry()
+    build, calls = counting_builder()
+    other_build, other_calls = counting_builder()
+    zhipu = registry.get(build, 'zhipu')
+    openai = registry.get(build, 'openai')
+    other = registry.get(other_build, 'zhipu')
+
+    assert registry.invalidate(provider='zhipu') == 2
+    assert registry.get(build, 'openai') is openai
+    assert registry.get(build, 'zhipu') is not zhipu
+    assert registry.get(other_build, 'zhipu') is not other
+
+    assert registry.invalidate(builder=other_build) == 1
+    assert registry.invalidate() == 2
+    assert registry.stats() == []
+    assert (calls, other_calls) == (['zhipu', 'openai', 'zhipu'], ['zhipu', 'zhipu'])
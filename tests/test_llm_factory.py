@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""LLM 工厂：模型和工具绑定结果的缓存"""
+
+import asyncio
+import http.server
+import threading
+
+import pytest
+
+from common import graph_registry, llm_factory
+
+
+class StubChatModel:
+    """只记录创建参数的聊天模型（不导入任何提供商 SDK）"""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def bind_tools(self, tools, **kwargs):
+        return ('bound', self, tuple(tools))
+
+
+@pytest.fixture(autouse=True)
+def stub_models(monkeypatch):
+    def create(provider, model, api_key, base_url, temperature):
+        return StubChatModel(provider=provider, model=model)
+
+    monkeypatch.setattr(llm_factory, '_create_llm', create)
+    llm_factory.clear_cache()
+    yield
+    llm_factory.clear_cache()
+
+
+def test_same_config_returns_cached_model_and_binding():
+    tools = [object()]
+    llm = llm_factory.get_llm('zhipu', api_key='key')
+
+    assert llm_factory.get_llm('zhipu', api_key='key') is llm
+    assert llm_factory.bind_tools(llm, tools) is llm_factory.bind_tools(llm, tools)
+    assert llm_factory.get_llm('zhipu', api_key='other') is not llm
+
+
+def test_set_rate_limit_drops_models_and_bindings_of_the_provider():
+    tools = [object()]
+    zhipu = llm_factory.get_llm('zhipu', api_key='key')
+    openai = llm_factory.get_llm('openai', api_key='key')
+    llm_factory.bind_tools(zhipu, tools)
+    openai_bound = llm_factory.bind_tools(openai, tools)
+
+    llm_factory.set_rate_limit('zhipu', None)
+
+    info = llm_factory.cache_info()
+    assert [entry['provider'] for entry in info['llms']] == ['openai']
+    assert info['bound'] == 1
+    assert llm_factory.bind_tools(openai, tools) is openai_bound
+    assert llm_factory.get_llm('zhipu', api_key='key') is not zhipu
+
+
+def test_set_rate_limit_invalidates_compiled_graphs_of_the_provider(monkeypatch):
+    registry = graph_registry.GraphRegistry()
+    monkeypatch.setattr(graph_registry, 'invalidate', registry.invalidate)
+
+    class Graph:
+        def compile(self):
+            return object()
+
+    def build(provider, tools):
+        return Graph()
+
+    zhipu = registry.get(build, 'zhipu')
+    openai = registry.get(build, 'openai')
+
+    llm_factory.set_rate_limit('zhipu', None)
+
+    assert registry.get(build, 'zhipu') is not zhipu
+    assert registry.get(build, 'openai') is openai
+
+
+def test_async_transport_keeps_one_pool_per_event_loop():
+    created = []
+
+    class Transport:
+        closed = False
+
+        async def handle_async_request(self, request):
+            return self
+
+        async def aclose(self):
+            self.closed = True
+
+    def create():
+        created.append(Transport())
+        return created[-1]
+
+    transport = llm_factory._PerLoopAsyncTransport(create)
+
+    async def send_twice():
+        return [await transport.handle_async_request('request') for _ in range(2)]
+
+    first = asyncio.run(send_twice())
+    second = asyncio.run(send_twice())
+
+    assert first[0] is first[1]
+    assert second[0] is second[1] is not first[0]
+    assert len(created) == 2
+
+    # aclose() 只关闭当前事件循环的连接池
+    async def send_and_close():
+        current = await transport.handle_async_request('request')
+        await transport.aclose()
+        return current
+
+    third = asyncio.run(send_and_close())
+    assert third.closed
+    assert not any(t.closed for t in created[:2])
+
+
+class OkHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_shared_async_client_works_across_event_loops():
+    pytest.importorskip('httpx')
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/'
+    _, client = llm_factory.shared_http_clients()
+
+    async def get_twice():
+        return [(await client.get(url)).text for _ in range(2)]
+
+    try:
+        # 每次 asyncio.run() 都是新的事件循环，长连接不能沿用上一个循环的
+        assert [asyncio.run(get_twice()) for _ in range(2)] == [['ok', 'ok'], ['ok', 'ok']]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""生产模式：答案在 worker 中保存，主进程退出时不能丢失"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+import app as webapp
+import prefork
+from answer_store import JournalAnswerStore, SQLiteAnswerStore
+from quiz_stats import QuizStats
+
+APP = Path(__file__).resolve().parent.parent / 'web' / 'app.py'
+
+
+def run_in_children(func, count=1):
+    """在 count 个 fork 出的子进程中同时执行 func(i)，像 prefork worker 一样用 os._exit 退出"""
+    pids = []
+    for i in range(count):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                func(i)
+                code = 0
+            finally:
+                os._exit(code)
+        pids.append(pid)
+    for pid in pids:
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+
+
+def run_in_child(func):
+    run_in_children(lambda i: func())
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_prod_requires_multiprocess_safe_store(tmp_path, monkeypatch, workers):
+    store = JournalAnswerStore(tmp_path / 'answers.json')
+    monkeypatch.setattr(webapp, 'answer_store', store)
+    args = argparse.Namespace(workers=workers, host='127.0.0.1', port=0, timeout=30,
+                              graceful_timeout=30, reload_interval=0)
+
+    with pytest.raises(SystemExit):
+        prefork.serve(args)
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='需要 fork')
+@pytest.mark.filterwarnings('ignore:This process .* is multi-threaded:DeprecationWarning')
+def test_sqlite_answer_saved_in_worker_survives_parent_compact(tmp_path):
+    store = SQLiteAnswerStore(tmp_path / 'answers.db')
+    store.save_many([('quiz.md', 'q1', 'A')])
+
+    def worker():
+        store.after_fork()
+        store.save_many([('quiz.md', 'q2', 'B')])
+
+    run_in_child(worker)
+    store.compact()
+
+    assert store.get_quiz_answers('quiz.md') == {'q1': 'A', 'q2': 'B'}
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='需要 fork')
+@pytest.mark.filterwarnings('ignore:This process .* is multi-threaded:DeprecationWarning')
+def test_concurrent_worker_saves_keep_stats_consistent(tmp_path, monkeypatch):
+    store = SQLiteAnswerStore(tmp_path / 'answers.db')
+    stats = QuizStats(tmp_path / 'quiz_stats.db')
+    monkeypatch.setattr(webapp, 'answer_store', store)
+    monkeypatch.setattr(webapp, 'quiz_stats', stats)
+
+    def worker(i):
+        webapp.after_fork()
+        # 两个 worker 同时改同一个用户的答案
+        for n in range(40):
+            webapp.save_user_answers([('quiz.md', 'q1', 'ABCD'[(i + n) % 4]),
+                                      ('quiz.md', 'q2', 'ABCD'[n % 4])], user=f'user{i % 2}')
+
+    run_in_children(worker, count=4)
+
+    rebuilt = QuizStats(tmp_path / 'rebuilt.db')
+    rebuilt.rebuild(store.iter_answers())
+    quiz_data = {'title': 'quiz', 'answers': {'q1': 'A', 'q2': 'B'},
+                 'questions': [{'id': 'q1', 'number': 1, 'type': 'choice'},
+                               {'id': 'q2', 'number': 2, 'type': 'choice'}]}
+    assert stats.report('quiz.md', quiz_data) == rebuilt.report('quiz.md', quiz_data)
+    assert stats.report('quiz.md', quiz_data)['learners'] == 2
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def http(port, path, payload=None):
+    data = None if payload is None else json.dumps(payload).encode('utf-8')
+    request = urllib.request.Request(f'http://127.0.0.1:{port}{path}', data=data,
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='需要 fork')
+def test_answers_saved_by_arbiter_workers_are_visible_to_parent(tmp_path):
+    """真正启动主进程：预加载后 fork 出 2 个 worker，worker 中 after_fork 后保存答案"""
+    port = free_port()
+    env = dict(os.environ, ANSWER_STORE='sqlite', ANSWERS_DB=str(tmp_path / 'answers.db'),
+               QUIZ_STATS_DB=str(tmp_path / 'quiz_stats.db'))
+    log = (tmp_path / 'server.log').open('w')
+    server = subprocess.Popen(
+        [sys.executable, str(APP), 'prod', '--host', '127.0.0.1', '--port', str(port),
+         '--workers', '2', '--reload-interval', '0'],
+        env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                http(port, '/api/cache/stats')
+                break
+            except (urllib.error.URLError, ConnectionError):
+                assert server.poll() is None and time.monotonic() < deadline, \
+                    (tmp_path / 'server.log').read_text(encoding='utf-8')
+                time.sleep(0.1)
+
+        # 每个请求一个新连接，由两个 worker 分别接受
+        for n in range(10):
+            assert http(port, '/api/save', {'quiz_file': 'quiz.md', 'question_id': f'q{n}',
+                                            'answer': 'ABCD'[n % 4]})['status'] == 'ok'
+        expected = {f'q{n}': 'ABCD'[n % 4] for n in range(10)}
+        assert http(port, '/api/answers/quiz.md') == expected
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        finally:
+            server.kill()
+            log.close()
+
+    assert server.returncode == 0
+    assert SQLiteAnswerStore(tmp_path / 'answers.db').get_quiz_answers('quiz.md') == expected
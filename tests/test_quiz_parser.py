@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""单遍测试题解析器与原多遍正则实现（scripts/verify_quiz_parser.py）的结果一致"""
+
+import io
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from quiz_parser import count_questions_stream, parse_quiz_stream
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from verify_quiz_parser import legacy_count_questions, legacy_parse_quiz, verify_file  # noqa: E402
+
+QUIZ_FILES = sorted(ROOT.glob('examples/phase*/quizzes/*.md'))
+
+EDGE_CASES = {
+    'empty': '',
+    'no_questions': '# 标题\n\n只有说明，没有题目\n',
+    'english_and_problem_headings': (
+        '### Question 1: What is a node?\n\nA. `a`\nB. `b`\n\n**正确答案**：B\n**解析**：节点\n\n---\n'
+        '### 问题2 没有冒号\n\nA. x\nB. y\n\n**正确答案**：A\n'
+    ),
+    'missing_answer_and_explanation': '### [类型:choice] 题目1：没有答案？\n\nA. x\nB. y\n\n---\n',
+    'open_question': (
+        '### [类型:open] 题目1：解释 State\n\n**你的答案**：\n_（写下你的理解）_\n\n'
+        '**正确答案**：\n\nState 在节点间传递\n\n- 作用：保存数据\n'
+    ),
+    'summary_sections_ignored': (
+        '### 题目1：问题？\n\nA. x\nB. y\n\n**正确答案**：A\n\n'
+        '## 正确答案汇总\n\n### 题目2：不应被解析\n\n## 测试总结\n'
+    ),
+    'answer_letter_in_text': '### 题目1：选哪个？\n\nA. x\nB. y\n\n**正确答案**：👆 **B**（因为 A 不对）\n',
+    'crlf_line_endings': '### 题目1：问题？\r\n\r\nA. x\r\nB. y\r\n\r\n**正确答案**：B\r\n',
+}
+
+
+def assert_same_as_legacy(content):
+    expected = legacy_parse_quiz(content)
+    actual = parse_quiz_stream(io.StringIO(content))
+
+    assert actual['questions'] == expected['questions']
+    assert actual['answers'] == expected['answers']
+    assert actual['explanations'] == expected['explanations']
+    assert actual['count'] == legacy_count_questions(content)
+    assert count_questions_stream(io.StringIO(content)) == legacy_count_questions(content)
+
+
+@pytest.mark.parametrize('quiz_file', QUIZ_FILES, ids=lambda path: path.name)
+def test_repository_quizzes(quiz_file):
+    assert verify_file(quiz_file) == []
+
+
+@pytest.mark.parametrize('name', sorted(EDGE_CASES))
+def test_edge_cases(name):
+    assert_same_as_legacy(EDGE_CASES[name])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_synthetic_quizzes(seed):
+    from benchmark_web import generate_quiz
+
+    rng = random.Random(seed)
+    assert_same_as_legacy(generate_quiz(rng.randint(1, 200), rng))
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""全文搜索：索引范围与内容监听一致，查询时按间隔同步"""
+
+import time
+
+import pytest
+
+import app as webapp
+import search
+from search import SearchIndex
+from watcher import PollingWatcher
+
+
+def test_search_sources_are_all_watched():
+    sources = webapp._search_sources()
+    watcher = PollingWatcher(webapp.BASE_DIR, webapp.CONTENT_PATTERNS, lambda path, event: None)
+
+    assert sources
+    assert set(sources) == watcher.scan()
+    assert all(watcher.matches(path) for path in sources)
+
+
+def test_files_outside_the_watched_patterns_are_not_indexed(tmp_path, monkeypatch):
+    (tmp_path / 'docs' / 'phase01_basics' / 'deep').mkdir(parents=True)
+    (tmp_path / 'docs' / 'phase01_basics' / '01_intro.md').write_text('# 讲义', encoding='utf-8')
+    (tmp_path / 'docs' / 'phase01_basics' / 'deep' / 'notes.md').write_text('# 深层', encoding='utf-8')
+    monkeypatch.setattr(webapp, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(webapp, 'DOCS_DIR', tmp_path / 'docs')
+
+    assert [path.name for path in webapp._search_sources()] == ['01_intro.md']
+
+
+def make_index(tmp_path, sync_interval):
+    lecture = tmp_path / 'lecture.md'
+    lecture.write_text('StateGraph 状态图', encoding='utf-8')
+    scans = []
+
+    def sources():
+        scans.append(1)
+        return {lecture: lambda path: [{'kind': 'lecture', 'title': path.name, 'url': '/',
+                                        'text': path.read_text(encoding='utf-8')}]}
+
+    return SearchIndex(sources, sync_interval=sync_interval), scans, lecture
+
+
+def test_queries_do_not_rescan_within_the_sync_interval(tmp_path):
+    index, scans, lecture = make_index(tmp_path, sync_interval=60)
+
+    assert index.search('stategraph')['total'] == 1
+    lecture.write_text('MessagesState', encoding='utf-8')
+    assert index.search('stategraph')['total'] == 1
+    assert len(scans) == 1
+
+
+def test_queries_rescan_after_the_sync_interval(tmp_path, monkeypatch):
+    index, scans, lecture = make_index(tmp_path, sync_interval=60)
+    index.search('stategraph')
+    lecture.write_text('MessagesState', encoding='utf-8')
+
+    now = time.monotonic()
+    monkeypatch.setattr(search.time, 'monotonic', lambda: now + 61)
+
+    assert index.search('stategraph')['total'] == 0
+    assert index.search('messagesstate')['total'] == 1
+    assert len(scans) == 2
+
+
+def test_queries_never_rescan_with_a_content_watcher(tmp_path):
+    index, scans, _ = make_index(tmp_path, sync_interval=0)
+    index.build()
+    index.validate = False
+
+    index.search('stategraph')
+    index.search('stategraph')
+    assert len(scans) == 1
+
+
+@pytest.mark.parametrize('limit, expected', [('0', 1), ('-5', 1), ('3', 3), ('500', 50), ('x', 10)])
+def test_api_search_clamps_limit(monkeypatch, limit, expected):
+    calls = []
+    monkeypatch.setattr(webapp.search_index, 'search',
+                        lambda query, limit, kind: calls.append(limit) or {'results': []})
+
+    response = webapp.app.test_client().get('/api/search', query_string={'q': 'state', 'limit': limit})
+
+    assert response.status_code == 200
+    assert calls == [expected]
@@ -0,0 +1,476 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 答案存储
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：保存测试题答案
+
+提供两种可互换的存储后端（接口见 AnswerStore）：
+    - JournalAnswerStore：answers.json 快照 + 追加日志（默认，单用户场景）
+    - SQLiteAnswerStore：SQLite（WAL 模式），按用户/测试题建索引，适合多用户
+
+JournalAnswerStore 由两部分组成：
+    - 快照：answers.json（格式与原来完全一致，可直接导出）
+    - 日志：answers.journal.jsonl，每次保存只追加一行 JSON
+
+启动时加载快照并重放日志，得到内存中的物化视图，读操作只访问内存。
+日志达到一定行数后做一次压缩：把视图写回快照，再清空日志。
+
+迁移已有的 answers.json 到 SQLite：
+    python web/answer_store.py migrate answers.json answers.db
+"""
+
+import argparse
+import copy
+import json
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+# 没有用户信息时使用的默认用户（即原来的单用户 answers.json）
+DEFAULT_USER = 'default'
+
+
+class AnswerStore(ABC):
+    """答案存储接口
+
+    所有方法都带 user 参数，默认用户对应原 answers.json 的顶层 quizzes。
+    """
+
+    # 是否允许多个进程同时读写（多进程部署时检查）
+    multiprocess_safe = False
+
+    @abstractmethod
+    def get_quiz_answers(self, quiz_file, user=DEFAULT_USER):
+        """某个用户在某套测试题上的已保存答案 {question_id: answer}"""
+
+    @abstractmethod
+    def save_many(self, entries, user=DEFAULT_USER):
+        """批量保存 [(quiz_file, question_id, answer), ...]（都是字符串），返回保存时间"""
+
+    @abstractmethod
+    def export(self):
+        """导出为 answers.json 格式（其他用户放在 users 下）"""
+
+    @abstractmethod
+    def iter_answers(self, quiz_file=None):
+        """遍历所有已保存的答案，产出 (user, quiz_file, question_id, answer)，可只取一套测试题"""
+
+    @abstractmethod
+    def import_answers(self, data):
+        """导入 answers.json 格式的数据（合并到已有答案），返回导入条数"""
+
+    def save_and_record(self, entries, stats, user=DEFAULT_USER):
+        """保存一批答案，同时按保存前的答案增量更新统计（quiz_stats.QuizStats），返回保存时间
+
+        读旧答案、保存、记录统计必须一起完成，否则并发保存会让统计漂移。
+        默认实现只在本进程内加锁，多进程部署要求后端覆盖它（见 multiprocess_safe）。
+        """
+        with _record_lock:
+            previous = {quiz_file: self.get_quiz_answers(quiz_file, user)
+                        for quiz_file in {entry[0] for entry in entries}}
+            saved_at = self.save_many(entries, user=user)
+            stats.record_answers(entries, previous)
+        return saved_at
+
+    def after_fork(self):
+        """fork 出子进程后在子进程中调用，重建不能跨进程共享的资源"""
+
+    def compact(self):
+        """整理存储（退出前调用）"""
+
+    def stats(self):
+        """存储状态"""
+        return {}
+
+
+# AnswerStore.save_and_record 默认实现的进程内锁
+_record_lock = threading.Lock()
+
+
+def _check_entries(entries):
+    """两种后端都只保存字符串答案，其他类型直接拒绝（否则 SQLite 会转成文本，日志会原样保存）"""
+    for entry in entries:
+        if not all(isinstance(value, str) for value in entry):
+            raise TypeError(f"测试题路径、题目 id 和答案必须是字符串: {entry!r}")
+
+
+def _iter_exported(data):
+    """遍历 answers.json 格式数据，产出 (user, quiz_file, question_id, answer)"""
+    users = {DEFAULT_USER: data}
+    users.update(data.get('users', {}))
+    for user, user_data in users.items():
+        for quiz_file, quiz in user_data.get('quizzes', {}).items():
+            for question_id, answer in quiz.get('answers', {}).items():
+                yield user, quiz_file, question_id, answer
+
+
+class JournalAnswerStore(AnswerStore):
+    """快照 + 追加日志的答案存储"""
+
+    def __init__(self, snapshot_path, journal_path=None, compact_every=200):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = Path(journal_path) if journal_path else \
+            self.snapshot_path.with_suffix('.journal.jsonl')
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._journal_lines = 0
+        self._data = self._load()
+
+    # ==================== 加载 ====================
+
+    def _load(self):
+        """加载快照并重放日志"""
+        if self.snapshot_path.exists():
+            data = json.loads(self.snapshot_path.read_text(encoding='utf-8'))
+        else:
+            data = {'last_updated': None, 'quizzes': {}}
+        data.setdefault('quizzes', {})
+
+        if self.journal_path.exists():
+            self._truncate_partial_line()
+            with self.journal_path.open('r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 旧版本在半行后面接着追加留下的坏行，忽略
+                        continue
+                    self._apply(data, record)
+                    self._journal_lines += 1
+
+        return data
+
+    def _truncate_partial_line(self):
+        """截掉写入中断留下的半行
+
+        不截掉的话，下一次追加的记录会接在半行后面，和它一起成为一行无法解析的 JSON，
+        重启后这条答案就丢了
+        """
+        with self.journal_path.open('rb+') as f:
+            content = f.read()
+            if content and not content.endswith(b'\n'):
+                f.truncate(content.rfind(b'\n') + 1)
+
+    @staticmethod
+    def _user_data(data, user, create=False):
+        """取某个用户的数据（默认用户就是顶层）"""
+        if user == DEFAULT_USER:
+            return data
+        if create:
+            return data.setdefault('users', {}).setdefault(user, {'quizzes': {}})
+        return data.get('users', {}).get(user, {})
+
+    @classmethod
+    def _apply(cls, data, record):
+        """把一条日志记录应用到视图上"""
+        user_data = cls._user_data(data, record.get('user', DEFAULT_USER), create=True)
+        quiz = user_data['quizzes'].setdefault(record['quiz_file'], {'answers': {}})
+        quiz['answers'][record['question_id']] = record['answer']
+        data['last_updated'] = record['saved_at']
+
+    # ==================== 读 ====================
+
+    def get_quiz_answers(self, quiz_file, user=DEFAULT_USER):
+        with self._lock:
+            user_data = self._user_data(self._data, user)
+            return dict(user_data.get('quizzes', {}).get(quiz_file, {}).get('answers', {}))
+
+    def export(self):
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def iter_answers(self, quiz_file=None):
+        with self._lock:
+            rows = [row for row in _iter_exported(self._data)
+                    if quiz_file is None or row[1] == quiz_file]
+        return iter(rows)
+
+    # ==================== 写 ====================
+
+    def save_many(self, entries, user=DEFAULT_USER):
+        _check_entries(entries)
+        saved_at = datetime.now().isoformat()
+        records = []
+        for quiz_file, question_id, answer in entries:
+            record = {
+                'quiz_file': quiz_file,
+                'question_id': question_id,
+                'answer': answer,
+                'saved_at': saved_at
+            }
+            if user != DEFAULT_USER:
+                record['user'] = user
+            records.append(record)
+
+        with self._lock:
+            # 一批记录一次写入
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal_path.open('a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+            for record in records:
+                self._apply(self._data, record)
+            self._journal_lines += len(records)
+
+            if self._journal_lines >= self.compact_every:
+                self._compact()
+
+        return saved_at
+
+    def import_answers(self, data):
+        saved_at = data.get('last_updated') or datetime.now().isoformat()
+        count = 0
+        with self._lock:
+            for user, quiz_file, question_id, answer in _iter_exported(data):
+                self._apply(self._data, {
+                    'user': user,
+                    'quiz_file': quiz_file,
+                    'question_id': question_id,
+                    'answer': answer,
+                    'saved_at': saved_at
+                })
+                count += 1
+            self._compact()
+        return count
+
+    # ==================== 压缩 ====================
+
+    def compact(self):
+        # 把日志合并进快照
+        with self._lock:
+            if self._journal_lines:
+                self._compact()
+
+    def _compact(self):
+        # 先原子地写入新快照，再清空日志；
+        # 中途崩溃时日志会在下次启动重放一遍，结果相同
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix('.json.tmp')
+        tmp_path.write_text(
+            json.dumps(self._data, indent=2, ensure_ascii=False),
+            encoding='utf-8'
+        )
+        os.replace(tmp_path, self.snapshot_path)
+
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._journal_lines = 0
+
+    def stats(self):
+        return {
+            'backend': 'journal',
+            'journal_lines': self._journal_lines,
+            'compact_every': self.compact_every
+        }
+
+
+class SQLiteAnswerStore(AnswerStore):
+    """SQLite 答案存储
+
+    - WAL 模式：读写互不阻塞
+    - 主键 (user, quiz_file, question_id)，按测试题统计另建 (quiz_file, question_id) 索引
+    - 单条和批量保存都是 UPSERT，一批在一个事务里提交
+    - 固定大小的连接池，线程间复用连接
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS answers (
+            user        TEXT NOT NULL,
+            quiz_file   TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            answer      TEXT NOT NULL,
+            saved_at    TEXT NOT NULL,
+            PRIMARY KEY (user, quiz_file, question_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_answers_quiz ON answers (quiz_file, question_id);
+    """
+
+    UPSERT = """
+        INSERT INTO answers (user, quiz_file, question_id, answer, saved_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (user, quiz_file, question_id)
+        DO UPDATE SET answer = excluded.answer, saved_at = excluded.saved_at
+    """
+
+    multiprocess_safe = True
+
+    def __init__(self, db_path, pool_size=4):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.pool_size = pool_size
+        self._pool = self._create_pool()
+
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _create_pool(self):
+        pool = queue.Queue()
+        for _ in range(self.pool_size):
+            pool.put(self._connect())
+        return pool
+
+    def after_fork(self):
+        # SQLite 连接不能跨 fork 使用，子进程重新建立连接池，不再使用继承来的连接
+        self._pool = self._create_pool()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """从连接池借一个连接，with 块结束时提交（异常时回滚）并归还"""
+        conn = self._pool.get()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._pool.put(conn)
+
+    # ==================== 读 ====================
+
+    def get_quiz_answers(self, quiz_file, user=DEFAULT_USER):
+        with self._connection() as conn:
+            return self._quiz_answers(conn, quiz_file, user)
+
+    @staticmethod
+    def _quiz_answers(conn, quiz_file, user):
+        rows = conn.execute(
+            'SELECT question_id, answer FROM answers WHERE user = ? AND quiz_file = ?',
+            (user, quiz_file)
+        ).fetchall()
+        return dict(rows)
+
+    def export(self):
+        data = {'last_updated': None, 'quizzes': {}}
+        with self._connection() as conn:
+            rows = conn.execute(
+                'SELECT user, quiz_file, question_id, answer, saved_at FROM answers '
+                'ORDER BY user, quiz_file, question_id'
+            ).fetchall()
+
+        for user, quiz_file, question_id, answer, saved_at in rows:
+            if user == DEFAULT_USER:
+                user_data = data
+            else:
+                user_data = data.setdefault('users', {}).setdefault(user, {'quizzes': {}})
+            quiz = user_data['quizzes'].setdefault(quiz_file, {'answers': {}})
+            quiz['answers'][question_id] = answer
+            if data['last_updated'] is None or saved_at > data['last_updated']:
+                data['last_updated'] = saved_at
+        return data
+
+    def iter_answers(self, quiz_file=None):
+        sql = 'SELECT user, quiz_file, question_id, answer FROM answers'
+        params = ()
+        if quiz_file is not None:
+            sql += ' WHERE quiz_file = ?'
+            params = (quiz_file,)
+        with self._connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return iter(rows)
+
+    # ==================== 写 ====================
+
+    def save_many(self, entries, user=DEFAULT_USER):
+        _check_entries(entries)
+        saved_at = datetime.now().isoformat()
+        rows = [(user, quiz_file, question_id, answer, saved_at)
+                for quiz_file, question_id, answer in entries]
+        with self._connection() as conn:
+            conn.executemany(self.UPSERT, rows)
+        return saved_at
+
+    def save_and_record(self, entries, stats, user=DEFAULT_USER):
+        # 统计库附加到同一个连接，BEGIN IMMEDIATE 一开始就拿到写锁：
+        # 多个进程的读旧答案、保存和统计增量依次执行，并在一个事务里提交
+        _check_entries(entries)
+        saved_at = datetime.now().isoformat()
+        rows = [(user, quiz_file, question_id, answer, saved_at)
+                for quiz_file, question_id, answer in entries]
+        with self._connection() as conn:
+            stats.attach(conn)
+            conn.execute('BEGIN IMMEDIATE')
+            previous = {quiz_file: self._quiz_answers(conn, quiz_file, user)
+                        for quiz_file in {entry[0] for entry in entries}}
+            conn.executemany(self.UPSERT, rows)
+            stats.record_answers_in(conn, entries, previous)
+        return saved_at
+
+    def import_answers(self, data):
+        saved_at = data.get('last_updated') or datetime.now().isoformat()
+        rows = [(user, quiz_file, question_id, answer, saved_at)
+                for user, quiz_file, question_id, answer in _iter_exported(data)]
+        with self._connection() as conn:
+            conn.executemany(self.UPSERT, rows)
+        return len(rows)
+
+    def compact(self):
+        # 把 WAL 内容写回主数据库文件
+        with self._connection() as conn:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def stats(self):
+        with self._connection() as conn:
+            rows, users = conn.execute(
+                'SELECT COUNT(*), COUNT(DISTINCT user) FROM answers'
+            ).fetchone()
+        return {
+            'backend': 'sqlite',
+            'rows': rows,
+            'users': users
+        }
+
+
+def create_answer_store(backend, answers_file, db_path, compact_every=200):
+    """按配置创建答案存储：journal（默认）或 sqlite"""
+    if backend == 'journal':
+        return JournalAnswerStore(answers_file, compact_every=compact_every)
+    elif backend == 'sqlite':
+        return SQLiteAnswerStore(db_path)
+    else:
+        raise ValueError(f"不支持的答案存储后端: {backend}")
+
+
+# ==================== 迁移工具 ====================
+
+def main():
+    parser = argparse.ArgumentParser(description="答案存储工具")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    migrate = subparsers.add_parser('migrate', help="把 answers.json 导入 SQLite")
+    migrate.add_argument('answers_files', nargs='+', help="answers.json 文件（可多个）")
+    migrate.add_argument('db_path', help="SQLite 数据库路径")
+    migrate.add_argument('--user', default=None,
+                         help="把顶层答案导入到指定用户名下（默认保持为默认用户）")
+
+    args = parser.parse_args()
+
+    store = SQLiteAnswerStore(args.db_path)
+    total = 0
+    for answers_file in args.answers_files:
+        data = json.loads(Path(answers_file).read_text(encoding='utf-8'))
+        if args.user:
+            data = {'last_updated': data.get('last_updated'),
+                    'quizzes': {},
+                    'users': {args.user: {'quizzes': data.get('quizzes', {})}}}
+        count = store.import_answers(data)
+        total += count
+        print(f"✅ {answers_file}: 导入 {count} 条答案")
+
+    store.compact()
+    print(f"共导入 {total} 条答案到 {args.db_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,88 +9,301 @@ LangGraph 学习平台 - Web 应用
 """
 
 import os
+import sys
 import json
 import re
-from datetime import datetime
+import argparse
+import atexit
+import functools
+import hashlib
+import html as html_lib
+import mimetypes
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import (Flask, render_template, stream_template, request, jsonify, send_from_directory,
+                   make_response, url_for, g, before_render_template, template_rendered)
+from werkzeug.http import is_resource_modified
 import markdown
 from pygments import highlight
-from pygments.lexers import PythonLexer, get_lexer_by_name
+from pygments.lexers import get_lexer_by_name
 from pygments.formatters import HtmlFormatter
+from pygments.util import ClassNotFound
+
+from answer_store import DEFAULT_USER, create_answer_store
+from assets import AssetManifest
+from cache import FileLRUCache, file_signature
+from compression import choose_encoding, compress, compress_stream, is_compressible
+from grading import AnswerKey, percentage
+from profiling import Profiler
+from quiz_stats import QuizStats
+from search import SearchIndex
+from quiz_parser import parse_quiz_stream, count_questions_stream
+from watcher import create_watcher
 
 app = Flask(__name__)
 
 # 配置
 app.config['JSON_AS_ASCII'] = False
 app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+# 已解析测试题缓存的内存预算（字节）
+app.config['QUIZ_CACHE_MAX_BYTES'] = int(os.environ.get('QUIZ_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+# 答案日志累计多少行后合并进 answers.json
+app.config['ANSWERS_COMPACT_EVERY'] = int(os.environ.get('ANSWERS_COMPACT_EVERY', 200))
+# 答案存储后端：journal（answers.json + 追加日志）或 sqlite
+app.config['ANSWER_STORE'] = os.environ.get('ANSWER_STORE', 'journal')
+# 渲染后讲义 HTML 缓存的内存预算（字节）
+app.config['LECTURE_CACHE_MAX_BYTES'] = int(os.environ.get('LECTURE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+# 服务端用 Pygments 高亮代码块（SERVER_HIGHLIGHT=0 关闭）
+app.config['SERVER_HIGHLIGHT'] = os.environ.get('SERVER_HIGHLIGHT', '1') != '0'
+# 高亮结果缓存的代码块数量上限
+app.config['HIGHLIGHT_CACHE_SIZE'] = int(os.environ.get('HIGHLIGHT_CACHE_SIZE', 4096))
+# 内容监听：auto（优先 inotify，不可用时轮询）、inotify、poll 或 off
+app.config['CONTENT_WATCHER'] = os.environ.get('CONTENT_WATCHER', 'auto')
+# 轮询方式的扫描间隔（秒）
+app.config['CONTENT_POLL_INTERVAL'] = float(os.environ.get('CONTENT_POLL_INTERVAL', 1))
+# 没有内容监听时，搜索最多每隔这么久（秒）扫描一次内容文件检查变化
+app.config['SEARCH_SYNC_INTERVAL'] = float(os.environ.get('SEARCH_SYNC_INTERVAL', 2))
+# 按 Accept-Encoding 用 gzip / brotli 压缩响应（RESPONSE_COMPRESSION=0 关闭，交给前置代理压缩时可关闭）
+app.config['RESPONSE_COMPRESSION'] = os.environ.get('RESPONSE_COMPRESSION', '1') != '0'
+# 小于这个大小（字节）的响应不压缩
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+# 流式渲染页面时每积累多少字符发送一次
+app.config['STREAM_FLUSH_SIZE'] = int(os.environ.get('STREAM_FLUSH_SIZE', 8 * 1024))
+# 一题一页模式首屏渲染的题目数，其余题目由前端分页加载（/api/quiz/<path>/questions）
+app.config['QUIZ_PAGE_SIZE'] = int(os.environ.get('QUIZ_PAGE_SIZE', 5))
+# 生产模式（python app.py prod）：worker 进程数
+app.config['WEB_WORKERS'] = int(os.environ.get('WEB_WORKERS', os.cpu_count() or 1))
+# 生产模式：单个连接的读写超时（秒）
+app.config['WEB_TIMEOUT'] = float(os.environ.get('WEB_TIMEOUT', 30))
+# 生产模式：重启/停止时等待 worker 处理完当前请求的时间（秒）
+app.config['WEB_GRACEFUL_TIMEOUT'] = float(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+# 生产模式：检查内容文件变化的间隔（秒），0 表示不检查
+app.config['WEB_RELOAD_INTERVAL'] = float(os.environ.get('WEB_RELOAD_INTERVAL', 2))
+
+# 请求性能分析：分段计时、Server-Timing 响应头、/metrics（PROFILING=1 开启）
+app.config['PROFILING'] = os.environ.get('PROFILING', '0') == '1'
+# 采样分析的采样间隔（毫秒），0 表示不采样
+app.config['PROFILE_SAMPLE_INTERVAL'] = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0))
+# 保留最慢的多少个请求的分段耗时和采样结果
+app.config['PROFILE_SLOWEST'] = int(os.environ.get('PROFILE_SLOWEST', 10))
 
 # 项目路径
 BASE_DIR = Path(__file__).parent.parent
 DOCS_DIR = BASE_DIR / 'docs'
 QUIZZES_DIR = BASE_DIR / 'examples' / 'phase01_basics' / 'quizzes'
 ANSWERS_FILE = QUIZZES_DIR / 'answers.json'
+ANSWERS_DB = Path(os.environ.get('ANSWERS_DB', QUIZZES_DIR / 'answers.db'))
+QUIZ_STATS_DB = Path(os.environ.get('QUIZ_STATS_DB', QUIZZES_DIR / 'quiz_stats.db'))
+
+profiler = Profiler(
+    enabled=app.config['PROFILING'],
+    sample_interval=app.config['PROFILE_SAMPLE_INTERVAL'],
+    slowest=app.config['PROFILE_SLOWEST']
+)
 
 
 # ==================== 辅助函数 ====================
 
-def build_navigation():
-    """构建动态导航树"""
-    nav = {
-        'lectures': [],
-        'quizzes': []
+class NavigationIndex:
+    """导航索引
+
+    启动时构建一次，之后按 (mtime, size) 增量刷新：
+    只有新增或变化的文件才会重新读取、提取标题和统计题目数，
+    其余文件直接复用缓存。文件都没变化时直接返回上一次的导航树。
+
+    启用内容监听后（validate=False），build() 不再扫描目录，
+    由监听线程调用 refresh() 更新单个条目。
+    """
+
+    def __init__(self):
+        self._entries = {}  # Path -> (签名, 条目信息)
+        self._nav = None
+        self._lock = threading.Lock()
+        self.version = 0
+        self.signature = None      # 导航树内容的哈希，用于页面 ETag
+        self.last_modified = None  # 所有导航文件中最新的修改时间
+        self.hits = 0
+        self.misses = 0
+        self.validate = True
+
+    def _lookup(self, path, parse, seen):
+        """按文件签名查缓存，未命中时调用 parse(path) 重新解析"""
+        signature = file_signature(path)
+        seen.add(path)
+
+        cached = self._entries.get(path)
+        if cached and cached[0] == signature:
+            self.hits += 1
+            return cached[1], False
+
+        self.misses += 1
+        info = parse(path)
+        self._entries[path] = (signature, info)
+        return info, True
+
+    def build(self):
+        """返回导航树（只重新解析变化的文件）"""
+        with self._lock:
+            if not self.validate and self._nav is not None:
+                return self._nav
+
+            seen = set()
+            changed = False
+            nav = {
+                'lectures': [],
+                'quizzes': []
+            }
+
+            # 扫描讲义
+            for phase_dir in sorted(DOCS_DIR.glob('phase*')):
+                phase_name = extract_phase_name(phase_dir)
+                lectures = []
+
+                for md_file in sorted(phase_dir.glob('*.md')):
+                    if md_file.name == 'README.md':
+                        continue
+
+                    info, updated = self._lookup(md_file, _parse_lecture_entry, seen)
+                    changed = changed or updated
+                    lectures.append(dict(info, phase=phase_name))
+
+                if lectures:
+                    nav['lectures'].append({
+                        'phase': phase_name,
+                        'items': lectures
+                    })
+
+            # 扫描测试题
+            examples_dir = BASE_DIR / 'examples'
+            for phase_dir in sorted(examples_dir.glob('phase*')):
+                phase_name = extract_phase_name(phase_dir)
+                quizzes_dir = phase_dir / 'quizzes'
+
+                if not quizzes_dir.exists():
+                    continue
+
+                quizzes = []
+                for quiz_file in sorted(quizzes_dir.glob('*.md')):
+                    info, updated = self._lookup(quiz_file, _parse_quiz_entry, seen)
+                    changed = changed or updated
+                    quizzes.append(dict(info, phase=phase_name))
+
+                if quizzes:
+                    nav['quizzes'].append({
+                        'phase': phase_name,
+                        'items': quizzes
+                    })
+
+            # 清理已删除的文件
+            removed = self._entries.keys() - seen
+            for path in removed:
+                del self._entries[path]
+
+            if changed or removed or self._nav is None:
+                self._publish(nav)
+
+            return self._nav
+
+    def _publish(self, nav):
+        """替换当前导航树并更新版本、签名和修改时间"""
+        self._nav = nav
+        self.version += 1
+        self.signature = hashlib.sha256(
+            json.dumps(nav, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+        self.last_modified = max(
+            (sig[0] for sig, _ in self._entries.values()), default=0
+        ) / 1e9
+
+    def refresh(self, path):
+        """单个文件变化后更新导航（由内容监听调用）
+
+        已在导航中的文件只重新解析这一个条目，替换后发布新的导航树；
+        新增或删除文件会改变目录结构，下次 build() 时重新扫描（其余条目仍走缓存）。
+        """
+        path = Path(path)
+        with self._lock:
+            location = self._locate(path) if path in self._entries else None
+            if location is not None:
+                section, group_index, item_index, parse = location
+                try:
+                    signature = file_signature(path)
+                    info = parse(path)
+                except FileNotFoundError:
+                    location = None
+            if location is None:
+                self._entries.pop(path, None)
+                self._nav = None
+                return
+
+            self._entries[path] = (signature, info)
+
+            # 复制被修改的分组，已经返回给调用方的导航树保持不变
+            nav = {key: list(groups) for key, groups in self._nav.items()}
+            group = nav[section][group_index]
+            items = list(group['items'])
+            items[item_index] = dict(info, phase=items[item_index]['phase'])
+            nav[section][group_index] = dict(group, items=items)
+            self._publish(nav)
+
+    def _locate(self, path):
+        """查找文件在导航树中的位置：(分区, 分组下标, 条目下标, 解析函数)"""
+        if self._nav is None:
+            return None
+        file = str(path.relative_to(BASE_DIR))
+        parsers = {'lectures': _parse_lecture_entry, 'quizzes': _parse_quiz_entry}
+        for section, parse in parsers.items():
+            for group_index, group in enumerate(self._nav[section]):
+                for item_index, item in enumerate(group['items']):
+                    if item['file'] == file:
+                        return section, group_index, item_index, parse
+        return None
+
+    def invalidate(self, path=None):
+        """失效缓存：指定路径只失效该文件，否则清空全部"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(Path(path), None)
+            self._nav = None
+
+    def stats(self):
+        """缓存命中统计"""
+        return {
+            'entries': len(self._entries),
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+def _parse_lecture_entry(md_file):
+    """导航条目：讲义"""
+    return {
+        'file': str(md_file.relative_to(BASE_DIR)),
+        'title': extract_title(md_file)
     }
 
-    # 扫描讲义
-    for phase_dir in sorted(DOCS_DIR.glob('phase*')):
-        phase_name = extract_phase_name(phase_dir)
-        lectures = []
-
-        for md_file in sorted(phase_dir.glob('*.md')):
-            if md_file.name == 'README.md':
-                continue
-
-            title = extract_title(md_file)
-            lectures.append({
-                'file': str(md_file.relative_to(BASE_DIR)),
-                'title': title,
-                'phase': phase_name
-            })
-
-        if lectures:
-            nav['lectures'].append({
-                'phase': phase_name,
-                'items': lectures
-            })
-
-    # 扫描测试题
-    examples_dir = BASE_DIR / 'examples'
-    for phase_dir in sorted(examples_dir.glob('phase*')):
-        phase_name = extract_phase_name(phase_dir)
-        quizzes_dir = phase_dir / 'quizzes'
-
-        if not quizzes_dir.exists():
-            continue
-
-        quizzes = []
-        for quiz_file in sorted(quizzes_dir.glob('*.md')):
-            title = extract_quiz_title(quiz_file)
-            question_count = count_questions(quiz_file)
-
-            quizzes.append({
-                'file': str(quiz_file.relative_to(BASE_DIR)),
-                'title': title,
-                'count': question_count,
-                'phase': phase_name
-            })
-
-        if quizzes:
-            nav['quizzes'].append({
-                'phase': phase_name,
-                'items': quizzes
-            })
-
-    return nav
+
+def _parse_quiz_entry(quiz_file):
+    """导航条目：测试题"""
+    return {
+        'file': str(quiz_file.relative_to(BASE_DIR)),
+        'title': extract_quiz_title(quiz_file),
+        'count': count_questions(quiz_file)
+    }
+
+
+nav_index = NavigationIndex()
+
+
+@profiler.timed('build_navigation')
+def build_navigation():
+    """构建动态导航树（经由导航索引增量刷新）"""
+    return nav_index.build()
 
 
 def extract_phase_name(phase_dir):
@@ -105,9 +318,10 @@ def extract_phase_name(phase_dir):
     return name
 
 
-def extract_title(md_file):
-    """从 Markdown 文件提取标题"""
-    content = md_file.read_text(encoding='utf-8')
+def extract_title(md_file, content=None):
+    """从 Markdown 文件提取标题（已读取的内容可通过 content 传入）"""
+    if content is None:
+        content = md_file.read_text(encoding='utf-8')
     # 查找第一个一级标题
     match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
     if match:
@@ -117,7 +331,6 @@ def extract_title(md_file):
 
 def extract_quiz_title(quiz_file):
     """从测试题文件提取标题"""
-    content = quiz_file.read_text(encoding='utf-8')
     # 查找标题（通常是文件名的友好格式）
     stem = quiz_file.stem
     # 05_quiz_set1_basics -> 基础知识强化（第1套）
@@ -132,213 +345,552 @@ def extract_quiz_title(quiz_file):
 def count_questions(quiz_file):
     """统计题目数量
 
-    使用与 parse_quiz() 相同的灵活匹配模式，支持：
+    与 parse_quiz() 共用同一个扫描器，支持：
     - ### 题目1：
     - ### 问题1：
     - ### Question 1:
     - ### [类型:choice] 题目1：
     """
-    content = quiz_file.read_text(encoding='utf-8')
-    # 移除总结和答案汇总部分，避免误匹配
-    content_only = re.split(r'##+\s*(?:正确答案汇总|测试总结|自我评估|完成时间)', content, flags=re.IGNORECASE)[0]
-    # 匹配所有格式的题目标题（与 parse_quiz 一致）
-    questions = re.findall(
-        r'###\s*(?:\[类型:\w+\])?\s*(?:题目|Question|问题)\s*\d+[:：]?\s*',
-        content_only,
-        re.IGNORECASE
-    )
-    return len(questions)
+    with quiz_file.open('r', encoding='utf-8') as f:
+        return count_questions_stream(f)
 
 
+@profiler.timed('parse_quiz')
 def parse_quiz(quiz_path):
     """解析测试题文件，提取题目、选项、答案和解析
 
+    结果缓存在 quiz_cache 中，文件修改后自动重新解析。
+    返回值在多个请求间共享，调用方不要修改。
+    """
+    return quiz_cache.get(BASE_DIR / quiz_path)
+
+
+def _parse_quiz_file(full_path):
+    """解析测试题文件（不走缓存），单遍流式读取
+
     支持的题型：
     - choice: 选择题（A/B/C/D选项）
     - open: 开放性问题（文本答案）
+
+    answer_key 是编译好的答案（grading.AnswerKey），public_questions 是可以发给浏览器的题目，
+    都随解析结果一起缓存
     """
-    full_path = BASE_DIR / quiz_path
-    content = full_path.read_text(encoding='utf-8')
-
-    questions = []
-
-    # 先移除总结部分和答案汇总部分
-    content_only = re.split(r'##+\s*(?:正确答案汇总|测试总结|自我评估|完成时间)', content, flags=re.IGNORECASE)[0]
-
-    # 提取题目块（支持 ### 题目、### 问题、### Question，带题型标记）
-    # 格式：### [类型:choice] 题目1：xxx
-    # 使用 findall 找到所有题目位置，然后提取题目内容
-    question_pattern = r'###\s*(?:\[类型:(\w+)\])?\s*(?:题目|Question|问题)\s*\d+[:：]?\s*'
-
-    # 找到所有匹配的题目标记及其位置
-    matches = list(re.finditer(question_pattern, content_only, re.IGNORECASE))
-
-    # 提取每个题目标记之后的内容块（直到下一个题目或文件结束）
-    question_blocks = []
-    for i, match in enumerate(matches):
-        start = match.end()
-        # 下一个题目的开始位置，或文件末尾
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(content_only)
-        block = content_only[start:end]
-        question_blocks.append(block)
-
-    for idx, block in enumerate(question_blocks, 1):
-
-        lines = block.strip().split('\n')
-
-        # 检测题型（从第一行的类型标记或自动推断）
-        question_type = None
-        question_text = None
-        options = {}
-        correct_answer = None
-        explanation = None
-
-        # 检查是否有类型标记
-        if lines and lines[0].strip():
-            first_line = lines[0].strip()
-            type_match = re.match(r'^\[类型:(\w+)\]', first_line)
-            if type_match:
-                question_type = type_match.group(1)
-                lines = lines[1:]  # 跳过类型标记行
-            elif first_line.startswith('[类型:'):
-                # 类型标记单独一行
-                question_type = re.search(r'(\w+)', first_line).group(1)
-                lines = lines[1:]
-
-        # 查找题目文本（第一行非空、非选项、非答案标记的行）
-        for line in lines:
-            line_stripped = line.strip()
-            # 跳过类型标记、答案行、你的答案行等
-            if (line_stripped and
-                not line_stripped.startswith('[') and
-                not any(x in line_stripped for x in ['**正确答案', '**你的答案', '正确答案', '你的答案', '**解析', '解析：'])):
-                # 移除 markdown 加粗标记
-                question_text = line_stripped.replace('**', '').strip()
-                break
-
-        if not question_text:
-            continue
-
-        # 如果没有显式指定题型，自动推断
-        if not question_type:
-            # 扫描是否有选项（A. B. C. D. 开头）
-            has_options = False
-            for line in lines:
-                if re.match(r'^[A-D]\.\s*(?!.*___)', line.strip()):
-                    has_options = True
-                    break
-            question_type = 'choice' if has_options else 'open'
-
-        # 解析选项（仅选择题）
-        if question_type == 'choice':
-            for line in lines:
-                line_stripped = line.strip()
-                # 匹配选项：A. 文本（排除"你的答案：___A"格式）
-                match = re.match(r'^([A-D])\.\s*(.+)', line_stripped)
-                if match:
-                    letter = match.group(1)
-                    text = match.group(2)
-                    # 跳过"你的答案：___A"这种格式
-                    if not text.startswith('___') and not text.startswith('**你的答案'):
-                        options[letter] = text
-
-        # 解析正确答案和解析
-        answer_section = []
-        in_answer_section = False
-        for line in lines:
-            line_stripped = line.strip()
-
-            # 检测进入答案解析区
-            if any(x in line_stripped for x in ['**正确答案', '正确答案：', '正确答案:']):
-                in_answer_section = True
-                answer_section.append(line_stripped)
-                continue
-
-            if in_answer_section:
-                # 收集答案解析内容，直到下一个题目或结束
-                if line_stripped.startswith('**你的掌握情况') or line_stripped.startswith('你的掌握情况'):
-                    break
-                answer_section.append(line_stripped)
-
-        # 从答案区提取正确答案
-        answer_text = ' '.join(answer_section)
-        if question_type == 'choice':
-            # 提取字母答案
-            answer_match = re.search(r'[A-D]', answer_text)
-            if answer_match:
-                correct_answer = answer_match.group(0)
-
-        # 构建解析文本
-        if answer_section:
-            # 移除标记，保留纯文本
-            explanation_lines = []
-            for al in answer_section:
-                # 移除各种标记
-                clean_line = al.replace('**正确答案**', '').replace('**解析**', '')
-                clean_line = re.sub(r'^\*\*正确答案\*\*[:：]\s*', '', clean_line)
-                clean_line = clean_line.replace('👆', '').strip()
-                if clean_line and len(clean_line) > 1:  # 过滤单字符
-                    explanation_lines.append(clean_line)
-
-            if explanation_lines:
-                explanation = '\n'.join(explanation_lines[:5])  # 限制长度
-
-        # 添加题目
-        questions.append({
-            'id': f'q{idx}',
-            'number': idx,
-            'type': question_type,
-            'text': question_text,
-            'options': options if question_type == 'choice' else {},
-            'correct_answer': correct_answer,
-            'explanation': explanation or ''
-        })
+    with full_path.open('r', encoding='utf-8') as f:
+        parsed = parse_quiz_stream(f)
+
+    return {
+        'title': extract_quiz_title(full_path),
+        'questions': parsed['questions'],
+        'answers': parsed['answers'],
+        'explanations': parsed['explanations'],
+        'count': parsed['count'],
+        'answer_key': AnswerKey(parsed['questions'], parsed['answers']),
+        'public_questions': [public_question(q) for q in parsed['questions']]
+    }
+
+
+def public_question(question):
+    """题目中可以提前发给浏览器的部分
 
-    # 构建返回数据
-    answers = {}
-    explanations = {}
+    选择题不含正确答案和解析（提交后由 /api/submit 返回）；
+    开放题保留参考答案，供“查看答案”按钮展示。
+    """
+    data = {
+        'id': question['id'],
+        'number': question['number'],
+        'type': question['type'],
+        'text': question['text']
+    }
+    if question['type'] == 'choice':
+        data['options'] = question['options']
+    else:
+        data['explanation'] = question['explanation']
+    return data
 
-    for q in questions:
-        if q['correct_answer']:
-            answers[q['id']] = q['correct_answer']
-        if q['explanation']:
-            explanations[q['id']] = q['explanation']
 
+def question_page(quiz_data, offset, limit):
+    """一页题目（offset 从 0 开始）"""
+    questions = quiz_data['public_questions']
+    end = offset + limit
     return {
-        'title': extract_quiz_title(full_path),
-        'questions': questions,
-        'answers': answers,
-        'explanations': explanations
+        'title': quiz_data['title'],
+        'total': len(questions),
+        'offset': offset,
+        'limit': limit,
+        'questions': questions[offset:end],
+        'next_offset': end if end < len(questions) else None
     }
 
 
+quiz_cache = FileLRUCache(_parse_quiz_file, app.config['QUIZ_CACHE_MAX_BYTES'])
+
+
+answer_store = create_answer_store(
+    app.config['ANSWER_STORE'],
+    ANSWERS_FILE,
+    ANSWERS_DB,
+    compact_every=app.config['ANSWERS_COMPACT_EVERY']
+)
+atexit.register(answer_store.compact)
+
+quiz_stats = QuizStats(QUIZ_STATS_DB)
+if quiz_stats.created:
+    # 新建的统计库：按已保存的答案初始化一次，之后都是增量更新
+    quiz_stats.rebuild(answer_store.iter_answers())
+
+@profiler.timed('load_answers')
 def load_answers():
-    """加载已保存的答案"""
-    if ANSWERS_FILE.exists():
-        return json.loads(ANSWERS_FILE.read_text(encoding='utf-8'))
-    return {'last_updated': None, 'quizzes': {}}
-
-
-def save_answers(answers):
-    """保存答案到文件"""
-    ANSWERS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    ANSWERS_FILE.write_text(
-        json.dumps(answers, indent=2, ensure_ascii=False),
-        encoding='utf-8'
-    )
+    """加载已保存的答案（answers.json 格式）"""
+    return answer_store.export()
+
+
+@profiler.timed('load_answers')
+def load_quiz_answers(quiz_file, user):
+    """某个用户在一套测试题上已保存的答案"""
+    return answer_store.get_quiz_answers(quiz_file, user=user)
+
+
+def save_user_answers(entries, user=DEFAULT_USER):
+    """保存一批答案 [(quiz_file, question_id, answer), ...] 并增量更新统计，返回保存时间"""
+    return answer_store.save_and_record(entries, quiz_stats, user=user)
+
+
+def after_fork():
+    """fork 出的子进程（prefork worker）中重建数据库连接"""
+    answer_store.after_fork()
+    quiz_stats.after_fork()
+
+
+def current_user():
+    """当前用户（请求头 X-User，未提供时为默认用户）"""
+    return request.headers.get('X-User') or DEFAULT_USER
+
+
+# fenced_code 输出的代码块：<pre><code class="language-xxx">...</code></pre>
+CODE_BLOCK_PATTERN = re.compile(r'<pre><code class="language-([\w+#.-]+)">(.*?)</code></pre>', re.DOTALL)
+
+# 所有代码块共用一个 formatter；wrapcode 保留 <pre><code> 结构以沿用现有样式
+HIGHLIGHT_FORMATTER = HtmlFormatter(cssclass='highlight', wrapcode=True)
+
+_highlight_cache = OrderedDict()  # (语言, 代码哈希) -> 高亮后的 HTML
+_highlight_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=64)
+def get_lexer(language):
+    """按语言名取 lexer（带缓存），不支持的语言返回 None"""
+    try:
+        return get_lexer_by_name(language)
+    except ClassNotFound:
+        return None
+
+
+def highlight_code_block(language, code):
+    """高亮单个代码块，结果按 (语言, 代码哈希) 缓存"""
+    key = (language, hashlib.sha1(code.encode('utf-8')).hexdigest())
+
+    with _highlight_lock:
+        cached = _highlight_cache.get(key)
+        if cached is not None:
+            _highlight_cache.move_to_end(key)
+            return cached
+
+    lexer = get_lexer(language)
+    if lexer is None:
+        return None
+    result = highlight(code, lexer, HIGHLIGHT_FORMATTER)
+
+    with _highlight_lock:
+        _highlight_cache[key] = result
+        while len(_highlight_cache) > app.config['HIGHLIGHT_CACHE_SIZE']:
+            _highlight_cache.popitem(last=False)
+    return result
+
+
+def _highlight_match(match):
+    code = html_lib.unescape(match.group(2))
+    highlighted = highlight_code_block(match.group(1).lower(), code)
+    return highlighted if highlighted is not None else match.group(0)
+
 
+@profiler.timed('render_markdown')
+def render_markdown(md_content, highlight_code=None):
+    """将 Markdown 转换为 HTML（带代码高亮）
 
-def render_markdown(md_content):
-    """将 Markdown 转换为 HTML（带代码高亮）"""
+    highlight_code 为 None 时按 SERVER_HIGHLIGHT 配置决定是否在服务端高亮。
+    """
     # 转换 Markdown
     html = markdown.markdown(md_content, extensions=['fenced_code', 'tables'])
 
-    # 代码高亮处理（简单版本）
-    # 更复杂的处理在前端 JS 中完成
+    if highlight_code is None:
+        highlight_code = app.config['SERVER_HIGHLIGHT']
+
+    # 带语言标记的代码块用 Pygments 高亮
+    if highlight_code:
+        html = CODE_BLOCK_PATTERN.sub(_highlight_match, html)
 
     return html
 
 
+@functools.lru_cache(maxsize=1)
+def pygments_stylesheet():
+    """代码高亮样式表（浅色/深色主题各一套，只生成一次）"""
+    light = HtmlFormatter(style='default', nobackground=True)
+    dark = HtmlFormatter(style='monokai', nobackground=True)
+    return '\n'.join(
+        light.get_token_style_defs('body[data-theme="light"] .highlight')
+        + dark.get_token_style_defs('body[data-theme="dark"] .highlight')
+    )
+
+
+def _render_lecture_file(full_path):
+    """读取并渲染讲义（不走缓存），只读一次文件"""
+    raw = full_path.read_bytes()
+    content = raw.decode('utf-8')
+    return {
+        'title': extract_title(full_path, content),
+        'html': render_markdown(content),
+        'content_hash': hashlib.sha256(raw).hexdigest(),
+        'mtime': full_path.stat().st_mtime
+    }
+
+
+lecture_cache = FileLRUCache(_render_lecture_file, app.config['LECTURE_CACHE_MAX_BYTES'])
+
+
+def _templates_fingerprint():
+    """模板文件的内容哈希（模板修改后页面 ETag 随之变化）"""
+    digest = hashlib.sha256()
+    latest = 0
+    for template in sorted(Path(app.root_path, app.template_folder).glob('*.html')):
+        digest.update(template.read_bytes())
+        latest = max(latest, template.stat().st_mtime)
+    return digest.hexdigest(), latest
+
+
+TEMPLATES_HASH, TEMPLATES_MTIME = _templates_fingerprint()
+
+
+asset_manifest = AssetManifest(app.static_folder)
+
+
+@app.template_global()
+def asset_url(filename):
+    """静态资源地址：已构建时返回带内容指纹的地址（python app.py assets），否则返回原文件地址"""
+    return url_for('static', filename=asset_manifest.lookup(filename) or filename)
+
+
+def warm_lecture_cache():
+    """预先渲染导航中的所有讲义"""
+    for phase_group in build_navigation()['lectures']:
+        for item in phase_group['items']:
+            lecture_cache.get(BASE_DIR / item['file'])
+
+
+# ==================== 全文搜索 ====================
+
+MARKDOWN_LINK_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+MARKDOWN_PREFIX_PATTERN = re.compile(r'^\s*(?:#{1,6}|>|[-*+]|\d+\.|```\w*)\s*', re.MULTILINE)
+MARKDOWN_MARK_PATTERN = re.compile(r'[*`|]+')
+
+
+def markdown_to_text(content):
+    """去掉 Markdown 标记，得到用于搜索和摘要的纯文本"""
+    text = MARKDOWN_LINK_PATTERN.sub(r'\1', content)
+    text = MARKDOWN_PREFIX_PATTERN.sub('', text)
+    text = MARKDOWN_MARK_PATTERN.sub(' ', text)
+    return ' '.join(text.split())
+
+
+def _lecture_documents(md_file):
+    """搜索文档：一篇讲义一个文档"""
+    content = md_file.read_text(encoding='utf-8')
+    return [{
+        'kind': 'lecture',
+        'title': extract_title(md_file, content),
+        'url': f"/lecture/{md_file.relative_to(BASE_DIR).as_posix()}",
+        'text': markdown_to_text(content)
+    }]
+
+
+def _quiz_documents(quiz_file):
+    """搜索文档：一道题一个文档（题目、选项和解析）"""
+    quiz_data = quiz_cache.get(quiz_file)
+    relative = quiz_file.relative_to(BASE_DIR).as_posix()
+    documents = []
+    for position, q in enumerate(quiz_data['questions'], start=1):
+        parts = [q['text']]
+        parts.extend(f"{letter}. {text}" for letter, text in q.get('options', {}).items())
+        parts.append(q.get('explanation', ''))
+        documents.append({
+            'kind': 'quiz',
+            'title': f"{quiz_data['title']} · 第 {q['number']} 题",
+            'url': f"/quiz/{relative}/all#question-{position}",
+            'text': markdown_to_text('\n'.join(parts))
+        })
+    return documents
+
+
+# 内容文件（相对 BASE_DIR 的 glob 模式，不支持 **）：搜索索引的范围，也是内容监听的范围
+CONTENT_PATTERNS = ('docs/*.md', 'docs/phase*/*.md', 'examples/phase*/quizzes/*.md')
+
+
+def _document_loader(path):
+    return _lecture_documents if DOCS_DIR in Path(path).parents else _quiz_documents
+
+
+def _search_sources():
+    """参与搜索的文件：与内容监听的范围（CONTENT_PATTERNS）相同，保证索引中的文件变化后都能刷新"""
+    files = [path for pattern in CONTENT_PATTERNS for path in BASE_DIR.glob(pattern) if path.is_file()]
+    return {path: _document_loader(path) for path in files}
+
+
+search_index = SearchIndex(_search_sources, sync_interval=app.config['SEARCH_SYNC_INTERVAL'])
+
+
+# ==================== 内容监听 ====================
+
+content_watcher = None
+
+
+def on_content_change(path, event):
+    """内容文件变化：失效该文件的测试题 / 讲义缓存，更新导航条目和搜索索引"""
+    quiz_cache.invalidate(path)
+    lecture_cache.invalidate(path)
+    nav_index.refresh(path)
+    if search_index.built:
+        search_index.refresh(path, _document_loader(path))
+
+
+def set_cache_validation(enabled):
+    """是否在每次取缓存时 stat 文件检查变化（有内容监听时可以关闭）"""
+    nav_index.validate = enabled
+    quiz_cache.validate = enabled
+    lecture_cache.validate = enabled
+    search_index.validate = enabled
+
+
+def create_content_watcher(on_change=on_content_change):
+    """按 CONTENT_WATCHER 配置创建内容监听器（未启动），配置为 off 时返回 None"""
+    backend = app.config['CONTENT_WATCHER']
+    if backend == 'off':
+        return None
+    return create_watcher(backend, BASE_DIR, CONTENT_PATTERNS, on_change,
+                          interval=app.config['CONTENT_POLL_INTERVAL'])
+
+
+def start_content_watcher():
+    """启动内容监听，之后缓存不再逐请求 stat 文件"""
+    global content_watcher
+    if content_watcher is None:
+        content_watcher = create_content_watcher()
+        if content_watcher is not None:
+            content_watcher.start()
+            set_cache_validation(False)
+    return content_watcher
+
+
+def stop_content_watcher():
+    global content_watcher
+    if content_watcher is not None:
+        content_watcher.stop()
+        content_watcher = None
+        set_cache_validation(True)
+
+
+# ==================== 答题 ====================
+# Flask 路由和 ASGI 入口（asgi.py）共用
+
+def valid_answer_entry(quiz_file, question_id, answer):
+    """测试题路径、题目 id 和答案都必须是非空字符串（答案存储只保存文本）"""
+    return all(isinstance(value, str) and value for value in (quiz_file, question_id, answer))
+
+
+def parse_batch_entries(data):
+    """校验批量保存的请求体，返回 [(quiz_file, question_id, answer), ...]，不合法时返回 None"""
+    items = data.get('answers') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None
+
+    entries = []
+    for item in items:
+        if not isinstance(item, dict):
+            return None
+        quiz_file = item.get('quiz_file')
+        question_id = item.get('question_id')
+        answer = item.get('answer')
+        if not valid_answer_entry(quiz_file, question_id, answer):
+            return None
+        entries.append((quiz_file, question_id, answer))
+    return entries
+
+
+def grade_submission(quiz_data, user_answers):
+    """对比答案，返回 {'results': [...], 'score': {...}}
+
+    对错由编译好的答案一次算出（选择题才判断对错）
+    """
+    correct = quiz_data['answer_key'].grade_one(user_answers)
+    correct_count = int(correct.sum())
+    results = []
+
+    for q, is_correct in zip(quiz_data['questions'], correct.tolist()):
+        q_id = q['id']
+        user_answer = user_answers.get(q_id)
+        correct_answer = quiz_data['answers'].get(q_id)
+
+        results.append({
+            'id': q_id,
+            'number': q['number'],
+            'type': q.get('type', 'choice'),
+            'text': q['text'],
+            'options': q.get('options', {}),
+            'user_answer': user_answer,
+            'correct_answer': correct_answer,
+            'is_correct': is_correct,
+            'explanation': q.get('explanation', '')
+        })
+
+    total = len(results)
+    score = {
+        'correct': correct_count,
+        'total': total,
+        'percentage': percentage(correct_count, total)
+    }
+
+    return {
+        'results': results,
+        'score': score
+    }
+
+
+# ==================== 页面渲染 ====================
+# 路由和静态导出（export.py）共用
+
+def stream_page(template_name, **context):
+    """流式渲染模板，返回 HTML 片段的生成器
+
+    页头、导航栏和正文开头渲染出来就先发给浏览器，不等整页渲染完；
+    Jinja 逐段输出的小片段攒够 STREAM_FLUSH_SIZE 个字符再发送一次。
+    """
+    chunks = stream_template(template_name, **context)
+    flush_size = app.config['STREAM_FLUSH_SIZE']
+
+    def generate():
+        buffer = []
+        size = 0
+        for chunk in chunks:
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= flush_size:
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer)
+    return generate()
+
+
+def render_lecture_page(filepath, render=render_template):
+    """渲染讲义页面（render=stream_page 时返回流式生成器）"""
+    rendered = lecture_cache.get(BASE_DIR / filepath)
+    return render('lecture.html',
+                  title=rendered['title'],
+                  content=rendered['html'],
+                  nav=build_navigation(),
+                  current_file=filepath)
+
+
+def lecture_validators(filepath):
+    """讲义页面的 (ETag, Last-Modified)
+
+    ETag 作为弱 ETag 发送：同一版本的页面可能压缩也可能不压缩，字节不同但内容相同。
+    页面由讲义内容、导航树、模板和静态资源指纹共同决定，都没变时可以返回 304。
+    """
+    rendered = lecture_cache.get(BASE_DIR / filepath)
+    build_navigation()
+
+    etag = hashlib.sha256(
+        f"{rendered['content_hash']}:{nav_index.signature}:{TEMPLATES_HASH}:{asset_manifest.digest}".encode('utf-8')
+    ).hexdigest()
+    last_modified = datetime.fromtimestamp(
+        int(max(rendered['mtime'], nav_index.last_modified, TEMPLATES_MTIME)), timezone.utc
+    )
+    return etag, last_modified
+
+
+def render_quiz_page(filepath, template, saved_answers, render=render_template, page_size=None):
+    """渲染测试题页面（quiz_single.html / quiz_all.html）
+
+    page_size：一题一页模式首屏只渲染这么多题，其余由 quiz.js 分页加载；None 表示全部渲染
+    """
+    quiz_data = parse_quiz(filepath)
+    nav = build_navigation()
+
+    return render(template,
+                  quiz_file=filepath,
+                  quiz=quiz_data,
+                  initial_questions=quiz_data['questions'][:page_size],
+                  page_size=page_size or len(quiz_data['questions']),
+                  saved_answers=saved_answers,
+                  nav=nav)
+
+
+# ==================== 性能分析 ====================
+
+if profiler.enabled:
+    before_render_template.connect(profiler.template_started, app)
+    template_rendered.connect(profiler.template_finished, app)
+
+
+@app.before_request
+def start_profile():
+    g.profile = profiler.start(request.endpoint or 'not_found', request.method, request.path)
+
+
+@app.after_request
+def finish_profile(response):
+    """加上 Server-Timing 响应头，响应发送完毕后记入统计（流式响应包含发送时间）"""
+    profile = g.get('profile')
+    if profile is not None:
+        response.headers['Server-Timing'] = profile.server_timing()
+        response.call_on_close(lambda: profiler.finish(profile, response.status_code))
+    return response
+
+
+# ==================== 响应压缩 ====================
+
+@app.after_request
+def compress_response(response):
+    """按 Accept-Encoding 压缩文本类响应（流式响应逐块压缩）"""
+    if not app.config['RESPONSE_COMPRESSION'] or response.direct_passthrough \
+            or 'Content-Encoding' in response.headers \
+            or response.status_code < 200 or response.status_code in (204, 304):
+        return response
+
+    size = None if response.is_streamed else response.calculate_content_length()
+    if not is_compressible(response.mimetype) or (size is not None and size < app.config['COMPRESS_MIN_SIZE']):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+
+    # 压缩后的字节与原文不同，强 ETag 改为弱 ETag（条件请求仍按弱比较命中）
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
 # ==================== 路由 ====================
 
 @app.route('/')
@@ -356,17 +908,19 @@ def lecture(filepath):
     if not full_path.exists():
         return "文件不存在", 404
 
-    content = full_path.read_text(encoding='utf-8')
-    title = extract_title(full_path)
-    html_content = render_markdown(content)
+    etag, last_modified = lecture_validators(filepath)
 
-    nav = build_navigation()
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = make_response('', 304)
+    else:
+        response = make_response(render_lecture_page(filepath, render=stream_page))
 
-    return render_template('lecture.html',
-                          title=title,
-                          content=html_content,
-                          nav=nav,
-                          current_file=filepath)
+    # 压缩后的 200 带弱 ETag，304 也必须用同一个弱 ETag，否则缓存会把两者当成不同的版本
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    # 允许缓存，但每次使用前都要向服务器确认
+    response.cache_control.no_cache = True
+    return response
 
 
 @app.route('/quizzes')
@@ -384,19 +938,11 @@ def quiz(filepath):
     if not full_path.exists():
         return "文件不存在", 404
 
-    quiz_data = parse_quiz(filepath)
-
     # 加载已保存的答案
-    answers_data = load_answers()
-    saved_answers = answers_data.get('quizzes', {}).get(filepath, {}).get('answers', {})
+    saved_answers = load_quiz_answers(filepath, current_user())
 
-    nav = build_navigation()
-
-    return render_template('quiz_single.html',
-                          quiz_file=filepath,
-                          quiz=quiz_data,
-                          saved_answers=saved_answers,
-                          nav=nav)
+    return render_quiz_page(filepath, 'quiz_single.html', saved_answers,
+                            page_size=app.config['QUIZ_PAGE_SIZE'])
 
 
 @app.route('/quiz/<path:filepath>/all')
@@ -407,19 +953,11 @@ def quiz_all(filepath):
     if not full_path.exists():
         return "文件不存在", 404
 
-    quiz_data = parse_quiz(filepath)
-
     # 加载已保存的答案
-    answers_data = load_answers()
-    saved_answers = answers_data.get('quizzes', {}).get(filepath, {}).get('answers', {})
+    saved_answers = load_quiz_answers(filepath, current_user())
 
-    nav = build_navigation()
-
-    return render_template('quiz_all.html',
-                          quiz_file=filepath,
-                          quiz=quiz_data,
-                          saved_answers=saved_answers,
-                          nav=nav)
+    # 题目多时页面很大，流式发送，先到的题目先显示
+    return render_quiz_page(filepath, 'quiz_all.html', saved_answers, render=stream_page)
 
 
 # ==================== API ====================
@@ -430,39 +968,96 @@ def api_navigation():
     return jsonify(build_navigation())
 
 
+@app.route('/api/cache/stats')
+def api_cache_stats():
+    """各级缓存的命中统计"""
+    return jsonify({
+        'navigation': nav_index.stats(),
+        'quizzes': quiz_cache.stats(),
+        'lectures': lecture_cache.stats(),
+        'highlight': {
+            'blocks': len(_highlight_cache),
+            'lexers': get_lexer.cache_info()._asdict()
+        },
+        'answers': answer_store.stats(),
+        'search': search_index.stats(),
+        'assets': asset_manifest.stats(),
+        'watcher': content_watcher.stats() if content_watcher else None
+    })
+
+
+@app.route('/api/search')
+def api_search():
+    """全文搜索：q 为查询词，kind 可限定 lecture / quiz"""
+    query = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    kind = request.args.get('kind') or None
+
+    if not query:
+        return jsonify({'query': '', 'total': 0, 'results': [], 'took_ms': 0})
+
+    return jsonify(search_index.search(query, limit=limit, kind=kind))
+
+
+@app.route('/api/quiz/<path:quiz_file>/questions')
+def api_quiz_questions(quiz_file):
+    """分页获取题目（不含选择题答案）：offset 从 0 开始，limit 默认 QUIZ_PAGE_SIZE，最大 50"""
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', app.config['QUIZ_PAGE_SIZE'], type=int), 1), 50)
+    try:
+        quiz_data = parse_quiz(quiz_file)
+    except FileNotFoundError:
+        return jsonify({'error': '文件不存在'}), 404
+
+    return jsonify(question_page(quiz_data, offset, limit))
+
+
 @app.route('/api/answers/<path:filepath>')
 def api_get_answers(filepath):
     """获取某套测试题的已保存答案"""
-    answers_data = load_answers()
-    saved = answers_data.get('quizzes', {}).get(filepath, {}).get('answers', {})
-    return jsonify(saved)
+    return jsonify(load_quiz_answers(filepath, current_user()))
+
+
+@app.route('/api/answers/export')
+def api_export_answers():
+    """导出全部答案（answers.json 格式）"""
+    return jsonify(load_answers())
 
 
 @app.route('/api/save', methods=['POST'])
 def api_save():
     """实时保存单个答案"""
-    data = request.json
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': '缺少必要参数'}), 400
     quiz_file = data.get('quiz_file')
     question_id = data.get('question_id')
     answer = data.get('answer')
 
-    if not all([quiz_file, question_id, answer]):
+    if not valid_answer_entry(quiz_file, question_id, answer):
         return jsonify({'error': '缺少必要参数'}), 400
 
-    # 加载现有答案
-    answers_data = load_answers()
+    saved_at = save_user_answers([(quiz_file, question_id, answer)], user=current_user())
 
-    # 更新答案
-    if quiz_file not in answers_data['quizzes']:
-        answers_data['quizzes'][quiz_file] = {'answers': {}}
+    return jsonify({'status': 'ok', 'saved_at': saved_at})
 
-    answers_data['quizzes'][quiz_file]['answers'][question_id] = answer
-    answers_data['last_updated'] = datetime.now().isoformat()
 
-    # 保存
-    save_answers(answers_data)
+@app.route('/api/save/batch', methods=['POST'])
+def api_save_batch():
+    """批量保存答案（可跨多套测试题），一次请求在一个存储事务中提交
 
-    return jsonify({'status': 'ok', 'saved_at': answers_data['last_updated']})
+    请求体：{"answers": [{"quiz_file": ..., "question_id": ..., "answer": ...}, ...]}
+    """
+    # sendBeacon 发送的请求不一定带 application/json 头
+    data = request.get_json(force=True, silent=True) or {}
+    entries = parse_batch_entries(data)
+
+    if entries is None:
+        return jsonify({'error': '缺少必要参数'}), 400
+
+    saved_at = save_user_answers(entries, user=current_user())
+
+    return jsonify({'status': 'ok', 'saved_at': saved_at, 'count': len(entries)})
 
 
 @app.route('/api/submit', methods=['POST'])
@@ -475,65 +1070,145 @@ def api_submit():
     if not quiz_file:
         return jsonify({'error': '缺少测试题文件'}), 400
 
-    # 解析测试题
+    # 解析测试题（命中缓存时只做答案比较）
     quiz_data = parse_quiz(quiz_file)
+    graded = grade_submission(quiz_data, user_answers)
+    quiz_stats.record_submission(quiz_file, current_user(), graded['score'])
 
-    # 对比答案
-    results = []
-    correct_count = 0
+    return jsonify(graded)
 
-    for q in quiz_data['questions']:
-        q_id = q['id']
-        user_answer = user_answers.get(q_id)
-        correct_answer = quiz_data['answers'].get(q_id)
 
-        # 选择题才判断对错
-        is_correct = False
-        if q.get('type') == 'choice' and correct_answer:
-            is_correct = (user_answer == correct_answer)
-            if is_correct:
-                correct_count += 1
+@app.route('/api/stats/<path:quiz_file>')
+def api_quiz_stats(quiz_file):
+    """测试题统计：每题答题分布、正确率和完成人数"""
+    try:
+        quiz_data = parse_quiz(quiz_file)
+    except FileNotFoundError:
+        return jsonify({'error': '文件不存在'}), 404
 
-        results.append({
-            'id': q_id,
-            'number': q['number'],
-            'type': q.get('type', 'choice'),
-            'text': q['text'],
-            'options': q.get('options', {}),
-            'user_answer': user_answer,
-            'correct_answer': correct_answer,
-            'is_correct': is_correct,
-            'explanation': q.get('explanation', '')
-        })
+    return jsonify(quiz_stats.report(quiz_file, quiz_data))
 
-    total = len(results)
-    score = {
-        'correct': correct_count,
-        'total': total,
-        'percentage': round(correct_count / total * 100, 1) if total > 0 else 0
-    }
 
-    return jsonify({
-        'results': results,
-        'score': score
-    })
+@app.route('/metrics')
+def metrics():
+    """Prometheus 指标（PROFILING=1 时可用）"""
+    if not profiler.enabled:
+        return "未开启性能分析（PROFILING=1）", 404
+    response = make_response(profiler.metrics())
+    response.content_type = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
+
+
+@app.route('/api/profile/slowest')
+def api_profile_slowest():
+    """最慢请求的分段耗时和采样调用栈；format=folded 输出火焰图用的折叠栈"""
+    if not profiler.enabled:
+        return jsonify({'error': '未开启性能分析（PROFILING=1）'}), 404
+    if request.args.get('format') == 'folded':
+        response = make_response(profiler.folded())
+        response.mimetype = 'text/plain'
+        return response
+    return jsonify(profiler.slowest())
 
 
 # ==================== 静态文件 ====================
 
-@app.route('/static/<path:filename>')
+@app.route('/pygments.css')
+def pygments_css():
+    """代码高亮样式表"""
+    response = make_response(pygments_stylesheet())
+    response.mimetype = 'text/css'
+    return response
+
+
 def serve_static(filename):
-    """提供静态文件"""
-    return send_from_directory('static', filename)
+    """提供静态文件（带指纹的文件发送预压缩版本，并允许永久缓存）"""
+    path, headers = asset_manifest.resolve(filename, request.headers.get('Accept-Encoding'))
+    response = send_from_directory('static', path, mimetype=mimetypes.guess_type(filename)[0],
+                                   download_name=Path(filename).name)
+    response.headers.update(headers)
+    return response
+
+
+# /static/<path:filename> 由 Flask 内置的 static 端点匹配，替换它的视图函数，
+# url_for('static', ...) 生成的地址也就由 serve_static 处理
+app.view_functions['static'] = serve_static
 
 
 # ==================== 主程序 ====================
 
-if __name__ == '__main__':
+def serve(args):
+    """启动开发服务器"""
     print("=" * 60)
     print(" LangGraph 学习平台")
-    print(" 访问地址: http://localhost:5000")
+    print(f" 访问地址: http://localhost:{args.port}")
     print(" 按 Ctrl+C 停止服务")
     print("=" * 60)
 
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # 启动时预先构建导航索引、渲染所有讲义并建立搜索索引
+    build_navigation()
+    warm_lecture_cache()
+    search_index.build()
+
+    # debug 模式下由 werkzeug 重载器启动的子进程实际处理请求，只在子进程中监听内容变化
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_content_watcher()
+
+    app.run(debug=True, host=args.host, port=args.port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LangGraph 学习平台")
+    subparsers = parser.add_subparsers(dest='command')
+
+    serve_parser = subparsers.add_parser('serve', help="启动开发服务器（默认）")
+    serve_parser.add_argument('--host', default='0.0.0.0')
+    serve_parser.add_argument('--port', type=int, default=5000)
+
+    prod_parser = subparsers.add_parser('prod', help="启动生产服务器（多进程）")
+    prod_parser.add_argument('--host', default='0.0.0.0')
+    prod_parser.add_argument('--port', type=int, default=5000)
+    prod_parser.add_argument('--workers', type=int, default=app.config['WEB_WORKERS'], help="worker 进程数")
+    prod_parser.add_argument('--timeout', type=float, default=app.config['WEB_TIMEOUT'],
+                             help="单个连接的读写超时（秒）")
+    prod_parser.add_argument('--graceful-timeout', type=float, default=app.config['WEB_GRACEFUL_TIMEOUT'],
+                             help="平滑重启/停止时等待请求完成的时间（秒）")
+    prod_parser.add_argument('--reload-interval', type=float, default=app.config['WEB_RELOAD_INTERVAL'],
+                             help="检查内容变化的间隔（秒），0 表示只在收到 SIGHUP 时重启")
+
+    regrade_parser = subparsers.add_parser('regrade', help="用当前答案为已保存的作答重新评分")
+    regrade_parser.add_argument('--quiz', help="只重新评分这套测试题（相对项目根目录的路径）")
+    regrade_parser.add_argument('--out', help="完整报告输出路径（JSON）")
+
+    assets_parser = subparsers.add_parser('assets', help="构建静态资源（压缩、内容指纹、预压缩）")
+    assets_parser.add_argument('--force', action='store_true', help="忽略已有构建结果，全部重新构建")
+
+    export_parser = subparsers.add_parser('export', help="导出静态站点")
+    export_parser.add_argument('--out', default=str(BASE_DIR / 'dist'), help="输出目录")
+    export_parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="并行进程数")
+    export_parser.add_argument('--force', action='store_true', help="忽略增量记录，全部重新生成")
+
+    args = parser.parse_args()
+
+    if args.command == 'prod':
+        import prefork
+        prefork.serve(args)
+    elif args.command == 'regrade':
+        import regrade
+        regrade.regrade(quiz_file=args.quiz, out=args.out)
+    elif args.command == 'assets':
+        import assets
+        assets.build(app.static_folder, force=args.force, verbose=True)
+    elif args.command == 'export':
+        import export
+        export.export_site(Path(args.out), jobs=args.jobs, force=args.force)
+    else:
+        if args.command is None:
+            args = serve_parser.parse_args([])
+        serve(args)
+
+
+if __name__ == '__main__':
+    # 以脚本运行时，让 export、prefork 等模块 import app 得到的就是当前模块
+    sys.modules.setdefault('app', sys.modules[__name__])
+    main()
@@ -0,0 +1,449 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - ASGI 入口
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：以 ASGI 方式提供与 app.py 相同的页面和 JSON API
+
+与 Flask 版本（app.py）共用缓存、解析、渲染和答案存储，区别在于：
+    - 事件循环不直接做任何阻塞 I/O：读文件、解析、渲染、答案存储
+      都交给一个有上限的线程池（ASGI_IO_THREADS，默认 32）
+    - 同一套测试题的并发解析会合并为一次（一批提交只等同一个解析结果）
+    - 并发连接数不再受“一个请求一个线程”的限制
+
+运行方式：
+    cd web
+    uvicorn asgi:app --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+import contextvars
+import json
+import mimetypes
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from werkzeug.http import http_date, is_resource_modified
+from werkzeug.security import safe_join
+
+import app as webapp
+from compression import choose_encoding, compress, is_compressible
+
+
+# 阻塞 I/O 线程池大小
+IO_THREADS = int(os.environ.get('ASGI_IO_THREADS', 32))
+# 请求体大小上限（字节）
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class HTTPError(Exception):
+    """直接转换为错误响应的异常"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    """一次 HTTP 请求（只包含本应用用到的部分）"""
+
+    def __init__(self, scope, body):
+        self.method = scope['method']
+        # ASGI 服务器传入的 path 已经百分号解码，不能再解码一次
+        self.path = scope['path']
+        self.query = {
+            name: values[-1]
+            for name, values in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()
+        }
+        self.headers = {
+            name.decode('latin-1').lower(): value.decode('latin-1')
+            for name, value in scope['headers']
+        }
+        self.body = body
+
+    def json(self):
+        try:
+            return json.loads(self.body or b'null')
+        except ValueError:
+            raise HTTPError(400, '请求体不是合法的 JSON')
+
+    @property
+    def user(self):
+        return self.headers.get('x-user') or webapp.DEFAULT_USER
+
+
+class Response:
+    def __init__(self, body=b'', status=200, content_type='text/html; charset=utf-8', headers=None):
+        self.body = body.encode('utf-8') if isinstance(body, str) else body
+        self.status = status
+        self.headers = {'content-type': content_type}
+        self.headers.update(headers or {})
+
+
+def json_response(data, status=200):
+    # 与 Flask 的 jsonify 使用同一个序列化器，输出保持一致
+    return Response(webapp.app.json.dumps(data), status, 'application/json')
+
+
+class LearningPlatformASGI:
+    """ASGI 应用"""
+
+    def __init__(self, io_threads=IO_THREADS):
+        self.executor = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix='asgi-io')
+        self._inflight = {}  # 合并中的任务：key -> Future
+        self.routes = [
+            ('GET', r'/', self.index),
+            ('GET', r'/quizzes', self.quiz_list),
+            ('GET', r'/lecture/(?P<filepath>.+)', self.lecture),
+            ('GET', r'/quiz/(?P<filepath>.+)/all', self.quiz_all),
+            ('GET', r'/quiz/(?P<filepath>.+)', self.quiz),
+            ('GET', r'/api/navigation', self.api_navigation),
+            ('GET', r'/api/cache/stats', self.api_cache_stats),
+            ('GET', r'/api/search', self.api_search),
+            ('GET', r'/api/quiz/(?P<quiz_file>.+)/questions', self.api_quiz_questions),
+            ('GET', r'/api/answers/export', self.api_export_answers),
+            ('GET', r'/api/answers/(?P<filepath>.+)', self.api_get_answers),
+            ('POST', r'/api/save', self.api_save),
+            ('POST', r'/api/save/batch', self.api_save_batch),
+            ('POST', r'/api/submit', self.api_submit),
+            ('GET', r'/api/stats/(?P<quiz_file>.+)', self.api_quiz_stats),
+            ('GET', r'/metrics', self.metrics),
+            ('GET', r'/api/profile/slowest', self.api_profile_slowest),
+            ('GET', r'/pygments\.css', self.pygments_css),
+            ('GET', r'/static/(?P<filename>.+)', self.serve_static),
+        ]
+        self.routes = [(method, re.compile(pattern + '$'), handler)
+                       for method, pattern, handler in self.routes]
+
+    # ==================== 线程池 ====================
+
+    async def run_blocking(self, func, *args):
+        """在线程池中执行阻塞函数（带上当前上下文，性能分析的分段计时记到本请求）"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, context.run, func, *args)
+
+    async def coalesce(self, key, func):
+        """同一个 key 的并发调用只执行一次 func，其余调用等待同一个结果"""
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, contextvars.copy_context().run, func)
+            self._inflight[key] = future
+
+            def cleanup(done):
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            future.add_done_callback(cleanup)
+
+        # shield：某个请求断开不影响其他在等待的请求
+        return await asyncio.shield(future)
+
+    async def parse_quiz(self, quiz_file):
+        return await self.coalesce(('quiz', quiz_file), lambda: webapp.parse_quiz(quiz_file))
+
+    async def render(self, path, func, *args):
+        """在请求上下文中渲染模板（url_for 等需要 Flask 上下文）"""
+        def work():
+            with webapp.app.test_request_context(path):
+                return func(*args)
+        return await self.run_blocking(work)
+
+    async def require_file(self, filepath):
+        exists = await self.run_blocking((webapp.BASE_DIR / filepath).exists)
+        if not exists:
+            raise HTTPError(404, '文件不存在')
+
+    # ==================== 页面 ====================
+
+    async def index(self, request):
+        return Response(await self.render(request.path, lambda: webapp.render_template(
+            'home.html', nav=webapp.build_navigation())))
+
+    async def quiz_list(self, request):
+        return Response(await self.render(request.path, lambda: webapp.render_template(
+            'quiz_list.html', nav=webapp.build_navigation())))
+
+    async def lecture(self, request, filepath):
+        await self.require_file(filepath)
+        etag, last_modified = await self.coalesce(
+            ('lecture', filepath), lambda: webapp.lecture_validators(filepath))
+
+        headers = {
+            'etag': f'W/"{etag}"',
+            'last-modified': http_date(last_modified),
+            'cache-control': 'no-cache'
+        }
+        environ = {
+            'REQUEST_METHOD': request.method,
+            'HTTP_IF_NONE_MATCH': request.headers.get('if-none-match', ''),
+            'HTTP_IF_MODIFIED_SINCE': request.headers.get('if-modified-since', ''),
+        }
+        if not is_resource_modified(environ, etag=etag, last_modified=last_modified):
+            return Response(status=304, headers=headers)
+
+        html = await self.render(request.path, webapp.render_lecture_page, filepath)
+        return Response(html, headers=headers)
+
+    async def _quiz_page(self, request, filepath, template, page_size=None):
+        await self.require_file(filepath)
+        await self.parse_quiz(filepath)
+        saved_answers = await self.run_blocking(
+            webapp.load_quiz_answers, filepath, request.user)
+        return Response(await self.render(
+            request.path, lambda: webapp.render_quiz_page(filepath, template, saved_answers,
+                                                          page_size=page_size)))
+
+    async def quiz(self, request, filepath):
+        return await self._quiz_page(request, filepath, 'quiz_single.html',
+                                     page_size=webapp.app.config['QUIZ_PAGE_SIZE'])
+
+    async def quiz_all(self, request, filepath):
+        return await self._quiz_page(request, filepath, 'quiz_all.html')
+
+    # ==================== API ====================
+
+    async def api_navigation(self, request):
+        return json_response(await self.run_blocking(webapp.build_navigation))
+
+    async def api_cache_stats(self, request):
+        def work():
+            with webapp.app.app_context():
+                return webapp.api_cache_stats().get_json()
+        return json_response(await self.run_blocking(work))
+
+    async def api_search(self, request):
+        query = request.query.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query.get('limit', 10)), 1), 50)
+        except ValueError:
+            limit = 10
+        kind = request.query.get('kind') or None
+
+        if not query:
+            return json_response({'query': '', 'total': 0, 'results': [], 'took_ms': 0})
+        return json_response(await self.run_blocking(webapp.search_index.search, query, limit, kind))
+
+    async def api_quiz_questions(self, request, quiz_file):
+        page_size = webapp.app.config['QUIZ_PAGE_SIZE']
+        try:
+            offset = max(int(request.query.get('offset', 0)), 0)
+        except ValueError:
+            offset = 0
+        try:
+            limit = min(max(int(request.query.get('limit', page_size)), 1), 50)
+        except ValueError:
+            limit = page_size
+
+        try:
+            quiz_data = await self.parse_quiz(quiz_file)
+        except FileNotFoundError:
+            raise HTTPError(404, '文件不存在')
+        return json_response(webapp.question_page(quiz_data, offset, limit))
+
+    async def api_export_answers(self, request):
+        return json_response(await self.run_blocking(webapp.load_answers))
+
+    async def api_get_answers(self, request, filepath):
+        return json_response(await self.run_blocking(
+            webapp.load_quiz_answers, filepath, request.user))
+
+    async def api_save(self, request):
+        data = request.json()
+        if not isinstance(data, dict):
+            raise HTTPError(400, '缺少必要参数')
+        quiz_file = data.get('quiz_file')
+        question_id = data.get('question_id')
+        answer = data.get('answer')
+
+        if not webapp.valid_answer_entry(quiz_file, question_id, answer):
+            raise HTTPError(400, '缺少必要参数')
+
+        saved_at = await self.run_blocking(
+            webapp.save_user_answers, [(quiz_file, question_id, answer)], request.user)
+        return json_response({'status': 'ok', 'saved_at': saved_at})
+
+    async def api_save_batch(self, request):
+        entries = webapp.parse_batch_entries(request.json())
+        if entries is None:
+            raise HTTPError(400, '缺少必要参数')
+
+        saved_at = await self.run_blocking(webapp.save_user_answers, entries, request.user)
+        return json_response({'status': 'ok', 'saved_at': saved_at, 'count': len(entries)})
+
+    async def api_submit(self, request):
+        data = request.json() or {}
+        quiz_file = data.get('quiz_file')
+        user_answers = data.get('answers', {})
+
+        if not quiz_file:
+            raise HTTPError(400, '缺少测试题文件')
+
+        try:
+            quiz_data = await self.parse_quiz(quiz_file)
+        except FileNotFoundError:
+            raise HTTPError(404, '文件不存在')
+        # 评分是纯内存计算，直接在事件循环中完成
+        graded = webapp.grade_submission(quiz_data, user_answers)
+        await self.run_blocking(webapp.quiz_stats.record_submission, quiz_file, request.user, graded['score'])
+        return json_response(graded)
+
+    async def api_quiz_stats(self, request, quiz_file):
+        try:
+            quiz_data = await self.parse_quiz(quiz_file)
+        except FileNotFoundError:
+            raise HTTPError(404, '文件不存在')
+        return json_response(await self.run_blocking(webapp.quiz_stats.report, quiz_file, quiz_data))
+
+    # ==================== 性能分析 ====================
+
+    async def metrics(self, request):
+        if not webapp.profiler.enabled:
+            raise HTTPError(404, '未开启性能分析（PROFILING=1）')
+        return Response(webapp.profiler.metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+    async def api_profile_slowest(self, request):
+        if not webapp.profiler.enabled:
+            raise HTTPError(404, '未开启性能分析（PROFILING=1）')
+        if request.query.get('format') == 'folded':
+            return Response(webapp.profiler.folded(), content_type='text/plain; charset=utf-8')
+        return json_response(webapp.profiler.slowest())
+
+    # ==================== 静态文件 ====================
+
+    async def pygments_css(self, request):
+        return Response(webapp.pygments_stylesheet(), content_type='text/css; charset=utf-8')
+
+    async def serve_static(self, request, filename):
+        # 带指纹的文件按 Accept-Encoding 发送预压缩版本
+        send_name, headers = webapp.asset_manifest.resolve(filename, request.headers.get('accept-encoding'))
+        path = safe_join(webapp.app.static_folder, send_name)
+        if path is None or not await self.run_blocking(os.path.isfile, path):
+            raise HTTPError(404, '文件不存在')
+
+        with_charset = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if with_charset.startswith('text/') or with_charset == 'application/javascript':
+            with_charset += '; charset=utf-8'
+
+        def read():
+            with open(path, 'rb') as f:
+                return f.read()
+        return Response(await self.run_blocking(read), content_type=with_charset,
+                        headers={name.lower(): value for name, value in headers.items()})
+
+    # ==================== ASGI ====================
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        # 请求分散在事件循环和线程池中处理，只做分段计时，不做采样
+        profile = webapp.profiler.start('not_found', scope['method'], scope['path'], sample=False)
+        request = None
+        try:
+            body = await self.read_body(receive)
+            request = Request(scope, body)
+            response = await self.dispatch(request)
+        except HTTPError as e:
+            response = Response(e.message, e.status, 'text/plain; charset=utf-8')
+            if scope['path'].startswith('/api/'):
+                response = json_response({'error': e.message}, e.status)
+        except Exception:
+            webapp.app.logger.exception('ASGI 请求处理失败: %s', scope['path'])
+            response = Response('服务器内部错误', 500, 'text/plain; charset=utf-8')
+
+        response = await self.compress(scope, response)
+        if profile is not None:
+            profile.route = getattr(request, 'route', profile.route)
+            response.headers['server-timing'] = profile.server_timing()
+        await send({
+            'type': 'http.response.start',
+            'status': response.status,
+            'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in response.headers.items()]
+                       + [(b'content-length', str(len(response.body)).encode())],
+        })
+        # HEAD 的 Content-Length 和 Content-Encoding 与 GET 相同，只是不发送响应体
+        await send({'type': 'http.response.body',
+                    'body': b'' if scope['method'] == 'HEAD' else response.body})
+        webapp.profiler.finish(profile, response.status)
+
+    async def compress(self, scope, response):
+        """与 Flask 版本（app.compress_response）相同的响应压缩"""
+        config = webapp.app.config
+        if not config['RESPONSE_COMPRESSION'] or not response.body \
+                or 'content-encoding' in response.headers or response.status in (204, 304):
+            return response
+
+        if not is_compressible(response.headers['content-type']) or len(response.body) < config['COMPRESS_MIN_SIZE']:
+            return response
+
+        response.headers['vary'] = 'Accept-Encoding'
+        accept_encoding = dict(scope['headers']).get(b'accept-encoding', b'').decode('latin-1')
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            return response
+
+        response.body = await self.run_blocking(compress, response.body, encoding)
+        response.headers['content-encoding'] = encoding
+        etag = response.headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            response.headers['etag'] = 'W/' + etag
+        return response
+
+    async def read_body(self, receive):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                raise HTTPError(413, '请求体过大')
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    async def dispatch(self, request):
+        path_matched = False
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if not match:
+                continue
+            path_matched = True
+            if method == request.method or (method == 'GET' and request.method == 'HEAD'):
+                request.route = handler.__name__
+                return await handler(request, **match.groupdict())
+        if path_matched:
+            raise HTTPError(405, '不支持的请求方法')
+        raise HTTPError(404, '页面不存在')
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # 启动时预先构建导航索引、渲染所有讲义并建立搜索索引
+                await self.run_blocking(webapp.build_navigation)
+                await self.run_blocking(webapp.warm_lecture_cache)
+                await self.run_blocking(webapp.search_index.build)
+                await self.run_blocking(webapp.start_content_watcher)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.run_blocking(webapp.stop_content_watcher)
+                await self.run_blocking(webapp.answer_store.compact)
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+app = LearningPlatformASGI()
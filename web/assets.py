@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 静态资源构建
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：压缩、按内容加指纹并预压缩 web/static 下的静态资源，生成清单供模板引用
+
+运行方式：
+    python web/app.py assets             # 只重新构建有变化的文件
+    python web/app.py assets --force     # 全部重新构建
+
+输出结构（static/dist 不纳入版本管理）：
+    static/dist/css/base.3f2a9c1d0e.css       压缩后的文件，文件名带内容哈希
+    static/dist/css/base.3f2a9c1d0e.css.gz    gzip 预压缩（最高压缩级别）
+    static/dist/css/base.3f2a9c1d0e.css.br    brotli 预压缩（安装了 Brotli 时）
+    static/dist/manifest.json                 原文件名 -> 带指纹文件名
+
+模板通过 asset_url('css/base.css') 引用资源：清单中有这个文件、且源文件在构建后
+没有改过时返回带指纹的地址（可以永久缓存），否则退回原文件地址。
+带指纹的文件内容不会变，服务时按 Accept-Encoding 直接发送预压缩版本，
+并带上 Cache-Control: immutable。
+
+也可以让 nginx 直接提供 static/dist（gzip_static on; brotli_static on;）。
+"""
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+
+from cache import file_signature
+from compression import brotli, choose_encoding
+
+
+# 构建输出目录（相对 static 目录）和清单文件名
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+# 文件名中内容哈希的长度
+HASH_LENGTH = 10
+# 带指纹文件的缓存策略
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# 预压缩格式：Content-Encoding -> 文件后缀
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+# ==================== 压缩 ====================
+
+CSS_TOKEN_PATTERN = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[^"\'/]+|/', re.S)
+CSS_PUNCTUATION_PATTERN = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(source):
+    """去掉注释和多余空白（字符串和 url("data:...") 原样保留）"""
+    strings = []
+    parts = []
+    for match in CSS_TOKEN_PATTERN.finditer(source):
+        token = match.group(0)
+        if token.startswith('/*'):
+            parts.append(' ')
+        elif token[0] in '"\'':
+            parts.append(f'\0{len(strings)}\0')
+            strings.append(token)
+        else:
+            parts.append(token)
+
+    css = re.sub(r'\s+', ' ', ''.join(parts))
+    css = CSS_PUNCTUATION_PATTERN.sub(r'\1', css)
+    # 只去掉冒号后的空格：选择器中冒号前的空格（如 "div :hover"）有含义
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}').strip()
+    return re.sub(r'\0(\d+)\0', lambda m: strings[int(m.group(1))], css)
+
+
+# 这些字符之后的 / 是正则字面量的开始，而不是除号
+JS_REGEX_PREFIX = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def minify_js(source):
+    """保守的 JS 压缩：去掉注释、缩进、空行和连续空白，保留换行（不依赖自动分号插入的改写）
+
+    字符串、模板字符串（含嵌套的 ${...}）和正则字面量原样保留。
+    """
+    out = []
+    stack = []   # 模板字符串嵌套：None 表示在模板文本中，整数表示 ${...} 内的大括号深度
+    i = 0
+    n = len(source)
+
+    def last_significant():
+        for char in reversed(out):
+            if not char.isspace():
+                return char
+        return ''
+
+    def copy_quoted(start, quote):
+        """复制字符串或正则字面量，返回结束位置"""
+        j = start + 1
+        in_class = False
+        while j < n:
+            char = source[j]
+            if char == '\\':
+                j += 2
+                continue
+            if quote == '/' and char in '[]':
+                in_class = char == '['
+            elif char == quote and not in_class:
+                break
+            elif char == '\n' and quote != '`':
+                break
+            j += 1
+        out.append(source[start:j + 1])
+        return j + 1
+
+    while i < n:
+        char = source[i]
+
+        # 模板字符串文本
+        if stack and stack[-1] is None:
+            if char == '\\':
+                out.append(source[i:i + 2])
+                i += 2
+                continue
+            if char == '`':
+                stack.pop()
+            elif source.startswith('${', i):
+                stack.append(0)
+                out.append('${')
+                i += 2
+                continue
+            out.append(char)
+            i += 1
+            continue
+
+        if char == '\n':
+            while out and out[-1] in (' ', '\t'):
+                out.pop()
+            if out and out[-1] != '\n':
+                out.append('\n')
+            i += 1
+        elif char.isspace():
+            if out and out[-1] not in (' ', '\n'):
+                out.append(' ')
+            i += 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end < 0 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        elif char in '"\'' or (char == '/' and last_significant() in JS_REGEX_PREFIX | {''}):
+            i = copy_quoted(i, char)
+        elif char == '`':
+            stack.append(None)
+            out.append(char)
+            i += 1
+        else:
+            if stack and char == '{':
+                stack[-1] += 1
+            elif stack and char == '}':
+                if stack[-1] == 0:
+                    stack.pop()   # ${...} 结束，回到模板文本
+                else:
+                    stack[-1] -= 1
+            out.append(char)
+            i += 1
+
+    return ''.join(out).strip() + '\n'
+
+
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js,
+}
+
+
+# ==================== 构建 ====================
+
+def fingerprinted_name(relative, content):
+    """css/base.css -> css/base.<内容哈希>.css"""
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    path = Path(relative)
+    return path.with_name(f'{path.stem}.{digest}{path.suffix}').as_posix()
+
+
+def compress_variants(content):
+    """预压缩版本：{文件后缀: 压缩后内容}，只保留确实变小的版本"""
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content, quality=11)
+    return {suffix: data for suffix, data in variants.items() if len(data) < len(content)}
+
+
+def load_manifest(static_dir):
+    path = Path(static_dir) / DIST_DIR / MANIFEST_NAME
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {'files': {}}
+
+
+def _build_file(source, relative, dist_dir):
+    content = source.read_bytes()
+    minify = MINIFIERS.get(source.suffix)
+    if minify:
+        content = minify(content.decode('utf-8')).encode('utf-8')
+
+    output = fingerprinted_name(relative, content)
+    target = dist_dir / output
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(content)
+
+    variants = compress_variants(content)
+    for suffix, data in variants.items():
+        Path(f'{target}{suffix}').write_bytes(data)
+
+    return {
+        'path': output,
+        'source': list(file_signature(source)),
+        'size': len(content),
+        'original_size': source.stat().st_size,
+        'variants': {suffix: len(data) for suffix, data in variants.items()}
+    }
+
+
+def build(static_dir, force=False, verbose=False):
+    """构建 static 下的全部资源，返回新清单
+
+    源文件签名与清单一致且输出文件存在时跳过；
+    已不在清单中的旧指纹文件会被删除。
+    """
+    start = time.perf_counter()
+    static_dir = Path(static_dir)
+    dist_dir = static_dir / DIST_DIR
+    old_files = {} if force else load_manifest(static_dir)['files']
+
+    files = {}
+    built = 0
+    for source in sorted(static_dir.rglob('*')):
+        relative = source.relative_to(static_dir).as_posix()
+        if not source.is_file() or relative.split('/')[0] == DIST_DIR:
+            continue
+
+        entry = old_files.get(relative)
+        if entry and entry['source'] == list(file_signature(source)) \
+                and (dist_dir / entry['path']).exists():
+            files[relative] = entry
+            continue
+        files[relative] = _build_file(source, relative, dist_dir)
+        built += 1
+
+    # 删除旧指纹文件
+    keep = {dist_dir / MANIFEST_NAME}
+    for entry in files.values():
+        target = dist_dir / entry['path']
+        keep.add(target)
+        keep.update(Path(f'{target}{suffix}') for suffix in entry['variants'])
+    removed = 0
+    if dist_dir.exists():
+        for path in dist_dir.rglob('*'):
+            if path.is_file() and path not in keep:
+                path.unlink()
+                removed += 1
+
+    manifest = {'files': files}
+    dist_dir.mkdir(parents=True, exist_ok=True)
+    (dist_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+    if verbose:
+        original = sum(entry['original_size'] for entry in files.values())
+        minified = sum(entry['size'] for entry in files.values())
+        compressed = sum(entry['variants'].get('.br', entry['variants'].get('.gz', entry['size']))
+                         for entry in files.values())
+        print(f"✅ 静态资源构建完成：{len(files)} 个文件（重新构建 {built}，删除旧文件 {removed}），"
+              f"耗时 {(time.perf_counter() - start) * 1000:.0f}ms")
+        print(f"   原始 {original / 1024:.1f}KB -> 压缩 {minified / 1024:.1f}KB -> "
+              f"{'brotli' if brotli else 'gzip'} {compressed / 1024:.1f}KB")
+        if brotli is None:
+            print("   ⚠️  未安装 Brotli，只生成 gzip 版本（pip install Brotli）")
+    return manifest
+
+
+# ==================== 运行时 ====================
+
+class AssetManifest:
+    """构建清单的运行时视图
+
+    清单文件按签名缓存，改动后自动重新读取；
+    validate=True 时每次查找还会检查源文件是否在构建后被修改过
+    （开发时改了 CSS/JS 但没有重新构建，页面会继续引用原文件）。
+    """
+
+    def __init__(self, static_dir):
+        self.static_dir = Path(static_dir)
+        self.path = self.static_dir / DIST_DIR / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._signature = None
+        self._files = {}
+        self._outputs = {}   # 带指纹文件名（相对 static） -> 清单条目
+        self._digest = ''
+        self.validate = True
+
+    def _load(self):
+        with self._lock:
+            if self._signature is not None and not self.validate:
+                return
+            try:
+                signature = file_signature(self.path)
+            except FileNotFoundError:
+                signature = ()
+            if signature == self._signature:
+                return
+            files = load_manifest(self.static_dir)['files'] if signature else {}
+            self._files = files
+            self._outputs = {f'{DIST_DIR}/{entry["path"]}': entry for entry in files.values()}
+            self._digest = ' '.join(sorted(entry['path'] for entry in files.values()))
+            self._signature = signature
+
+    @property
+    def digest(self):
+        """当前所有带指纹文件名（页面 ETag 和导出指纹用），没有构建过时为空"""
+        self._load()
+        return self._digest
+
+    def lookup(self, filename):
+        """原文件名 -> 带指纹文件名（相对 static），没有可用的构建结果时返回 None"""
+        self._load()
+        entry = self._files.get(filename)
+        if entry is None:
+            return None
+        if self.validate:
+            try:
+                if list(file_signature(self.static_dir / filename)) != entry['source']:
+                    return None
+            except FileNotFoundError:
+                return None
+        return f'{DIST_DIR}/{entry["path"]}'
+
+    def resolve(self, filename, accept_encoding):
+        """请求的静态文件 -> (实际发送的文件名, 额外响应头)
+
+        带指纹的文件按 Accept-Encoding 选择预压缩版本，并允许永久缓存；
+        其他文件原样发送。
+        """
+        if not filename.startswith(DIST_DIR + '/'):
+            return filename, {}
+
+        self._load()
+        headers = {'Cache-Control': IMMUTABLE_CACHE_CONTROL}
+        entry = self._outputs.get(filename)
+        if entry is None or not entry['variants']:
+            return filename, headers
+
+        headers['Vary'] = 'Accept-Encoding'
+        available = [encoding for encoding, suffix in SUFFIXES.items() if suffix in entry['variants']]
+        encoding = choose_encoding(accept_encoding, available)
+        if encoding is None:
+            return filename, headers
+        headers['Content-Encoding'] = encoding
+        return filename + SUFFIXES[encoding], headers
+
+    def stats(self):
+        self._load()
+        return {
+            'files': len(self._files),
+            'brotli': brotli is not None
+        }
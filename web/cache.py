@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 文件缓存
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：按文件签名 (mtime, size) 失效、按内存预算做 LRU 淘汰的通用缓存
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+def estimate_size(obj, _seen=None):
+    """粗略估算对象（含嵌套容器）占用的字节数"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    return size
+
+
+def file_signature(path):
+    """文件签名：(mtime_ns, size)，任一变化即视为文件已修改"""
+    stat = Path(path).stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class FileLRUCache:
+    """以文件路径为键的 LRU 缓存
+
+    - 每次 get() 先比较文件签名，文件变化后自动重新加载
+    - 总占用超过 max_bytes 时按最近最少使用淘汰
+    - 全局锁只保护查找和写入，加载在锁外进行：一个文件加载时不影响其他文件的命中；
+      每个文件另有一把加载锁，同一文件的并发请求只会解析一次
+    - validate=False 时（由内容监听负责调用 invalidate()）命中缓存直接返回，不再 stat
+    """
+
+    def __init__(self, loader, max_bytes, sizeof=estimate_size):
+        self._loader = loader
+        self._sizeof = sizeof
+        self._entries = OrderedDict()  # Path -> (签名, 值, 字节数)
+        self._lock = threading.Lock()
+        self._loading = {}             # Path -> 正在加载该文件时持有的锁
+        self._invalidations = 0        # invalidate() 的次数，加载期间有失效时不写入结果
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.validate = True
+
+    def get(self, path):
+        """取缓存值，文件不存在时抛出 FileNotFoundError"""
+        path = Path(path)
+        if not self.validate:
+            with self._lock:
+                cached = self._entries.get(path)
+                if cached:
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    return cached[1]
+
+        signature = file_signature(path)
+
+        with self._lock:
+            value = self._lookup(path, signature)
+            if value is not None:
+                return value
+            load_lock = self._loading.setdefault(path, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                # 等锁期间可能已由其他线程加载好
+                value = self._lookup(path, signature)
+                if value is not None:
+                    return value
+                self.misses += 1
+                invalidations = self._invalidations
+
+            try:
+                value = self._loader(path)
+                with self._lock:
+                    if self._invalidations == invalidations:
+                        self._store(path, signature, value)
+            finally:
+                with self._lock:
+                    if self._loading.get(path) is load_lock:
+                        del self._loading[path]
+            return value
+
+    def _lookup(self, path, signature):
+        """签名一致时返回缓存值并计为命中，否则返回 None（调用方持有锁）"""
+        cached = self._entries.get(path)
+        if cached and cached[0] == signature:
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return cached[1]
+        return None
+
+    def _store(self, path, signature, value):
+        """写入条目并按内存预算淘汰"""
+        self._discard(path)
+
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            # 单个条目超出预算：不缓存，直接返回
+            return
+
+        self._entries[path] = (signature, value, size)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def _discard(self, path):
+        cached = self._entries.pop(path, None)
+        if cached:
+            self.current_bytes -= cached[2]
+
+    def invalidate(self, path=None):
+        """失效缓存：指定路径只失效该文件，否则清空全部"""
+        with self._lock:
+            self._invalidations += 1
+            if path is None:
+                self._entries.clear()
+                self.current_bytes = 0
+            else:
+                self._discard(Path(path))
+
+    def stats(self):
+        """缓存命中统计"""
+        return {
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
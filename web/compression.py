@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 响应压缩
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：按 Accept-Encoding 协商 gzip / brotli，压缩完整响应或流式响应
+
+    - 只压缩文本类响应（HTML、CSS、JS、JSON、SVG），小于 min_size 的响应不压缩
+    - 客户端同时接受两种格式且权重相同时优先 brotli
+    - 流式响应每个分块压缩后立即 flush，浏览器收到一块就能解压显示一块
+
+brotli 为可选依赖（Brotli 或 brotlicffi），未安装时只使用 gzip。
+"""
+
+import zlib
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+# 协商时的优先顺序
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+# 动态响应的压缩级别：在压缩率和 CPU 之间取中间值（预压缩的静态资源用最高级别）
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def choose_encoding(accept_encoding, available=ENCODINGS):
+    """按 Accept-Encoding 从 available 中选一个压缩格式，都不接受时返回 None"""
+    accepted = parse_accept_header(accept_encoding or '')
+    best, best_quality = None, 0
+    for encoding in ENCODINGS:
+        if encoding not in available:
+            continue
+        quality = accepted[encoding] if encoding in accepted else accepted['*']
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type):
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class StreamCompressor:
+    """增量压缩器：compress() 返回这一块压缩并 flush 后的数据，finish() 返回结尾"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+            # Brotli 的方法名是 process，brotlicffi 是 compress
+            self._process = getattr(self._brotli, 'process', None) or self._brotli.compress
+        else:
+            # wbits=31：带 gzip 头和校验
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        if self.encoding == 'br':
+            return self._process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+def compress(data, encoding):
+    """压缩完整响应体"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return zlib.compress(data, GZIP_LEVEL, wbits=31)
+
+
+def compress_stream(chunks, encoding):
+    """压缩流式响应：每个分块单独 flush"""
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        if chunk:
+            yield compressor.compress(chunk)
+    yield compressor.finish()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 静态站点导出
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：把讲义、测试题（一题一页 / 全部显示）和导航 JSON 预渲染成静态文件
+
+运行方式：
+    python web/app.py export --out dist --jobs 4
+
+输出结构（URL 与 Flask 路由一致）：
+    dist/index.html
+    dist/quizzes/index.html
+    dist/lecture/<讲义路径>/index.html
+    dist/quiz/<测试题路径>/index.html
+    dist/quiz/<测试题路径>/all/index.html
+    dist/api/navigation.json
+    dist/static/...、dist/pygments.css
+
+nginx 示例（答题相关的 /api/* 写接口仍转发给 Python）：
+    location / { try_files $uri $uri/index.html $uri.json @app; }
+    location /static/dist/ { gzip_static on; expires max; add_header Cache-Control immutable; }
+
+页面引用的是 static/dist 下带内容指纹的资源（导出前先构建，见 assets.py），
+其中的 .gz / .br 预压缩文件可以直接由 nginx 发送。
+
+增量生成：dist/.export-manifest.json 记录每个输出文件的来源指纹
+（源文件内容 + 导航树 + 模板），指纹不变的页面直接跳过。
+导航树变化时所有页面都会重新生成，因为每个页面都内嵌了导航栏。
+"""
+
+import hashlib
+import json
+import multiprocessing
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import app as webapp
+import assets
+
+
+MANIFEST_NAME = '.export-manifest.json'
+
+
+# ==================== 页面清单 ====================
+
+def collect_pages(nav):
+    """列出需要导出的页面：(类型, 源文件, URL 路径)"""
+    pages = [
+        ('home', None, '/'),
+        ('quiz_list', None, '/quizzes'),
+    ]
+
+    for phase_group in nav['lectures']:
+        for item in phase_group['items']:
+            pages.append(('lecture', item['file'], f"/lecture/{item['file']}"))
+
+    for phase_group in nav['quizzes']:
+        for item in phase_group['items']:
+            pages.append(('quiz', item['file'], f"/quiz/{item['file']}"))
+            pages.append(('quiz_all', item['file'], f"/quiz/{item['file']}/all"))
+
+    return pages
+
+
+def page_output_path(url_path):
+    """URL 路径 -> 输出文件的相对路径"""
+    return Path(url_path.strip('/')) / 'index.html'
+
+
+def page_fingerprint(source, site_fingerprint):
+    """页面指纹：源文件内容 + 全站共享部分（导航、模板、渲染配置）"""
+    digest = hashlib.sha256(site_fingerprint.encode('utf-8'))
+    if source:
+        digest.update((webapp.BASE_DIR / source).read_bytes())
+    return digest.hexdigest()
+
+
+# ==================== 渲染（在子进程中执行） ====================
+
+def render_page(kind, source, url_path):
+    """渲染单个页面为 HTML（导出的测试题页面不带任何已保存答案）"""
+    with webapp.app.test_request_context(url_path):
+        if kind == 'home':
+            return webapp.render_template('home.html', nav=webapp.build_navigation())
+        elif kind == 'quiz_list':
+            return webapp.render_template('quiz_list.html', nav=webapp.build_navigation())
+        elif kind == 'lecture':
+            return webapp.render_lecture_page(source)
+        elif kind == 'quiz':
+            return webapp.render_quiz_page(source, 'quiz_single.html', {})
+        elif kind == 'quiz_all':
+            return webapp.render_quiz_page(source, 'quiz_all.html', {})
+        raise ValueError(f"未知页面类型: {kind}")
+
+
+def _render_batch(out_dir, pages):
+    """子进程任务：渲染一批页面并写入文件"""
+    for kind, source, url_path in pages:
+        html = render_page(kind, source, url_path)
+        target = out_dir / page_output_path(url_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(html, encoding='utf-8')
+    return len(pages)
+
+
+# ==================== 静态资源 ====================
+
+def copy_static(out_dir):
+    """复制静态资源（只复制有变化的文件），返回复制数量"""
+    static_dir = Path(webapp.app.static_folder)
+    copied = 0
+    for source in static_dir.rglob('*'):
+        if not source.is_file():
+            continue
+        target = out_dir / 'static' / source.relative_to(static_dir)
+        stat = source.stat()
+        if target.exists() and target.stat().st_size == stat.st_size \
+                and target.stat().st_mtime >= stat.st_mtime:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+        copied += 1
+    return copied
+
+
+# ==================== 导出入口 ====================
+
+def export_site(out_dir, jobs=None, force=False):
+    """导出静态站点"""
+    start = time.perf_counter()
+    out_dir = Path(out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = out_dir / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists() and not force:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+
+    # 在父进程中构建导航索引和渲染讲义（测试题在确定待导出的页面后解析），
+    # 子进程 fork 后直接复用这些缓存
+    nav = webapp.build_navigation()
+    webapp.warm_lecture_cache()
+    assets.build(webapp.app.static_folder)
+    site_fingerprint = '|'.join([
+        webapp.nav_index.signature,
+        webapp.TEMPLATES_HASH,
+        webapp.asset_manifest.digest,
+        str(webapp.app.config['SERVER_HIGHLIGHT']),
+    ])
+
+    pages = collect_pages(nav)
+    new_manifest = {}
+    pending = []
+    for kind, source, url_path in pages:
+        output = page_output_path(url_path).as_posix()
+        fingerprint = page_fingerprint(source, site_fingerprint)
+        new_manifest[output] = fingerprint
+        if manifest.get(output) != fingerprint or not (out_dir / output).exists():
+            pending.append((kind, source, url_path))
+
+    # 分批交给进程池
+    rendered = 0
+    if pending:
+        # 每套测试题有两个页面，先在父进程中解析一次，子进程共用 quiz_cache
+        for source in {source for kind, source, _ in pending if kind in ('quiz', 'quiz_all')}:
+            webapp.parse_quiz(source)
+
+        jobs = max(1, min(jobs or 1, len(pending)))
+        if jobs == 1:
+            rendered = _render_batch(out_dir, pending)
+        else:
+            context = None
+            if 'fork' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('fork')
+            batches = [pending[i::jobs] for i in range(jobs)]
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+                futures = [pool.submit(_render_batch, out_dir, batch) for batch in batches]
+                rendered = sum(f.result() for f in futures)
+
+    # 导航 JSON 和高亮样式表很小，每次都重新写
+    api_dir = out_dir / 'api'
+    api_dir.mkdir(exist_ok=True)
+    (api_dir / 'navigation.json').write_text(
+        json.dumps(nav, ensure_ascii=False), encoding='utf-8'
+    )
+    (out_dir / 'pygments.css').write_text(webapp.pygments_stylesheet(), encoding='utf-8')
+    copied = copy_static(out_dir)
+
+    # 删除已不存在的页面
+    removed = 0
+    for output in manifest.keys() - new_manifest.keys():
+        stale = out_dir / output
+        if stale.exists():
+            stale.unlink()
+            removed += 1
+
+    manifest_path.write_text(json.dumps(new_manifest, indent=2), encoding='utf-8')
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ 导出完成：{out_dir}")
+    print(f"   页面 {len(pages)} 个（重新生成 {rendered}，跳过 {len(pages) - rendered}，删除 {removed}）")
+    print(f"   静态资源复制 {copied} 个，耗时 {elapsed:.2f}s")
+    return rendered
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 评分引擎
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：把测试题的答案编译成 NumPy 数组，整批提交一次向量化评分
+
+编码方式：
+    - 选项 A-D 编码为 0-3，未作答或不是 A-D 的答案编码为 -1
+    - AnswerKey.key：每道题的正确选项编码（长度 = 题目数）
+    - AnswerKey.graded：哪些题参与判分（有正确答案的选择题，开放题不判分）
+    - 提交矩阵：n 份提交 × 题目数，int8
+
+评分规则与逐题比较完全一致：只有选择题、且答案与正确答案相同才算对，
+百分比按全部题目数（含开放题）计算。
+"""
+
+from itertools import chain, repeat
+
+import numpy as np
+
+
+CHOICES = 'ABCD'
+CHOICE_CODES = {choice: code for code, choice in enumerate(CHOICES)}
+UNANSWERED = -1
+
+
+def encode_choice(answer):
+    """选项字母 -> 编码，不是 A-D 的答案返回 UNANSWERED"""
+    if isinstance(answer, str):
+        return CHOICE_CODES.get(answer, UNANSWERED)
+    return UNANSWERED
+
+
+def _encode_choices(answers, count):
+    """一串答案 -> 编码数组（int8）"""
+    answers = list(answers)
+    try:
+        return np.fromiter(map(CHOICE_CODES.get, answers, repeat(UNANSWERED)), dtype=np.int8, count=count)
+    except TypeError:
+        # 答案里有列表、字典等不能查字典的值
+        return np.fromiter(map(encode_choice, answers), dtype=np.int8, count=count)
+
+
+def percentage(correct, total):
+    """与原评分相同的百分比（保留一位小数）"""
+    return round(correct / total * 100, 1) if total > 0 else 0
+
+
+class AnswerKey:
+    """编译后的答案"""
+
+    def __init__(self, questions, answers):
+        self.question_ids = [q['id'] for q in questions]
+        self.index = {question_id: i for i, question_id in enumerate(self.question_ids)}
+        self.key = np.array(
+            [encode_choice(answers.get(question_id)) for question_id in self.question_ids],
+            dtype=np.int8
+        )
+        self.graded = np.array(
+            [q.get('type') == 'choice' and bool(answers.get(q['id'])) for q in questions],
+            dtype=bool
+        )
+
+    @classmethod
+    def from_quiz(cls, quiz_data):
+        return cls(quiz_data['questions'], quiz_data['answers'])
+
+    @property
+    def size(self):
+        return len(self.question_ids)
+
+    def encode(self, submissions):
+        """[{question_id: answer}, ...] -> 提交矩阵（n × 题目数）
+
+        所有提交先摊平成行号、列号、答案编码三个数组（字典查找在 map 中完成，没有逐个答案的 Python 循环），
+        再一次写入矩阵
+        """
+        count = len(submissions)
+        matrix = np.full((count, self.size), UNANSWERED, dtype=np.int8)
+        lengths = np.fromiter(map(len, submissions), dtype=np.intp, count=count)
+        total = int(lengths.sum())
+        if total == 0:
+            return matrix
+
+        rows = np.repeat(np.arange(count), lengths)
+        # 不在这套题里的题号列号为 -1
+        columns = np.fromiter(map(self.index.get, chain.from_iterable(submissions), repeat(-1)),
+                              dtype=np.intp, count=total)
+        codes = _encode_choices(chain.from_iterable(answers.values() for answers in submissions), total)
+
+        known = columns >= 0
+        matrix[rows[known], columns[known]] = codes[known]
+        return matrix
+
+    def grade(self, matrix):
+        """对错矩阵（n × 题目数，bool）"""
+        return (matrix == self.key) & self.graded
+
+    def grade_one(self, answers):
+        """单份提交的逐题对错（长度 = 题目数，bool）"""
+        return self.grade(self.encode([answers]))[0]
+
+    def grade_batch(self, submissions):
+        """整批评分，submissions 可以是答案字典列表或已编码的提交矩阵"""
+        matrix = submissions if isinstance(submissions, np.ndarray) else self.encode(submissions)
+        return BatchResult(self, matrix, self.grade(matrix))
+
+
+class BatchResult:
+    """一批提交的评分结果"""
+
+    def __init__(self, answer_key, matrix, correct):
+        self.answer_key = answer_key
+        self.matrix = matrix        # 提交矩阵
+        self.correct = correct      # 对错矩阵
+        self.scores = correct.sum(axis=1)
+
+    @property
+    def count(self):
+        return self.matrix.shape[0]
+
+    def percentages(self):
+        """每份提交的得分百分比
+
+        得分只有 0 ~ 题目数这几种，先用 percentage() 算出每种得分的百分比再按得分查表，
+        与单份评分的舍入完全一致（np.round 的舍入方式和 Python round 不同）
+        """
+        total = self.answer_key.size
+        table = np.array([percentage(score, total) for score in range(total + 1)], dtype=float)
+        return table[self.scores]
+
+    def question_stats(self):
+        """每道题的作答人数、答对人数、正确率（答对人数 / 作答人数）和各选项人数"""
+        answered = (self.matrix != UNANSWERED).sum(axis=0)
+        correct = self.correct.sum(axis=0)
+        # (题目数 × 4)：每道题每个选项被选的次数
+        option_counts = np.stack(
+            [(self.matrix == code).sum(axis=0) for code in range(len(CHOICES))], axis=1
+        )
+
+        stats = []
+        for i, question_id in enumerate(self.answer_key.question_ids):
+            graded = bool(self.answer_key.graded[i])
+            stats.append({
+                'id': question_id,
+                'graded': graded,
+                'answered': int(answered[i]),
+                'correct': int(correct[i]) if graded else None,
+                # 正确率按作答人数计算（与 quiz_stats 一致），没人作答时为 None
+                'correct_rate': round(float(correct[i]) / answered[i], 4) if graded and answered[i] else None,
+                'options': {choice: int(option_counts[i, code]) for code, choice in enumerate(CHOICES)}
+            })
+        return stats
+
+    def summary(self):
+        """整批得分概况"""
+        total = self.answer_key.size
+        percentages = self.percentages()
+        return {
+            'submissions': self.count,
+            'questions': total,
+            'graded_questions': int(self.answer_key.graded.sum()),
+            'mean_score': round(float(self.scores.mean()), 2) if self.count else 0,
+            'mean_percentage': round(float(percentages.mean()), 1) if self.count else 0,
+            'median_percentage': round(float(np.median(percentages)), 1) if self.count else 0
+        }
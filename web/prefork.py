@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 生产环境多进程服务器
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：预加载内容缓存后 fork 出多个 worker，worker 以写时复制方式共享缓存
+
+运行方式：
+    ANSWER_STORE=sqlite python app.py prod --workers 4 --port 8000
+    kill -HUP <主进程 pid>     # 平滑重启
+    kill -TERM <主进程 pid>    # 平滑停止
+
+工作方式：
+    - 主进程绑定端口，构建导航索引、解析全部测试题、渲染全部讲义、建立搜索索引，
+      然后 gc.freeze() 并 fork 出 worker。缓存对象在 worker 中只读，
+      内存页在父子进程之间共享，不会被复制
+    - 每个 worker 在继承来的监听 socket 上运行多线程 WSGI 服务器
+    - worker 意外退出时自动补上
+    - 主进程监听内容文件（watcher.py，inotify 或每 --reload-interval 秒轮询），
+      有增删改或收到 SIGHUP 时平滑重启：主进程只重新解析变化的文件，
+      先启动新 worker，再让旧 worker 处理完手上的请求后退出。
+      内容变化一定会触发重启，所以 worker 取缓存时不再 stat 文件
+    - 启动和每次重启时构建静态资源（assets.py），页面引用带指纹的预压缩文件；
+      修改 CSS/JS 后发送 SIGHUP 生效
+    - 启动和每次重启后打印预热耗时和各 worker 的内存占用（RSS / 共享部分）
+
+答案由 worker 写入，主进程不会看到，因此必须使用 SQLite 答案存储（ANSWER_STORE=sqlite），
+即使只有一个 worker。
+"""
+
+import gc
+import os
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+import app as webapp
+import assets
+
+
+# ==================== 预加载 ====================
+
+def preload():
+    """在主进程中加载所有内容缓存，返回耗时（秒）"""
+    start = time.perf_counter()
+    nav = webapp.build_navigation()
+    for phase_group in nav['quizzes']:
+        for item in phase_group['items']:
+            webapp.parse_quiz(item['file'])
+    webapp.warm_lecture_cache()
+    webapp.search_index.build()
+    webapp.pygments_stylesheet()
+    assets.build(webapp.app.static_folder)
+    elapsed = time.perf_counter() - start
+
+    # 把已有对象移出 GC 跟踪，避免 worker 中的垃圾回收改写这些对象所在的内存页
+    gc.collect()
+    gc.freeze()
+    return elapsed
+
+
+def memory_usage(pid):
+    """进程内存占用 {'rss', 'shared'}（KiB），读不到时返回 None（仅支持 Linux）"""
+    usage = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in ('Rss', 'Shared_Clean', 'Shared_Dirty'):
+                    usage[name] = int(value.split()[0])
+    except OSError:
+        return None
+    return {
+        'rss': usage.get('Rss', 0),
+        'shared': usage.get('Shared_Clean', 0) + usage.get('Shared_Dirty', 0)
+    }
+
+
+# ==================== worker ====================
+
+def run_worker(sock, args, watched):
+    """worker 进程主函数：在继承来的 socket 上处理请求，收到 SIGTERM 后平滑退出"""
+    for sig in (signal.SIGHUP, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    # Ctrl+C 由主进程统一处理
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    webapp.after_fork()
+    # 静态资源在主进程中构建好了，重启前不会变
+    webapp.asset_manifest.validate = False
+    if watched:
+        webapp.set_cache_validation(False)
+
+    handler = type('TimeoutRequestHandler', (WSGIRequestHandler,), {'timeout': args.timeout})
+    server = make_server(args.host, args.port, webapp.app, threaded=True,
+                         request_handler=handler, fd=sock.fileno())
+    # 退出时等待正在处理的请求完成
+    server.daemon_threads = False
+    server.block_on_close = True
+
+    def shutdown(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+    signal.signal(signal.SIGTERM, shutdown)
+
+    server.serve_forever()
+    server.server_close()
+
+
+# ==================== 主进程 ====================
+
+class Arbiter:
+    """主进程：管理 worker 的启动、补位、平滑重启和停止"""
+
+    def __init__(self, sock, args):
+        self.sock = sock
+        self.args = args
+        self.workers = set()
+        self.retiring = {}  # 正在退出的旧 worker：pid -> 强制结束的时间
+        self.watcher = None
+        self._changes = queue.SimpleQueue()  # 监听线程发现的变化文件
+        self._reload_requested = False
+        self._stopping = False
+        self._report_at = None
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.sock, self.args, self.watcher is not None)
+            except Exception:
+                traceback.print_exc()
+                code = 1
+            finally:
+                # 不执行从主进程继承来的 atexit 等清理逻辑
+                os._exit(code)
+        self.workers.add(pid)
+
+    def retire(self, pids):
+        """让 worker 处理完当前请求后退出"""
+        deadline = time.monotonic() + self.args.graceful_timeout
+        for pid in pids:
+            self.workers.discard(pid)
+            self.retiring[pid] = deadline
+            self._kill(pid, signal.SIGTERM)
+
+    def _kill(self, pid, sig):
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def reap(self):
+        """回收已退出的 worker，意外退出的补上新的"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            if self.retiring.pop(pid, None) is not None:
+                continue
+            if pid in self.workers:
+                self.workers.discard(pid)
+                if not self._stopping:
+                    print(f"⚠️  worker {pid} 意外退出（状态 {status}），重新启动")
+                    self.spawn()
+
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now >= deadline:
+                self._kill(pid, signal.SIGKILL)
+
+    def reload(self, reason):
+        print(f"🔄 {reason}，平滑重启 worker")
+        self._reload_requested = False
+        elapsed = preload()
+
+        old = list(self.workers)
+        for _ in range(self.args.workers):
+            self.spawn()
+        self.retire(old)
+
+        print(f"   重新预热耗时 {elapsed * 1000:.0f}ms")
+        self._report_at = time.monotonic() + 1
+
+    def report(self):
+        """打印主进程和各 worker 的内存占用"""
+        self._report_at = None
+        parent = memory_usage(os.getpid())
+        if parent is None:
+            return
+        print(f"   主进程 {os.getpid()}: RSS {parent['rss'] / 1024:.1f} MiB")
+        for pid in sorted(self.workers):
+            usage = memory_usage(pid)
+            if usage:
+                print(f"   worker {pid}: RSS {usage['rss'] / 1024:.1f} MiB"
+                      f"（与其他进程共享 {usage['shared'] / 1024:.1f} MiB）")
+
+    def run(self):
+        signal.signal(signal.SIGHUP, lambda signum, frame: setattr(self, '_reload_requested', True))
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, '_stopping', True))
+        signal.signal(signal.SIGINT, lambda signum, frame: setattr(self, '_stopping', True))
+
+        if self.args.reload_interval:
+            # 监听线程只把变化放进队列，缓存的更新和 fork 都在主线程中进行
+            webapp.app.config['CONTENT_POLL_INTERVAL'] = self.args.reload_interval
+            self.watcher = webapp.create_content_watcher(
+                on_change=lambda path, event: self._changes.put((path, event)))
+            if self.watcher is not None:
+                self.watcher.start()
+                print(f"👀 监听内容变化（{self.watcher.backend}）")
+
+        for _ in range(self.args.workers):
+            self.spawn()
+        self._report_at = time.monotonic() + 1
+
+        while not self._stopping:
+            time.sleep(0.2)
+            self.reap()
+
+            now = time.monotonic()
+            changed = 0
+            while not self._changes.empty():
+                webapp.on_content_change(*self._changes.get())
+                changed += 1
+            if changed:
+                self.reload(f"{changed} 个内容文件有变化")
+            if self._reload_requested:
+                self.reload("收到 SIGHUP")
+            if self._report_at and now >= self._report_at:
+                self.report()
+
+        self.stop()
+
+    def stop(self):
+        print("🛑 正在停止 worker ...")
+        if self.watcher is not None:
+            self.watcher.stop()
+        self.retire(list(self.workers))
+        while self.retiring:
+            time.sleep(0.1)
+            self.reap()
+        self.sock.close()
+
+
+def serve(args):
+    """启动生产服务器"""
+    # worker 数为 1 时也不行：答案写在 worker 中，主进程的内存副本不会更新，
+    # 主进程退出时的 compact() 和重启时 fork 出的新 worker 都会用旧数据覆盖 worker 保存的答案；
+    # 它保存答案时更新统计也只在进程内加锁，多个 worker 同时保存会让统计漂移
+    if not webapp.answer_store.multiprocess_safe:
+        sys.exit("❌ 生产模式需要支持多进程的答案存储，请设置 ANSWER_STORE=sqlite")
+
+    start = time.perf_counter()
+    sock = socket.create_server((args.host, args.port), backlog=2048)
+    sock.set_inheritable(True)
+    elapsed = preload()
+
+    print("=" * 60)
+    print(" LangGraph 学习平台（生产模式）")
+    print(f" 访问地址: http://{args.host}:{args.port}")
+    print(f" worker: {args.workers}，超时 {args.timeout:g}s，平滑退出等待 {args.graceful_timeout:g}s")
+    print(f" 主进程 pid {os.getpid()}（kill -HUP 平滑重启）")
+    print("=" * 60)
+    print(f"⏱️  预热耗时 {elapsed * 1000:.0f}ms，启动总耗时 {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    Arbiter(sock, args).run()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 请求性能分析
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：可选开启的请求级耗时统计、Prometheus 指标和采样分析（PROFILING=1 开启）
+
+    - 分段计时：热点函数用 @profiler.timed('名称') 标记，每个请求分别累计各段耗时
+      （同一段被调用多次时累加），通过 Server-Timing 响应头返回，
+      浏览器开发者工具的 Network -> Timing 面板可以直接看到
+    - /metrics：Prometheus 文本格式，按路由统计请求耗时直方图和状态码计数，
+      按分段统计耗时直方图
+    - 采样分析（PROFILE_SAMPLE_INTERVAL=5，单位毫秒）：后台线程定时抓取正在处理请求的线程调用栈，
+      保留最慢的 PROFILE_SLOWEST 个请求的采样结果。
+      /api/profile/slowest?format=folded 输出折叠栈格式，可直接交给 flamegraph.pl 或 speedscope：
+          curl -s localhost:5000/api/profile/slowest?format=folded | flamegraph.pl > slow.svg
+
+说明：
+    - 未开启时 @profiler.timed 直接返回原函数，没有任何额外开销
+    - 流式响应的 Server-Timing 在响应头发出时生成，只包含此前完成的分段；
+      /metrics 和最慢请求记录的是响应发送完毕后的完整耗时
+    - 多进程模式下每个 worker 各自统计
+    - 采样按线程进行，ASGI 模式的请求分散在事件循环和线程池中，不做采样
+"""
+
+import bisect
+import contextvars
+import functools
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+
+# 耗时直方图的桶（秒）
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# 采样调用栈的最大深度
+MAX_STACK_DEPTH = 64
+
+# 当前请求的 RequestProfile（每个请求 / 任务各自独立）
+_current = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """一次请求的分段耗时和采样结果"""
+
+    def __init__(self, route, method, path):
+        self.route = route
+        self.method = method
+        self.path = path
+        self.start = time.perf_counter()
+        self.thread_id = threading.get_ident()
+        self.spans = {}          # 分段名 -> [累计耗时（秒）, 次数]
+        self.samples = Counter() # 折叠栈 -> 采样次数
+        self.duration = None
+        self.status = None
+        self._template_starts = []
+
+    def add_span(self, name, elapsed):
+        span = self.spans.setdefault(name, [0.0, 0])
+        span[0] += elapsed
+        span[1] += 1
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def server_timing(self):
+        """Server-Timing 响应头（毫秒）"""
+        parts = [f'{name};dur={total * 1000:.2f};desc="{count}x"' for name, (total, count) in self.spans.items()]
+        parts.append(f'total;dur={self.elapsed() * 1000:.2f}')
+        return ', '.join(parts)
+
+    def summary(self):
+        return {
+            'route': self.route,
+            'method': self.method,
+            'path': self.path,
+            'status': self.status,
+            'duration_ms': round(self.duration * 1000, 2),
+            'spans': {name: {'ms': round(total * 1000, 2), 'calls': count}
+                      for name, (total, count) in self.spans.items()},
+            'samples': sum(self.samples.values()),
+            'stacks': dict(self.samples.most_common())
+        }
+
+
+class Histogram:
+    """Prometheus 直方图（非累计计数，输出时再累加）"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            yield f'{name}_bucket{{{labels},le="{le}"}} {cumulative}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Profiler:
+    """请求性能分析器"""
+
+    def __init__(self, enabled=False, sample_interval=0, slowest=10, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.sample_interval = sample_interval / 1000    # 毫秒 -> 秒
+        self.slowest_count = slowest
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._requests = {}        # 路由 -> Histogram
+        self._spans = {}           # 分段名 -> Histogram
+        self._statuses = Counter() # (路由, 方法, 状态码) -> 次数
+        self._slowest = []         # 小顶堆：(耗时, 序号, 摘要)
+        self._sequence = itertools.count()
+        self._active = {}          # 线程 id -> 正在处理的 RequestProfile（采样用）
+        self._active_lock = threading.Lock()
+        self._sampler_pid = None
+
+    # ==================== 计时 ====================
+
+    def timed(self, name):
+        """装饰器：把函数耗时计入当前请求的 name 分段（未开启时原样返回函数）"""
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                profile = _current.get()
+                if profile is None:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profile.add_span(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def template_started(self, *args, **kwargs):
+        """模板开始渲染（flask.before_render_template 信号）"""
+        profile = _current.get()
+        if profile is not None:
+            profile._template_starts.append(time.perf_counter())
+
+    def template_finished(self, *args, **kwargs):
+        """模板渲染完成（flask.template_rendered 信号，流式模板在输出完毕后触发）"""
+        profile = _current.get()
+        if profile is not None and profile._template_starts:
+            profile.add_span('render_template', time.perf_counter() - profile._template_starts.pop())
+
+    # ==================== 请求 ====================
+
+    def start(self, route, method, path, sample=True):
+        """开始记录一个请求，返回 RequestProfile（未开启时返回 None）
+
+        sample=True 时在采样分析中跟踪当前线程（请求由这个线程从头处理到尾时才有意义）
+        """
+        if not self.enabled:
+            return None
+        profile = RequestProfile(route, method, path)
+        _current.set(profile)
+        if sample and self.sample_interval:
+            self._ensure_sampler()
+            with self._active_lock:
+                self._active[profile.thread_id] = profile
+        return profile
+
+    def finish(self, profile, status):
+        """请求结束（响应发送完毕）：记入直方图和最慢请求"""
+        if profile is None or profile.duration is not None:
+            return
+        profile.duration = profile.elapsed()
+        profile.status = status
+        with self._active_lock:
+            if self._active.get(profile.thread_id) is profile:
+                del self._active[profile.thread_id]
+        if _current.get() is profile:
+            _current.set(None)
+
+        with self._lock:
+            histogram = self._requests.get(profile.route)
+            if histogram is None:
+                histogram = self._requests[profile.route] = Histogram(self.buckets)
+            histogram.observe(profile.duration)
+            for name, (total, _) in profile.spans.items():
+                histogram = self._spans.get(name)
+                if histogram is None:
+                    histogram = self._spans[name] = Histogram(self.buckets)
+                histogram.observe(total)
+            self._statuses[(profile.route, profile.method, status)] += 1
+
+            if self.slowest_count:
+                entry = (profile.duration, next(self._sequence), profile.summary())
+                if len(self._slowest) < self.slowest_count:
+                    heapq.heappush(self._slowest, entry)
+                elif profile.duration > self._slowest[0][0]:
+                    heapq.heapreplace(self._slowest, entry)
+
+    # ==================== 采样 ====================
+
+    def _ensure_sampler(self):
+        # fork 出的 worker 中没有父进程的线程，按进程各启动一个
+        if self._sampler_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sampler_pid == os.getpid():
+                return
+            self._sampler_pid = os.getpid()
+            self._active = {}
+            threading.Thread(target=self._sample_loop, name='profile-sampler', daemon=True).start()
+
+    def _sample_loop(self):
+        pid = os.getpid()
+        while self._sampler_pid == pid:
+            time.sleep(self.sample_interval)
+            if not self._active:
+                continue
+            frames = sys._current_frames()
+            with self._active_lock:
+                for thread_id, profile in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        profile.samples[self._fold(frame)] += 1
+            del frames
+
+    @staticmethod
+    def _fold(frame):
+        """调用栈 -> 折叠格式（根在前，以 ; 分隔）"""
+        names = []
+        while frame is not None and len(names) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            names.append(f'{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    # ==================== 输出 ====================
+
+    def slowest(self):
+        """最慢的请求（从慢到快）"""
+        with self._lock:
+            return [summary for _, _, summary in sorted(self._slowest, reverse=True)]
+
+    def folded(self):
+        """最慢请求的采样结果，折叠栈格式（每个请求以 "方法 路径" 作为根帧）"""
+        lines = []
+        for summary in self.slowest():
+            root = f"{summary['method']} {summary['path']} ({summary['duration_ms']}ms)".replace(';', ',')
+            for stack, count in summary['stacks'].items():
+                lines.append(f'{root};{stack} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def metrics(self):
+        """Prometheus 文本格式"""
+        lines = [
+            '# HELP web_request_duration_seconds 请求耗时（秒），按路由统计',
+            '# TYPE web_request_duration_seconds histogram',
+        ]
+        with self._lock:
+            for route, histogram in sorted(self._requests.items()):
+                lines.extend(histogram.lines('web_request_duration_seconds', f'route="{_label(route)}"'))
+
+            lines += [
+                '# HELP web_requests_total 请求数，按路由、方法和状态码统计',
+                '# TYPE web_requests_total counter',
+            ]
+            for (route, method, status), count in sorted(self._statuses.items()):
+                lines.append(f'web_requests_total{{route="{_label(route)}",method="{method}",'
+                             f'status="{status}"}} {count}')
+
+            lines += [
+                '# HELP web_span_duration_seconds 单个请求内各分段的累计耗时（秒）',
+                '# TYPE web_span_duration_seconds histogram',
+            ]
+            for name, histogram in sorted(self._spans.items()):
+                lines.extend(histogram.lines('web_span_duration_seconds', f'span="{_label(name)}"'))
+        return '\n'.join(lines) + '\n'
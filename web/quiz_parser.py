@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 测试题解析器
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：单遍扫描解析测试题 Markdown（格式见 docs/QUIZ_MARKDOWN_SPEC.md）
+
+解析分两层：
+    - tokenize()：逐行扫描，切掉总结部分，产出“题目标题”和“正文行”两种记号
+    - QuizParser：状态机，边读记号边维护当前题目的状态，
+      题型、题目文本、选项、答案解析区都在同一遍中完成
+
+可以直接传入文件对象，不需要先把整个文件读进内存：
+
+    with open(path, encoding='utf-8') as f:
+        result = parse_quiz_stream(f)
+
+与原先多遍正则实现的输出逐项一致，可用 scripts/verify_quiz_parser.py 校验。
+"""
+
+import re
+
+
+# 总结 / 答案汇总部分，之后的内容都不参与解析
+SUMMARY_PATTERN = re.compile(r'##+\s*(?:正确答案汇总|测试总结|自我评估|完成时间)', re.IGNORECASE)
+# 题目标题：### 题目1： / ### 问题1： / ### Question 1: / ### [类型:choice] 题目1：
+QUESTION_PATTERN = re.compile(r'###\s*(?:\[类型:(\w+)\])?\s*(?:题目|Question|问题)\s*\d+[:：]?\s*', re.IGNORECASE)
+# 正文第一行的题型标记：[类型:choice]
+TYPE_TAG_PATTERN = re.compile(r'^\[类型:(\w+)\]')
+TYPE_WORD_PATTERN = re.compile(r'(\w+)')
+# 选项：A. 文本（用于推断题型时排除“你的答案：___A”这类行）
+OPTION_DETECT_PATTERN = re.compile(r'^[A-D]\.\s*(?!.*___)')
+OPTION_PATTERN = re.compile(r'^([A-D])\.\s*(.+)')
+ANSWER_LETTER_PATTERN = re.compile(r'[A-D]')
+CORRECT_ANSWER_PREFIX = re.compile(r'^\*\*正确答案\*\*[:：]\s*')
+
+# 题目文本行中不能出现的标记
+NON_QUESTION_MARKERS = ('**正确答案', '**你的答案', '正确答案', '你的答案', '**解析', '解析：')
+# 进入答案解析区的标记
+ANSWER_MARKERS = ('**正确答案', '正确答案：', '正确答案:')
+# 答案解析区结束的标记
+ANSWER_END_PREFIXES = ('**你的掌握情况', '你的掌握情况')
+
+# 解析最多保留的行数
+MAX_EXPLANATION_LINES = 5
+
+# 记号类型
+HEADER = 'header'
+LINE = 'line'
+
+
+def tokenize(lines):
+    """逐行扫描，产出 (HEADER, None) 和 (LINE, 文本)
+
+    遇到总结部分时截断并停止；空文本不产出（空行对解析没有影响）。
+    """
+    for line in lines:
+        line = line.rstrip('\n')
+
+        summary = SUMMARY_PATTERN.search(line)
+        if summary:
+            line = line[:summary.start()]
+
+        pos = 0
+        for match in QUESTION_PATTERN.finditer(line):
+            if match.start() > pos:
+                yield LINE, line[pos:match.start()]
+            yield HEADER, None
+            pos = match.end()
+        if pos < len(line):
+            yield LINE, line[pos:]
+
+        if summary:
+            return
+
+
+class _QuestionState:
+    """正在解析的一道题"""
+
+    __slots__ = ('number', 'started', 'type', 'text', 'has_options',
+                 'options', 'answer_lines', 'in_answer', 'answer_done')
+
+    def __init__(self, number):
+        self.number = number
+        self.started = False      # 是否已读到第一行非空正文
+        self.type = None          # 显式标记的题型
+        self.text = None
+        self.has_options = False
+        self.options = {}
+        self.answer_lines = []
+        self.in_answer = False
+        self.answer_done = False
+
+    def feed(self, line):
+        """处理一行正文"""
+        stripped = line.strip()
+        if not stripped:
+            return
+
+        # 第一行可能是题型标记，标记行本身不参与后续解析
+        if not self.started:
+            self.started = True
+            type_match = TYPE_TAG_PATTERN.match(stripped)
+            if type_match:
+                self.type = type_match.group(1)
+                return
+            elif stripped.startswith('[类型:'):
+                self.type = TYPE_WORD_PATTERN.search(stripped).group(1)
+                return
+
+        # 题目文本：第一行非标记、非答案的行
+        if self.text is None and not stripped.startswith('[') and \
+                not any(marker in stripped for marker in NON_QUESTION_MARKERS):
+            self.text = stripped.replace('**', '').strip()
+
+        # 选项（是否为选择题要等整题读完才能确定，先收集）
+        if OPTION_DETECT_PATTERN.match(stripped):
+            self.has_options = True
+        option_match = OPTION_PATTERN.match(stripped)
+        if option_match:
+            text = option_match.group(2)
+            if not text.startswith('___') and not text.startswith('**你的答案'):
+                self.options[option_match.group(1)] = text
+
+        # 答案解析区
+        if self.answer_done:
+            return
+        if any(marker in stripped for marker in ANSWER_MARKERS):
+            self.in_answer = True
+            self.answer_lines.append(stripped)
+        elif self.in_answer:
+            if stripped.startswith(ANSWER_END_PREFIXES):
+                self.answer_done = True
+            else:
+                self.answer_lines.append(stripped)
+
+    def finish(self):
+        """整题读完，返回题目字典；没有题目文本时返回 None"""
+        if not self.text:
+            return None
+
+        question_type = self.type or ('choice' if self.has_options else 'open')
+
+        correct_answer = None
+        if question_type == 'choice':
+            answer_match = ANSWER_LETTER_PATTERN.search(' '.join(self.answer_lines))
+            if answer_match:
+                correct_answer = answer_match.group(0)
+
+        explanation_lines = []
+        for line in self.answer_lines:
+            clean_line = line.replace('**正确答案**', '').replace('**解析**', '')
+            clean_line = CORRECT_ANSWER_PREFIX.sub('', clean_line)
+            clean_line = clean_line.replace('👆', '').strip()
+            if len(clean_line) > 1:  # 过滤单字符
+                explanation_lines.append(clean_line)
+
+        return {
+            'id': f'q{self.number}',
+            'number': self.number,
+            'type': question_type,
+            'text': self.text,
+            'options': self.options if question_type == 'choice' else {},
+            'correct_answer': correct_answer,
+            'explanation': '\n'.join(explanation_lines[:MAX_EXPLANATION_LINES])
+        }
+
+
+class QuizParser:
+    """测试题解析状态机：feed() 逐个接收记号，result() 返回解析结果"""
+
+    def __init__(self):
+        self.count = 0            # 题目标题数（与 count_questions 一致）
+        self.questions = []
+        self.answers = {}
+        self.explanations = {}
+        self._current = None
+
+    def feed(self, kind, text):
+        if kind == HEADER:
+            self._finish_current()
+            self.count += 1
+            self._current = _QuestionState(self.count)
+        elif self._current is not None:
+            # 第一个题目之前的内容忽略
+            self._current.feed(text)
+
+    def _finish_current(self):
+        if self._current is None:
+            return
+        question = self._current.finish()
+        self._current = None
+        if question is None:
+            return
+
+        self.questions.append(question)
+        if question['correct_answer']:
+            self.answers[question['id']] = question['correct_answer']
+        if question['explanation']:
+            self.explanations[question['id']] = question['explanation']
+
+    def result(self):
+        self._finish_current()
+        return {
+            'questions': self.questions,
+            'answers': self.answers,
+            'explanations': self.explanations,
+            'count': self.count
+        }
+
+
+def parse_quiz_stream(lines):
+    """解析测试题（lines 可以是文件对象或任意行迭代器）
+
+    返回 {'questions', 'answers', 'explanations', 'count'}
+    """
+    parser = QuizParser()
+    for kind, text in tokenize(lines):
+        parser.feed(kind, text)
+    return parser.result()
+
+
+def parse_quiz_text(content):
+    """解析测试题文本"""
+    return parse_quiz_stream(content.split('\n'))
+
+
+def count_questions_stream(lines):
+    """只统计题目标题数，不解析题目内容"""
+    return sum(1 for kind, _ in tokenize(lines) if kind == HEADER)
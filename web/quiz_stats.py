@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 测试题统计
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：增量维护每套测试题的答题分布、正确率和完成情况，持久化在 SQLite 中
+
+维护的聚合（写入时按增量更新，不扫描已保存的答案）：
+    - answer_counts：每道题每个选项当前有多少人选（A-D，其他答案归入 '*'），
+      用户改答案时旧选项减一、新选项加一
+    - quiz_totals：作答人数、完成（提交过）人数、提交次数、得分百分比之和
+    - completions：提交过的 (测试题, 用户)，用于判断是否首次完成
+
+正确人数在读取时按当前答案从 answer_counts 中取，修正答案后统计自动正确。
+读取只查询该测试题的几十行聚合数据，与学习者数量无关。
+"""
+
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+from grading import CHOICES
+
+
+# 非 A-D 的答案（开放题文本等）统一计入这个桶
+OTHER = '*'
+
+
+def answer_bucket(answer):
+    return answer if isinstance(answer, str) and answer in CHOICES else OTHER
+
+
+class QuizStats:
+    """测试题统计（SQLite）"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS answer_counts (
+            quiz_file   TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            answer      TEXT NOT NULL,
+            count       INTEGER NOT NULL,
+            PRIMARY KEY (quiz_file, question_id, answer)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS quiz_totals (
+            quiz_file      TEXT PRIMARY KEY,
+            learners       INTEGER NOT NULL DEFAULT 0,
+            completions    INTEGER NOT NULL DEFAULT 0,
+            submissions    INTEGER NOT NULL DEFAULT 0,
+            percentage_sum REAL NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS completions (
+            quiz_file TEXT NOT NULL,
+            user      TEXT NOT NULL,
+            PRIMARY KEY (quiz_file, user)
+        ) WITHOUT ROWID;
+    """
+
+    ADD_COUNT = """
+        INSERT INTO answer_counts (quiz_file, question_id, answer, count) VALUES (?, ?, ?, ?)
+        ON CONFLICT (quiz_file, question_id, answer) DO UPDATE SET count = count + excluded.count
+    """
+
+    ADD_TOTALS = """
+        INSERT INTO quiz_totals (quiz_file, learners, completions, submissions, percentage_sum)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (quiz_file) DO UPDATE SET
+            learners = learners + excluded.learners,
+            completions = completions + excluded.completions,
+            submissions = submissions + excluded.submissions,
+            percentage_sum = percentage_sum + excluded.percentage_sum
+    """
+
+    def __init__(self, db_path, pool_size=2):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.pool_size = pool_size
+        self.created = not self.db_path.exists()
+        self._pool = self._create_pool()
+
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _create_pool(self):
+        pool = queue.Queue()
+        for _ in range(self.pool_size):
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            pool.put(conn)
+        return pool
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._pool.put(conn)
+
+    def after_fork(self):
+        self._pool = self._create_pool()
+
+    # ==================== 写 ====================
+
+    def attach(self, conn):
+        """把统计库以 stats 附加到另一个 SQLite 连接上（须在事务外调用，已附加时跳过）
+
+        附加后未加库名的 answer_counts 等表名解析到统计库，
+        SQLite 答案存储借此在一个事务里完成读旧答案、保存和统计增量。
+        """
+        if not any(row[1] == 'stats' for row in conn.execute('PRAGMA database_list')):
+            conn.execute('ATTACH DATABASE ? AS stats', (str(self.db_path),))
+
+    def record_answers(self, entries, previous):
+        """记录一批答案保存
+
+        entries: [(quiz_file, question_id, answer), ...]
+        previous: {quiz_file: {question_id: answer}}，保存前该用户的答案
+        """
+        with self._connection() as conn:
+            self.record_answers_in(conn, entries, previous)
+
+    def record_answers_in(self, conn, entries, previous):
+        """在调用方的事务中记录一批答案保存（conn 是统计库连接，或已经 attach 了统计库）"""
+        deltas = {}
+        new_learners = {}
+        current = {}
+        for quiz_file, question_id, answer in entries:
+            if quiz_file not in current:
+                current[quiz_file] = dict(previous.get(quiz_file) or {})
+                if not current[quiz_file]:
+                    new_learners[quiz_file] = 1
+
+            old = current[quiz_file].get(question_id)
+            if old is not None:
+                key = (quiz_file, question_id, answer_bucket(old))
+                deltas[key] = deltas.get(key, 0) - 1
+            key = (quiz_file, question_id, answer_bucket(answer))
+            deltas[key] = deltas.get(key, 0) + 1
+            current[quiz_file][question_id] = answer
+
+        rows = [key + (delta,) for key, delta in deltas.items() if delta]
+        conn.executemany(self.ADD_COUNT, rows)
+        conn.executemany(self.ADD_TOTALS, [
+            (quiz_file, count, 0, 0, 0) for quiz_file, count in new_learners.items()
+        ])
+
+    def record_submission(self, quiz_file, user, score):
+        """记录一次提交（score 为评分结果中的 score）"""
+        with self._connection() as conn:
+            first = conn.execute(
+                'INSERT OR IGNORE INTO completions (quiz_file, user) VALUES (?, ?)', (quiz_file, user)
+            ).rowcount
+            conn.execute(self.ADD_TOTALS, (quiz_file, 0, first, 1, score['percentage']))
+
+    def rebuild(self, answers):
+        """按已保存的全部答案重建答题分布和作答人数（完成情况无法从答案中恢复，保持不变）
+
+        answers: 可迭代的 (user, quiz_file, question_id, answer)
+        """
+        counts = {}
+        learners = {}
+        for user, quiz_file, question_id, answer in answers:
+            key = (quiz_file, question_id, answer_bucket(answer))
+            counts[key] = counts.get(key, 0) + 1
+            learners.setdefault(quiz_file, set()).add(user)
+
+        with self._connection() as conn:
+            conn.execute('DELETE FROM answer_counts')
+            conn.execute('UPDATE quiz_totals SET learners = 0')
+            conn.executemany(self.ADD_COUNT, [key + (count,) for key, count in counts.items()])
+            conn.executemany(self.ADD_TOTALS, [
+                (quiz_file, len(users), 0, 0, 0) for quiz_file, users in learners.items()
+            ])
+
+    # ==================== 读 ====================
+
+    def report(self, quiz_file, quiz_data):
+        """一套测试题的统计"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                'SELECT question_id, answer, count FROM answer_counts WHERE quiz_file = ?', (quiz_file,)
+            ).fetchall()
+            totals = conn.execute(
+                'SELECT learners, completions, submissions, percentage_sum FROM quiz_totals '
+                'WHERE quiz_file = ?', (quiz_file,)
+            ).fetchone() or (0, 0, 0, 0)
+
+        counts = {}
+        for question_id, answer, count in rows:
+            counts.setdefault(question_id, {})[answer] = count
+
+        learners, completions, submissions, percentage_sum = totals
+        questions = []
+        for q in quiz_data['questions']:
+            question_counts = counts.get(q['id'], {})
+            answered = sum(question_counts.values())
+            correct_answer = quiz_data['answers'].get(q['id'])
+            graded = q.get('type') == 'choice' and bool(correct_answer)
+            correct = question_counts.get(correct_answer, 0) if graded else None
+
+            questions.append({
+                'id': q['id'],
+                'number': q['number'],
+                'type': q.get('type', 'choice'),
+                'answered': answered,
+                'completion_rate': round(answered / learners, 4) if learners else None,
+                'distribution': {choice: question_counts.get(choice, 0) for choice in CHOICES}
+                                if q.get('type') == 'choice' else {},
+                'other': question_counts.get(OTHER, 0),
+                'correct_answer': correct_answer,
+                'correct': correct,
+                'correct_rate': round(correct / answered, 4) if graded and answered else None
+            })
+
+        return {
+            'quiz_file': quiz_file,
+            'title': quiz_data['title'],
+            'learners': learners,
+            'completions': completions,
+            'submissions': submissions,
+            'average_percentage': round(percentage_sum / submissions, 1) if submissions else 0,
+            'questions': questions
+        }
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 离线重新评分
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：修正测试题答案后，用当前答案为所有已保存的作答重新评分
+
+运行方式：
+    python web/app.py regrade                                   # 所有测试题
+    python web/app.py regrade --quiz examples/phase01_basics/quizzes/01_basics_quiz.md
+    python web/app.py regrade --out regrade_report.json         # 输出完整报告
+
+每套测试题的所有作答编码成一个提交矩阵，用 grading.AnswerKey 一次向量化评分。
+报告包含每个用户的得分、每道题的正确率（难度）和各选项人数。
+"""
+
+import json
+import time
+from pathlib import Path
+
+import app as webapp
+from grading import percentage
+
+
+def load_submissions(quiz_file=None):
+    """从答案存储读取作答：{quiz_file: {user: {question_id: answer}}}"""
+    by_quiz = {}
+    for user, quiz, question_id, answer in webapp.answer_store.iter_answers(quiz_file):
+        by_quiz.setdefault(quiz, {}).setdefault(user, {})[question_id] = answer
+    return by_quiz
+
+
+def regrade_quiz(quiz_file, submissions):
+    """为一套测试题的全部作答重新评分"""
+    quiz_data = webapp.parse_quiz(quiz_file)
+    answer_key = quiz_data['answer_key']
+    users = sorted(submissions)
+    result = answer_key.grade_batch([submissions[user] for user in users])
+
+    return {
+        'quiz_file': quiz_file,
+        'title': quiz_data['title'],
+        'summary': result.summary(),
+        'users': {
+            user: {'correct': score, 'percentage': percentage(score, answer_key.size)}
+            for user, score in zip(users, result.scores.tolist())
+        },
+        'questions': result.question_stats()
+    }
+
+
+def regrade(quiz_file=None, out=None):
+    """重新评分并打印概况，返回每套测试题的报告"""
+    start = time.perf_counter()
+    reports = []
+
+    for quiz, submissions in sorted(load_submissions(quiz_file).items()):
+        try:
+            report = regrade_quiz(quiz, submissions)
+        except FileNotFoundError:
+            print(f"⚠️  跳过 {quiz}：测试题文件不存在")
+            continue
+        reports.append(report)
+
+        summary = report['summary']
+        print(f"📝 {report['title']}（{quiz}）")
+        print(f"   作答 {summary['submissions']} 份，平均 {summary['mean_percentage']}%，"
+              f"中位数 {summary['median_percentage']}%")
+
+        graded = [q for q in report['questions'] if q['graded'] and q['answered']]
+        hardest = sorted(graded, key=lambda q: q['correct_rate'])[:3]
+        if hardest:
+            print("   正确率最低：" + "，".join(
+                f"{q['id']} {q['correct_rate'] * 100:.1f}%" for q in hardest))
+
+    if out:
+        Path(out).write_text(json.dumps(reports, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"📄 报告已写入 {out}")
+
+    total = sum(r['summary']['submissions'] for r in reports)
+    print(f"✅ 重新评分完成：{len(reports)} 套测试题，{total} 份作答，"
+          f"耗时 {(time.perf_counter() - start) * 1000:.0f}ms")
+    return reports
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 全文搜索
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：讲义和测试题的倒排索引，BM25 排序，返回带高亮的摘要
+
+分词（中英文混排）：
+    - 英文、数字、下划线按词切分并转小写：StateGraph -> stategraph
+    - 连续的中日韩字符同时切成单字和相邻二字：状态图 -> 状 态 图 状态 态图
+      查询时两个字以上的片段只用二字词，单字查询用单字
+
+索引按来源文件组织：一个文件对应一个或多个文档（讲义一篇一个文档，测试题一题一个文档），
+文件变化时只删除并重建这个文件的文档。
+"""
+
+import heapq
+import html
+import math
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from cache import file_signature
+
+
+CJK_RANGES = r'\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+TOKEN_PATTERN = re.compile(rf'[{CJK_RANGES}]+|[a-z0-9_]+')
+CJK_PATTERN = re.compile(rf'[{CJK_RANGES}]')
+
+# 摘要长度（字符）
+SNIPPET_WIDTH = 120
+
+
+def tokenize(text):
+    """文档分词"""
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        run = match.group(0)
+        if CJK_PATTERN.match(run):
+            yield from run
+            for i in range(len(run) - 1):
+                yield run[i:i + 2]
+        else:
+            yield run
+
+
+def tokenize_query(query):
+    """查询分词，返回 (检索词, 高亮词)"""
+    terms = []
+    highlights = []
+    for match in TOKEN_PATTERN.finditer(query.lower()):
+        run = match.group(0)
+        highlights.append(run)
+        if CJK_PATTERN.match(run) and len(run) > 1:
+            bigrams = [run[i:i + 2] for i in range(len(run) - 1)]
+            terms.extend(bigrams)
+            highlights.extend(bigrams)
+        else:
+            terms.append(run)
+    return list(dict.fromkeys(terms)), list(dict.fromkeys(highlights))
+
+
+def make_snippet(text, highlights, width=SNIPPET_WIDTH):
+    """截取匹配最密集的一段文本，匹配处用 <mark> 标出（返回 HTML）"""
+    if not highlights:
+        return html.escape(text[:width])
+
+    pattern = re.compile('|'.join(re.escape(h) for h in sorted(highlights, key=len, reverse=True)),
+                         re.IGNORECASE)
+    matches = [m.span() for _, m in zip(range(200), pattern.finditer(text))]
+    if not matches:
+        return html.escape(text[:width]) + ('…' if len(text) > width else '')
+
+    # 找包含匹配最多的窗口
+    best_start, best_count = matches[0][0], 0
+    end_index = 0
+    for i, (start, _) in enumerate(matches):
+        while end_index < len(matches) and matches[end_index][1] <= start + width:
+            end_index += 1
+        if end_index - i > best_count:
+            best_start, best_count = start, end_index - i
+
+    start = max(0, best_start - width // 4)
+    end = min(len(text), start + width)
+    window = text[start:end]
+
+    parts = []
+    pos = 0
+    for match in pattern.finditer(window):
+        parts.append(html.escape(window[pos:match.start()]))
+        parts.append(f'<mark>{html.escape(match.group(0))}</mark>')
+        pos = match.end()
+    parts.append(html.escape(window[pos:]))
+
+    return ('…' if start > 0 else '') + ''.join(parts) + ('…' if end < len(text) else '')
+
+
+class SearchIndex:
+    """倒排索引
+
+    sources() 返回 {文件路径: 加载函数}，加载函数把文件转换成文档列表
+    [{'kind', 'title', 'url', 'text'}, ...]。
+
+    build() / sync() 按文件签名增量更新。没有内容监听时，查询前最多每隔 sync_interval 秒
+    sync() 一次（扫描所有内容文件）；启用内容监听后（validate=False），查询时不再扫描文件，
+    由监听线程调用 refresh() 更新单个文件。
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, sources, sync_interval=2.0):
+        self._sources_func = sources
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._postings = {}      # 词 -> {文档 id: 词频}
+        self._docs = {}          # 文档 id -> (文档, 文档长度, 包含的词)
+        self._files = {}         # 文件路径 -> (签名, [文档 id, ...])
+        self._total_length = 0
+        self._next_id = 0
+        self.built = False
+        self.validate = True
+        self._synced_at = 0.0
+
+    # ==================== 建索引 ====================
+
+    def _add(self, doc):
+        counts = Counter(tokenize(doc['title'] + '\n' + doc['text']))
+        length = sum(counts.values())
+        doc_id = self._next_id
+        self._next_id += 1
+
+        self._docs[doc_id] = (doc, length, tuple(counts))
+        self._total_length += length
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        return doc_id
+
+    def _remove(self, doc_id):
+        _, length, terms = self._docs.pop(doc_id)
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def _index_file(self, path, loader, signature):
+        self._remove_file(path)
+        doc_ids = [self._add(doc) for doc in loader(path)]
+        self._files[path] = (signature, doc_ids)
+
+    def _remove_file(self, path):
+        _, doc_ids = self._files.pop(path, (None, []))
+        for doc_id in doc_ids:
+            self._remove(doc_id)
+
+    def sync(self):
+        """按文件签名同步：只重建新增和变化的文件，删除已不存在的文件，返回变化的文件数"""
+        with self._lock:
+            sources = self._sources_func()
+            changed = 0
+            for path, loader in sources.items():
+                try:
+                    signature = file_signature(path)
+                    if self._files.get(path, (None,))[0] != signature:
+                        self._index_file(path, loader, signature)
+                        changed += 1
+                except FileNotFoundError:
+                    continue
+            for path in self._files.keys() - sources.keys():
+                self._remove_file(path)
+                changed += 1
+            self.built = True
+            self._synced_at = time.monotonic()
+            return changed
+
+    build = sync
+
+    def _stale(self):
+        if not self.built:
+            return True
+        return self.validate and time.monotonic() - self._synced_at >= self.sync_interval
+
+    def sync_if_stale(self):
+        """距上次 sync() 超过 sync_interval 秒（且没有内容监听）时同步一次"""
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    self.sync()
+
+    def refresh(self, path, loader):
+        """单个文件变化后更新索引（由内容监听调用）"""
+        path = Path(path)
+        with self._lock:
+            try:
+                self._index_file(path, loader, file_signature(path))
+            except FileNotFoundError:
+                self._remove_file(path)
+
+    # ==================== 查询 ====================
+
+    def search(self, query, limit=10, kind=None):
+        """BM25 排序的搜索结果"""
+        start = time.perf_counter()
+        self.sync_if_stale()
+
+        terms, highlights = tokenize_query(query)
+        with self._lock:
+            count = len(self._docs)
+            avg_length = self._total_length / count if count else 0
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length = self._docs[doc_id][1]
+                    norm = self.K1 * (1 - self.B + self.B * length / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0) + idf * tf * (self.K1 + 1) / (tf + norm)
+
+            if kind:
+                scores = {doc_id: s for doc_id, s in scores.items() if self._docs[doc_id][0]['kind'] == kind}
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            docs = [(self._docs[doc_id][0], score) for doc_id, score in top]
+
+        results = [{
+            'kind': doc['kind'],
+            'title': doc['title'],
+            'url': doc['url'],
+            'score': round(score, 4),
+            'snippet': make_snippet(doc['text'], highlights)
+        } for doc, score in docs]
+
+        return {
+            'query': query,
+            'total': len(scores),
+            'results': results,
+            'took_ms': round((time.perf_counter() - start) * 1000, 2)
+        }
+
+    def stats(self):
+        return {
+            'files': len(self._files),
+            'documents': len(self._docs),
+            'terms': len(self._postings)
+        }
@@ -4,17 +4,155 @@
 let currentMode = 'single'; // 'single' 或 'all'
 let currentQuestionIndex = 1; // 当前题目索引（从1开始）
 let answeredCount = 0;
-const totalQuestions = document.querySelectorAll('.question-card').length;
+const quizPage = document.querySelector('.quiz-page');
+// 题目总数：一题一页模式的页面只带前几题，总数由模板给出
+const totalQuestions = parseInt(quizPage.dataset.total) || document.querySelectorAll('.question-card').length;
 
 // 页面加载时
 document.addEventListener('DOMContentLoaded', () => {
     updateProgress();
     updateNavigation();
+    prefetchQuestions();
 });
 
+// ==================== 分页加载 ====================
+
+// 一题一页模式首屏只渲染前 PAGE_SIZE 题，其余题目从 /api/quiz/<path>/questions 按页获取，
+// 做到接近已加载的最后一题时预取下一页
+const PAGE_SIZE = parseInt(quizPage.dataset.pageSize) || totalQuestions;
+const PREFETCH_AHEAD = 2; // 距离已加载的最后一题还剩几题时开始预取
+let pageRequest = null;
+
+function loadedCount() {
+    return document.querySelectorAll('.question-card').length;
+}
+
+function loadNextPage() {
+    const offset = loadedCount();
+    if (pageRequest || offset >= totalQuestions) {
+        return pageRequest || Promise.resolve();
+    }
+
+    pageRequest = (async () => {
+        try {
+            const params = new URLSearchParams({ offset: offset, limit: PAGE_SIZE });
+            const response = await fetch(`/api/quiz/${encodeURI(QUIZ_FILE)}/questions?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+
+            const data = await response.json();
+            data.questions.forEach((question, i) => appendQuestionCard(question, offset + i + 1));
+            updateProgress();
+        } catch (error) {
+            console.error('加载题目失败:', error);
+        } finally {
+            pageRequest = null;
+        }
+    })();
+    return pageRequest;
+}
+
+async function ensureQuestionsLoaded(count) {
+    // 加载到第 count 题为止，加载失败时返回 false
+    while (loadedCount() < Math.min(count, totalQuestions)) {
+        const before = loadedCount();
+        await loadNextPage();
+        if (loadedCount() === before) {
+            return false;
+        }
+    }
+    return true;
+}
+
+function prefetchQuestions() {
+    if (currentQuestionIndex + PREFETCH_AHEAD >= loadedCount()) {
+        loadNextPage();
+    }
+}
+
+function createElement(tag, className, text) {
+    const element = document.createElement(tag);
+    if (className) {
+        element.className = className;
+    }
+    if (text !== undefined) {
+        element.textContent = text;
+    }
+    return element;
+}
+
+function appendQuestionCard(question, index) {
+    // 与 quiz_single.html 中服务端渲染的题目卡片结构相同
+    const modeClass = currentMode === 'all' ? 'all-mode active' : 'single-mode';
+    const card = createElement('div', `question-card ${modeClass}`);
+    card.id = `question-${index}`;
+    card.dataset.questionId = question.id;
+    card.dataset.questionType = question.type;
+    const savedAnswer = (typeof userAnswers !== 'undefined' && userAnswers[question.id]) || '';
+
+    const header = createElement('div', 'question-header');
+    const number = createElement('span', 'question-number', `题目 ${question.number} `);
+    if (question.type === 'choice' || question.type === 'open') {
+        number.appendChild(createElement('span', `question-type-badge ${question.type}`,
+            question.type === 'choice' ? '选择题' : '开放题'));
+    }
+    const status = createElement('span', 'question-status');
+    status.id = `status-${question.id}`;
+    header.append(number, status);
+    card.append(header, createElement('div', 'question-text', question.text));
+
+    if (question.type === 'choice') {
+        const options = createElement('div', 'question-options');
+        Object.entries(question.options).forEach(([letter, text]) => {
+            const label = createElement('label', 'option-label');
+            const input = document.createElement('input');
+            input.type = 'radio';
+            input.name = question.id;
+            input.value = letter;
+            input.checked = savedAnswer === letter;
+            input.addEventListener('change', () => saveAnswer(question.id, letter));
+            label.append(input, createElement('span', 'option-letter', `${letter}.`),
+                createElement('span', 'option-text', text));
+            options.appendChild(label);
+        });
+        card.appendChild(options);
+    } else if (question.type === 'open') {
+        const openAnswer = createElement('div', 'question-open-answer');
+        const textarea = createElement('textarea', 'open-answer-input');
+        textarea.id = `answer-${question.id}`;
+        textarea.placeholder = '写下你的理解...';
+        textarea.rows = 4;
+        textarea.value = savedAnswer;
+        textarea.addEventListener('change', () => saveOpenAnswer(question.id, textarea.value));
+
+        const button = createElement('button', 'btn btn-secondary btn-sm');
+        button.append(createElement('span', 'toggle-icon', '👁️'), ' 查看答案');
+        button.addEventListener('click', () => toggleExplanation(question.id));
+
+        const explanation = createElement('div', 'explanation-box');
+        explanation.id = `explanation-${question.id}`;
+        explanation.style.display = 'none';
+        explanation.appendChild(createElement('h4', null, '✅ 正确答案'));
+        const content = createElement('div', 'explanation-content');
+        content.innerHTML = question.explanation;
+        explanation.appendChild(content);
+
+        openAnswer.append(textarea, button, explanation);
+        card.appendChild(openAnswer);
+    }
+
+    document.getElementById('questionsContainer').appendChild(card);
+}
+
 // ==================== 题目导航 ====================
 
-function goToQuestion(index) {
+async function goToQuestion(index) {
+    // 跳到还没加载的题目时先加载到这一题
+    if (index > loadedCount() && !await ensureQuestionsLoaded(index)) {
+        return;
+    }
+
     // 隐藏当前题目
     document.querySelectorAll('.question-card').forEach(card => {
         card.classList.remove('active');
@@ -31,6 +169,7 @@ function goToQuestion(index) {
 
         // 滚动到题目顶部
         targetCard.scrollIntoView({ behavior: 'smooth', block: 'start' });
+        prefetchQuestions();
     }
 }
 
@@ -65,11 +204,17 @@ function updateNavigation() {
 
 // ==================== 模式切换 ====================
 
-function switchMode(mode) {
+async function switchMode(mode) {
+    const button = event.target;
+    if (mode === 'all') {
+        // 全部显示前先加载剩余题目
+        await ensureQuestionsLoaded(totalQuestions);
+    }
+
     currentMode = mode;
     const buttons = document.querySelectorAll('.mode-btn');
     buttons.forEach(btn => btn.classList.remove('active'));
-    event.target.classList.add('active');
+    button.classList.add('active');
 
     const questionCards = document.querySelectorAll('.question-card');
     const questionNav = document.getElementById('questionNav');
@@ -97,46 +242,103 @@ function switchMode(mode) {
 
 // ==================== 答案保存 ====================
 
-async function saveAnswer(questionId, answer) {
-    try {
-        const response = await fetch('/api/save', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                quiz_file: QUIZ_FILE,
-                question_id: questionId,
-                answer: answer
-            })
-        });
+// 待保存的答案先放入队列，定时或在页面隐藏/提交时批量写入
+const FLUSH_INTERVAL = 3000; // 批量保存间隔（毫秒）
+const pendingAnswers = new Map(); // questionId -> answer（同一题只保留最新答案）
+let flushPromise = null;
 
-        if (response.ok) {
-            const data = await response.json();
-            console.log('已保存:', data.saved_at);
+function saveAnswer(questionId, answer) {
+    pendingAnswers.set(questionId, answer);
+    if (typeof userAnswers !== 'undefined') {
+        userAnswers[questionId] = answer;
+    }
 
-            // 更新进度
-            updateProgress();
+    // 进度立即更新，不等待保存完成
+    updateProgress();
+}
 
-            // 显示保存提示
-            showSaveNotification(questionId);
+function saveOpenAnswer(questionId, answer) {
+    // 开放性问题同样进入队列，频繁修改只会保存最后一次
+    saveAnswer(questionId, answer);
+}
+
+function takePendingAnswers() {
+    const batch = [];
+    pendingAnswers.forEach((answer, questionId) => {
+        if (answer) {
+            batch.push({ quiz_file: QUIZ_FILE, question_id: questionId, answer: answer });
         }
-    } catch (error) {
-        console.error('保存失败:', error);
+    });
+    pendingAnswers.clear();
+    return batch;
+}
+
+async function flushAnswers() {
+    // 上一次保存还没完成时，先等它结束
+    if (flushPromise) {
+        await flushPromise;
+    }
+
+    const batch = takePendingAnswers();
+    if (batch.length === 0) {
+        return;
     }
+
+    flushPromise = (async () => {
+        try {
+            const response = await fetch('/api/save/batch', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ answers: batch })
+            });
+
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+
+            const data = await response.json();
+            console.log(`已保存 ${data.count} 个答案:`, data.saved_at);
+            batch.forEach(item => showSaveNotification(item.question_id));
+        } catch (error) {
+            console.error('保存失败:', error);
+            // 放回队列等待下次保存（期间有新答案的题目以新答案为准）
+            batch.forEach(item => {
+                if (!pendingAnswers.has(item.question_id)) {
+                    pendingAnswers.set(item.question_id, item.answer);
+                }
+            });
+        } finally {
+            flushPromise = null;
+        }
+    })();
+
+    await flushPromise;
 }
 
-async function saveOpenAnswer(questionId, answer) {
-    // 开放性问题使用防抖保存，避免每次输入都保存
-    if (window.saveTimeout) {
-        clearTimeout(window.saveTimeout);
+function flushAnswersOnExit() {
+    // 页面关闭/切到后台时用 sendBeacon，浏览器会在卸载后继续发送
+    const batch = takePendingAnswers();
+    if (batch.length === 0) {
+        return;
     }
 
-    window.saveTimeout = setTimeout(async () => {
-        await saveAnswer(questionId, answer);
-    }, 1000); // 1秒后保存
+    const payload = new Blob([JSON.stringify({ answers: batch })], { type: 'application/json' });
+    if (!navigator.sendBeacon || !navigator.sendBeacon('/api/save/batch', payload)) {
+        fetch('/api/save/batch', { method: 'POST', body: payload, keepalive: true });
+    }
 }
 
+setInterval(flushAnswers, FLUSH_INTERVAL);
+
+document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') {
+        flushAnswersOnExit();
+    }
+});
+window.addEventListener('pagehide', flushAnswersOnExit);
+
 function toggleExplanation(questionId) {
     const explanationBox = document.getElementById(`explanation-${questionId}`);
     if (explanationBox) {
@@ -159,30 +361,48 @@ function showSaveNotification(questionId) {
 
 // ==================== 进度更新 ====================
 
+function questionIds() {
+    // 一题一页模式从题目导航取全部题目（包括还没加载的），全部显示模式从题目卡片取
+    const navItems = document.querySelectorAll('.question-nav-item[data-question-id]');
+    const source = navItems.length ? navItems : document.querySelectorAll('.question-card');
+    return Array.from(source, element => element.dataset.questionId);
+}
+
+function questionCard(questionId) {
+    return document.querySelector(`.question-card[data-question-id="${questionId}"]`);
+}
+
+function isAnswered(questionId) {
+    const card = questionCard(questionId);
+    if (!card) {
+        // 还没加载的题目按已保存的答案判断
+        return typeof userAnswers !== 'undefined' && Boolean(userAnswers[questionId]);
+    }
+    const hasRadioAnswer = card.querySelector(`input[type="radio"]:checked`);
+    const textarea = card.querySelector('textarea');
+    const hasOpenAnswer = textarea && textarea.value.trim();
+    return Boolean(hasRadioAnswer || hasOpenAnswer);
+}
+
 function updateProgress() {
-    const total = document.querySelectorAll('.question-card').length;
+    const total = totalQuestions;
 
     // 统计已答题数（包括选择题和开放题）
     let answered = 0;
-    document.querySelectorAll('.question-card').forEach((card, index) => {
-        const questionId = card.dataset.questionId;
-        const hasRadioAnswer = card.querySelector(`input[type="radio"]:checked`);
-        const textarea = card.querySelector('textarea');
-        const hasOpenAnswer = textarea && textarea.value.trim();
-
-        const isAnswered = hasRadioAnswer || hasOpenAnswer;
+    questionIds().forEach((questionId, index) => {
+        const answeredNow = isAnswered(questionId);
 
         // 更新题目导航的状态
         const navItem = document.querySelector(`.question-nav-item[data-question-index="${index + 1}"]`);
         if (navItem) {
-            if (isAnswered) {
+            if (answeredNow) {
                 navItem.classList.add('answered');
             } else {
                 navItem.classList.remove('answered');
             }
         }
 
-        if (isAnswered) {
+        if (answeredNow) {
             answered++;
         }
     });
@@ -198,9 +418,28 @@ function updateProgress() {
 
 // ==================== 提交答案 ====================
 
+function collectChoiceAnswers() {
+    // 已加载的题目取选中的选项，还没加载的选择题取已保存的答案
+    const answers = {};
+    document.querySelectorAll('.question-nav-item[data-question-type="choice"]').forEach(item => {
+        const saved = typeof userAnswers !== 'undefined' && userAnswers[item.dataset.questionId];
+        if (saved && !questionCard(item.dataset.questionId)) {
+            answers[item.dataset.questionId] = saved;
+        }
+    });
+    document.querySelectorAll('.question-card').forEach(q => {
+        const selected = q.querySelector(`input[type="radio"]:checked`);
+        if (selected) {
+            answers[q.dataset.questionId] = selected.value;
+        }
+    });
+    return answers;
+}
+
 async function submitQuiz() {
-    const answered = document.querySelectorAll('input[type="radio"]:checked').length;
-    const total = document.querySelectorAll('.question-card').length;
+    const answers = collectChoiceAnswers();
+    const answered = Object.keys(answers).length;
+    const total = totalQuestions;
 
     if (answered === 0) {
         alert('请先回答至少一道题！');
@@ -211,18 +450,8 @@ async function submitQuiz() {
         return;
     }
 
-    // 收集答案
-    const questions = document.querySelectorAll('.question-card');
-    const answers = {};
-
-    questions.forEach(q => {
-        const questionId = q.dataset.questionId;
-        const selected = q.querySelector(`input[type="radio"]:checked`);
-
-        if (selected) {
-            answers[questionId] = selected.value;
-        }
-    });
+    // 先把队列中的答案保存下来
+    await flushAnswers();
 
     try {
         const response = await fetch('/api/submit', {
@@ -0,0 +1,91 @@
+// ==================== 全文搜索 ====================
+
+const SEARCH_DELAY = 200;      // 停止输入多久后发起搜索（毫秒）
+const SEARCH_LIMIT = 8;
+const SEARCH_KIND_LABELS = { lecture: '讲义', quiz: '测试题' };
+
+let searchTimer = null;
+let searchController = null;
+
+async function runSearch(query) {
+    const resultsList = document.getElementById('searchResults');
+
+    // 新的搜索开始时取消尚未返回的旧请求
+    if (searchController) {
+        searchController.abort();
+    }
+
+    if (!query) {
+        resultsList.innerHTML = '';
+        return;
+    }
+
+    searchController = new AbortController();
+    try {
+        const params = new URLSearchParams({ q: query, limit: SEARCH_LIMIT });
+        const response = await fetch(`/api/search?${params}`, { signal: searchController.signal });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        renderSearchResults(await response.json());
+    } catch (e) {
+        if (e.name !== 'AbortError') {
+            console.warn('搜索失败:', e);
+        }
+    }
+}
+
+function renderSearchResults(data) {
+    const resultsList = document.getElementById('searchResults');
+    resultsList.innerHTML = '';
+
+    if (data.results.length === 0) {
+        const empty = document.createElement('li');
+        empty.className = 'search-empty';
+        empty.textContent = '没有找到相关内容';
+        resultsList.appendChild(empty);
+        return;
+    }
+
+    data.results.forEach(result => {
+        const item = document.createElement('li');
+        const link = document.createElement('a');
+        link.href = result.url;
+
+        const kind = document.createElement('span');
+        kind.className = 'search-result-kind';
+        kind.textContent = SEARCH_KIND_LABELS[result.kind] || result.kind;
+
+        const title = document.createElement('span');
+        title.className = 'search-result-title';
+        title.textContent = result.title;
+
+        // 摘要由服务端转义，只包含 <mark> 高亮标签
+        const snippet = document.createElement('div');
+        snippet.className = 'search-result-snippet';
+        snippet.innerHTML = result.snippet;
+
+        link.append(kind, title, snippet);
+        item.appendChild(link);
+        resultsList.appendChild(item);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    const input = document.getElementById('searchInput');
+    if (!input) {
+        return;
+    }
+
+    input.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => runSearch(input.value.trim()), SEARCH_DELAY);
+    });
+
+    input.addEventListener('keydown', (event) => {
+        if (event.key === 'Escape') {
+            input.value = '';
+            runSearch('');
+        }
+    });
+});
@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LangGraph 学习平台 - 内容文件监听
+
+创建时间：2025-02-08
+作者：LangGraph 学习项目
+功能：监听讲义和测试题文件的增删改，变化时回调 on_change(path, event)
+
+两种实现：
+    - InotifyWatcher：Linux inotify（通过 ctypes 调用 libc，不需要额外依赖），
+      变化发生后立即通知，不需要反复 stat
+    - PollingWatcher：定时扫描并比较 (mtime, size) 签名，适用于其他平台
+      以及 inotify 不可用的环境（如部分网络文件系统、容器挂载目录）
+
+patterns 是相对 base_dir 的 glob 模式，如 'docs/phase*/*.md'；
+event 为 'created' / 'modified' / 'deleted' 之一。
+回调在监听线程中执行，短时间内的连续变化（编辑器保存时常见）会合并为一次回调。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path, PurePosixPath
+
+from cache import file_signature
+
+
+CREATED = 'created'
+MODIFIED = 'modified'
+DELETED = 'deleted'
+
+# 收到第一个事件后再等待这么久，把同一次保存产生的多个事件合并
+DEBOUNCE_SECONDS = 0.05
+
+
+class ContentWatcher:
+    """监听器基类"""
+
+    backend = None
+
+    def __init__(self, base_dir, patterns, on_change):
+        self.base_dir = Path(base_dir)
+        self.patterns = list(patterns)
+        self.on_change = on_change
+        self.events = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def matches(self, path):
+        """path 是否属于监听的内容文件"""
+        try:
+            relative = PurePosixPath(Path(path).relative_to(self.base_dir).as_posix())
+        except ValueError:
+            return False
+        return any(relative.match(pattern) for pattern in self.patterns)
+
+    def scan(self):
+        """当前所有内容文件"""
+        files = set()
+        for pattern in self.patterns:
+            files.update(p for p in self.base_dir.glob(pattern) if p.is_file())
+        return files
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name=f'{self.backend}-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def run(self):
+        raise NotImplementedError
+
+    def _dispatch(self, changes):
+        """changes: {path: event}"""
+        for path, event in sorted(changes.items()):
+            self.events += 1
+            self.on_change(path, event)
+
+    def stats(self):
+        return {'backend': self.backend, 'events': self.events}
+
+
+class PollingWatcher(ContentWatcher):
+    """定时扫描文件签名"""
+
+    backend = 'poll'
+
+    def __init__(self, base_dir, patterns, on_change, interval=1.0):
+        super().__init__(base_dir, patterns, on_change)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for path in self.scan():
+            try:
+                snapshot[path] = file_signature(path)
+            except FileNotFoundError:
+                pass
+        return snapshot
+
+    def check(self):
+        """扫描一次，返回 {path: event}"""
+        snapshot = self._take_snapshot()
+        changes = {}
+        for path, signature in snapshot.items():
+            previous = self._snapshot.get(path)
+            if previous is None:
+                changes[path] = CREATED
+            elif previous != signature:
+                changes[path] = MODIFIED
+        for path in self._snapshot.keys() - snapshot.keys():
+            changes[path] = DELETED
+        self._snapshot = snapshot
+        return changes
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            changes = self.check()
+            if changes:
+                self._dispatch(changes)
+
+
+class InotifyWatcher(ContentWatcher):
+    """Linux inotify
+
+    监听 patterns 中每一级目录（如 docs、docs/phase*），
+    新建的目录会自动加入监听，其中已有的内容文件按新增处理。
+    """
+
+    backend = 'inotify'
+
+    # <sys/inotify.h>
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_Q_OVERFLOW = 0x00004000
+
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, base_dir, patterns, on_change):
+        super().__init__(base_dir, patterns, on_change)
+        libc_name = ctypes.util.find_library('c')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), '无法初始化 inotify')
+        self._watches = {}  # wd -> 目录
+        self._watched_dirs = set()
+        self._add_watches()
+
+    def _watch_dirs(self):
+        """patterns 中每一级目录部分对应的已存在目录"""
+        dirs = set()
+        for pattern in self.patterns:
+            parts = PurePosixPath(pattern).parts[:-1]
+            for depth in range(len(parts) + 1):
+                prefix = '/'.join(parts[:depth])
+                if not prefix:
+                    dirs.add(self.base_dir)
+                    continue
+                dirs.update(p for p in self.base_dir.glob(prefix) if p.is_dir())
+        return dirs
+
+    def _add_watches(self):
+        """为尚未监听的目录添加监听，返回新加入的目录"""
+        added = []
+        for directory in self._watch_dirs() - self._watched_dirs:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+            if wd < 0:
+                continue
+            self._watches[wd] = directory
+            self._watched_dirs.add(directory)
+            added.append(directory)
+        return added
+
+    def _read_events(self):
+        """读取已到达的事件，返回 {path: event}，队列溢出时返回 None"""
+        changes = {}
+        new_dirs = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+
+                if mask & self.IN_Q_OVERFLOW:
+                    return None
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & (self.IN_IGNORED | self.IN_DELETE_SELF):
+                    self._watches.pop(wd, None)
+                    self._watched_dirs.discard(directory)
+                    continue
+
+                path = directory / os.fsdecode(name)
+                if mask & self.IN_ISDIR:
+                    new_dirs = new_dirs or bool(mask & (self.IN_CREATE | self.IN_MOVED_TO))
+                    continue
+                if not self.matches(path):
+                    continue
+                if mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    changes[path] = DELETED
+                elif mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO):
+                    changes[path] = MODIFIED if changes.get(path) != DELETED else CREATED
+                # 单独的 IN_CREATE 不处理：文件写完时还会收到 IN_CLOSE_WRITE
+
+        if new_dirs:
+            for directory in self._add_watches():
+                for path in self.scan():
+                    if directory in path.parents:
+                        changes[path] = CREATED
+        return changes
+
+    def run(self):
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready:
+                    continue
+                time.sleep(DEBOUNCE_SECONDS)
+                changes = self._read_events()
+                if changes is None:
+                    # 事件队列溢出：无法得知具体变化，按全部修改处理
+                    self._add_watches()
+                    changes = {path: MODIFIED for path in self.scan()}
+                if changes:
+                    self._dispatch(changes)
+        finally:
+            os.close(self._fd)
+
+    def stats(self):
+        return dict(super().stats(), watched_dirs=len(self._watched_dirs))
+
+
+def create_watcher(backend, base_dir, patterns, on_change, interval=1.0):
+    """创建监听器：backend 为 auto（优先 inotify）、inotify 或 poll"""
+    if backend in ('auto', 'inotify'):
+        try:
+            return InotifyWatcher(base_dir, patterns, on_change)
+        except (OSError, AttributeError):
+            # 非 Linux（libc 中没有 inotify_init1）或 inotify 实例数已用完
+            if backend == 'inotify':
+                raise
+    elif backend != 'poll':
+        raise ValueError(f"未知的监听方式: {backend}")
+    return PollingWatcher(base_dir, patterns, on_change, interval=interval)